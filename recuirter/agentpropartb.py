@@ -18,6 +18,9 @@ import sys
 import os
 from urllib.parse import urlparse, parse_qs
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from google.colab import userdata
 os.environ["OPENAI_API_KEY"] = userdata.get('OPENAI_API_KEY')
@@ -27,7 +30,7 @@ os.environ["TRAVERSAAL_ARES_API_KEY"] = userdata.get('TRAVERSAAL_ARES_API_KEY')
 
 """## Tool Base Class"""
 
-from typing import Any
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, ConfigDict
 
@@ -57,37 +60,353 @@ class LLMTool(Tool):
 """## Ares Internet Search Tool"""
 
 import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
 from pydantic import HttpUrl
 
+def normalize_query(query: str) -> str:
+  """Cache key for a search: case, whitespace and trailing punctuation do not matter."""
+  return " ".join(str(query).lower().split()).rstrip("?!. ")
+
+class TTLCache:
+  """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+  def __init__(self, max_size: int = 256, ttl: float = 3600.0):
+    self.max_size = max_size
+    self.ttl = ttl
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+
+  def get(self, key):
+    with self.lock:
+      entry = self.entries.get(key)
+      if entry is None:
+        return None
+      if entry[0] < time.monotonic():
+        del self.entries[key]
+        return None
+      self.entries.move_to_end(key)
+      return entry[1]
+
+  def put(self, key, value):
+    with self.lock:
+      self.entries[key] = (time.monotonic() + self.ttl, value)
+      self.entries.move_to_end(key)
+      while len(self.entries) > self.max_size:
+        self.entries.popitem(last=False)
+
+class AresSearchClient:
+  """
+  Ares API client: pooled keep-alive session, request timeout and a normalized-query cache.
+  Cache misses of a batch share one request (the payload takes a query list); if the
+  response does not carry one answer per query they are sent individually in parallel,
+  and later batches skip the list request since the API evidently does not support it.
+  """
+  def __init__(self, url: str, api_key: str, timeout: float = 30.0, cache_size: int = 256,
+               cache_ttl: float = 3600.0, pool_size: int = 8):
+    self.url = url
+    self.timeout = timeout
+    self.cache = TTLCache(cache_size, cache_ttl)
+    self.pool_size = pool_size
+    # Cleared the first time the API answers a query list with anything but one answer per query
+    self.batch_supported = True
+    self.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    self.session.mount("https://", adapter)
+    self.session.mount("http://", adapter)
+    self.session.headers.update({"x-api-key": api_key, "content-type": "application/json"})
+
+  def post(self, queries: List[str]):
+    response = self.session.post(self.url, json={"query": queries}, timeout=self.timeout)
+    if response.status_code != 200:
+      raise RuntimeError(f"Error: {response.status_code} - {response.text}")
+    return response.json()['data']['response_text']
+
+  def search_one(self, query: str) -> str:
+    try:
+      answer = self.post([query])
+    except Exception as e:
+      return str(e) if str(e).startswith("Error:") else f"Error: {e}"
+    answer = answer[0] if isinstance(answer, list) and len(answer) == 1 else answer
+    self.cache.put(normalize_query(query), answer)
+    return answer
+
+  def search(self, queries: List[str]) -> List[str]:
+    """Answers in query order; repeated and cached queries cost no request."""
+    answers = {}
+    misses = []
+    for query in queries:
+      key = normalize_query(query)
+      if key in answers:
+        continue
+      cached = self.cache.get(key)
+      if cached is not None:
+        answers[key] = cached
+      else:
+        answers[key] = None
+        misses.append(query)
+
+    if len(misses) > 1 and self.batch_supported:
+      try:
+        batch = self.post(misses)
+      except Exception as e:
+        # A 4xx rejects the list payload itself; network errors and 5xx may be transient
+        batch = None
+        if str(e).startswith("Error: 4"):
+          self.batch_supported = False
+      if isinstance(batch, list) and len(batch) == len(misses):
+        for query, answer in zip(misses, batch):
+          self.cache.put(normalize_query(query), answer)
+          answers[normalize_query(query)] = answer
+        misses = []
+      elif batch is not None:
+        self.batch_supported = False
+    if misses:
+      with ThreadPoolExecutor(max_workers=min(self.pool_size, len(misses))) as pool:
+        for query, answer in zip(misses, pool.map(self.search_one, misses)):
+          answers[normalize_query(query)] = answer
+    return [answers[normalize_query(query)] for query in queries]
+
 class AresInternetTool(Tool):
   name: str = "Ares Internet Search Tool"
   description: str = "Tool to search real-time relevant content from the internet"
-  arg: str = "A single string parameter that will be searched on the internet to find relevant content"
+  arg: str = "A single string parameter that will be searched on the internet to find relevant content. A JSON list of strings runs several searches at once"
 
   # Specific Parameters
-  url : HttpUrl = "https://api-ares.traversaal.ai/live/predict"
+  url : HttpUrl = os.getenv("ARES_API_URL", "https://api-ares.traversaal.ai/live/predict")
   x_api_key: str = os.environ["TRAVERSAAL_ARES_API_KEY"]
+  timeout: float = 30.0
+  cache_size: int = 256
+  cache_ttl: float = 3600.0
+  search_client: Any = None
 
-  def run(self, prompt: str) -> str:
+  def model_post_init(self, __context: Any) -> None:
+    super().model_post_init(__context)
+    if self.search_client is None:
+      self.search_client = AresSearchClient(str(self.url), self.x_api_key, self.timeout,
+                                            self.cache_size, self.cache_ttl)
+
+  def run(self, prompt) -> str:
     print(f"Calling Ares Internet Search Tool with prompt: {prompt}")
-    payload = {"query": [prompt]}
-    response = requests.post(self.url, json=payload, headers={
-        "x-api-key": self.x_api_key,
-        "content-type": "application/json"
-    })
-    if response.status_code != 200:
-        return f"Error: {response.status_code} - {response.text}"
-    response = response.json()
-    return response['data']['response_text']
+    if isinstance(prompt, list):
+      answers = self.search_client.search([str(query) for query in prompt])
+      return "\n\n".join(f"Query: {query}\nResult: {answer}" for query, answer in zip(prompt, answers))
+    return self.search_client.search([prompt])[0]
 
 """## Code Engine Tool"""
 
+import queue
+import signal
+
+# Runs inside each sandbox process: apply limits, preload common modules, then wait for one script
+SANDBOX_WORKER_SOURCE = r'''
+import json, resource, sys, traceback
+cpu_seconds, memory_mb = int(sys.argv[1]), int(sys.argv[2])
+if cpu_seconds > 0:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+if memory_mb > 0:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024,) * 2)
+for module in sys.argv[3:]:
+    try:
+        __import__(module)
+    except Exception:
+        pass
+request = json.loads(sys.stdin.readline())
+try:
+    exec(compile(request["code"], "<generated>", "exec"), {"__name__": "__main__"})
+except SystemExit:
+    raise
+except BaseException:
+    traceback.print_exc()
+    sys.exit(1)
+'''
+
+PACKAGE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._\-\[\],]*(?:[=<>!~]=?[A-Za-z0-9.*]+)?$")
+
+class PackageEnvironment:
+  """
+  A virtualenv (inheriting the system site-packages) that generated code runs in.
+  Packages are installed into it once, in a single pip call per request, and reused after.
+  """
+  def __init__(self, path: str = ".codeengine_env"):
+    self.path = os.path.abspath(path)
+    self.manifest = os.path.join(self.path, "installed.json")
+    self.lock = threading.Lock()
+    # Separate from `lock`: ensure() holds that one while it calls create()
+    self.create_lock = threading.Lock()
+
+  @property
+  def python(self) -> str:
+    return os.path.join(self.path, "bin", "python")
+
+  def create(self):
+    # The pool's warm-up thread and the first execute() may both get here on a cold start
+    with self.create_lock:
+      if not os.path.exists(self.python):
+        print(f"Creating code execution environment in {self.path}")
+        subprocess.check_call([sys.executable, "-m", "venv", "--system-site-packages", self.path])
+
+  def installed(self) -> set:
+    if not os.path.exists(self.manifest):
+      return set()
+    with open(self.manifest) as file:
+      return set(json.load(file))
+
+  def ensure(self, packages: List[str]) -> List[str]:
+    """Install the packages not installed yet; returns the ones that were installed now."""
+    packages = [package.strip() for package in packages if package.strip()]
+    with self.lock:
+      self.create()
+      installed = self.installed()
+      missing = [package for package in packages
+                 if package.lower() not in installed and PACKAGE_NAME_RE.match(package)]
+      if missing:
+        print(f"Installing packages: {missing}")
+        subprocess.check_call([self.python, "-m", "pip", "install", "--quiet", *missing])
+        with open(self.manifest, "w") as file:
+          json.dump(sorted(installed | {package.lower() for package in missing}), file)
+      return missing
+
+# Variables generated code may see; everything else (API keys, tokens) stays out of the sandbox
+SANDBOX_ENV_VARS = ("PATH", "HOME", "USER", "LANG", "LC_ALL", "LC_CTYPE", "TZ", "TMPDIR", "TEMP", "TMP",
+                    "SYSTEMROOT", "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "SSL_CERT_FILE", "REQUESTS_CA_BUNDLE")
+
+class SandboxPool:
+  """
+  Pre-started sandbox processes: each is an interpreter with CPU/memory limits and common
+  modules already imported, waiting for one script. A script runs in a fresh process (taken
+  from the pool, which refills in the background), its stdout is streamed as it is printed,
+  and it is killed once it exceeds `timeout` seconds of wall time.
+  """
+  def __init__(self, environment: PackageEnvironment, size: int = 2, cpu_seconds: int = 60,
+               memory_mb: int = 2048, timeout: float = 120.0, preload: List[str] = None, cwd: str = None):
+    self.environment = environment
+    self.size = size
+    self.cpu_seconds = cpu_seconds
+    self.memory_mb = memory_mb
+    self.timeout = timeout
+    self.preload = preload if preload is not None else ["numpy", "pandas", "matplotlib"]
+    self.cwd = cwd
+    self.idle = queue.Queue()
+    self.refill_lock = threading.Lock()
+    self.closed = False
+
+  def spawn(self) -> subprocess.Popen:
+    self.environment.create()
+    command = [self.environment.python, "-u", "-c", SANDBOX_WORKER_SOURCE,
+               str(self.cpu_seconds), str(self.memory_mb), *self.preload]
+    env = {name: os.environ[name] for name in SANDBOX_ENV_VARS if name in os.environ}
+    env.update(OPENBLAS_NUM_THREADS="1", OMP_NUM_THREADS="1", MPLBACKEND="Agg")
+    return subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, cwd=self.cwd, env=env, start_new_session=True)
+
+  def refill(self):
+    with self.refill_lock:
+      while not self.closed and self.idle.qsize() < self.size:
+        self.idle.put(self.spawn())
+
+  def warm(self):
+    threading.Thread(target=self.refill, daemon=True).start()
+
+  def acquire(self) -> subprocess.Popen:
+    while True:
+      try:
+        process = self.idle.get_nowait()
+      except queue.Empty:
+        process = self.spawn()
+      if process.poll() is None:
+        break
+    self.warm()
+    return process
+
+  def kill(self, process: subprocess.Popen):
+    try:
+      os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+      pass
+    process.wait()
+
+  def execute(self, code: str, on_output=print) -> Dict:
+    """Run a script in a sandbox; returns its exit code, output, error text and duration."""
+    started = time.monotonic()
+    process = self.acquire()
+    process.stdin.write(json.dumps({"code": code}) + "\n")
+    process.stdin.close()
+
+    lines = queue.Queue()
+    stderr = []
+    def pump(stream, sink, mark_end=False):
+      for line in stream:
+        sink(line)
+      if mark_end:
+        sink(None)
+    pumps = [threading.Thread(target=pump, args=(process.stdout, lines.put, True), daemon=True),
+             threading.Thread(target=pump, args=(process.stderr, stderr.append), daemon=True)]
+    for thread in pumps:
+      thread.start()
+
+    stdout, timed_out = [], False
+    deadline = started + self.timeout
+    while True:
+      try:
+        line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+      except queue.Empty:
+        timed_out = True
+        break
+      if line is None:
+        break
+      stdout.append(line)
+      if on_output:
+        on_output(line.rstrip("\n"))
+    if timed_out:
+      self.kill(process)
+    else:
+      try:
+        process.wait(timeout=max(deadline - time.monotonic(), 1))
+      except subprocess.TimeoutExpired:
+        timed_out = True
+        self.kill(process)
+
+    # The process has exited, so its pipes reach EOF; wait until all of stderr has been read
+    for thread in pumps:
+      thread.join(timeout=5)
+
+    returncode = process.returncode
+    error = "".join(stderr).strip()
+    if timed_out:
+      error = f"Execution timed out after {self.timeout} seconds"
+    elif returncode and returncode < 0:
+      error = error or f"Killed by signal {-returncode} (CPU limit {self.cpu_seconds}s / memory limit {self.memory_mb} MB)"
+    elif returncode:
+      error = error or f"Exited with code {returncode}"
+    return {"returncode": returncode, "stdout": "".join(stdout), "error": error if (timed_out or returncode) else "",
+            "timed_out": timed_out, "seconds": round(time.monotonic() - started, 3)}
+
+  def close(self):
+    self.closed = True
+    while not self.idle.empty():
+      self.kill(self.idle.get_nowait())
+
 class CodeEngine(LLMTool):
 
   name: str = "Code Generation and Execution Tool"
   description: str = "A coding tool that can take a prompt and generate executable Python code. It parses and executes the code. Returns the code and the error if the code execution fails."
   arg: str = "A single string parameter describing the coding task."
 
+  # Sandbox settings: generated code runs in pre-warmed, resource-limited subprocesses
+  env_dir: str = ".codeengine_env"
+  pool_size: int = 2
+  cpu_seconds: int = 60
+  memory_mb: int = 2048
+  exec_timeout: float = 120.0
+  sandbox: Any = None
+
+  def model_post_init(self, __context: Any) -> None:
+    super().model_post_init(__context)
+    if self.sandbox is None:
+      self.sandbox = SandboxPool(PackageEnvironment(self.env_dir), self.pool_size, self.cpu_seconds,
+                                 self.memory_mb, self.exec_timeout)
+      self.sandbox.warm()
+
   def parse_and_exec_code(self, response: str):
     result = re.search(r'```python\s*([\s\S]*?)\s*```', response)
     code_string = result.group(1)
@@ -100,17 +419,17 @@ class CodeEngine(LLMTool):
         packages = packages.split(" ")
       else:
         packages = [packages]
-      print(f"Installing packages: {packages}")
-      for package in packages:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+      try:
+        self.sandbox.environment.ensure(packages)
+      except subprocess.CalledProcessError as e:
+        return code_string, f"Package installation failed: {e}"
 
     # Execute main code
     print("Executing main code...")
-    try:
-      exec(code_string)
-    except Exception as e:
-      print(f"Error executing generated code: {e}")
-      return code_string, e
+    execution = self.sandbox.execute(code_string)
+    if execution["error"]:
+      print(f"Error executing generated code: {execution['error']}")
+      return code_string, execution["error"]
     return code_string, None
 
   def generate_code(self, prompt):
@@ -136,15 +455,45 @@ class CodeEngine(LLMTool):
 
 """## YouTube Search Tool"""
 
-from youtube_transcript_api import YouTubeTranscriptApi
+import heapq
+import sqlite3
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled, VideoUnavailable, YouTubeTranscriptApi
 from duckduckgo_search import DDGS
 
+class YouTubeCache:
+    """Persistent transcripts and summaries keyed by video_id (SQLite, safe to share between threads)."""
+    def __init__(self, path: str = "youtube_cache.db"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS transcripts (video_id TEXT PRIMARY KEY, text TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS summaries (video_id TEXT PRIMARY KEY, summary TEXT)")
+
+    def get(self, table: str, video_id: str):
+        with self.lock:
+            row = self.conn.execute(f"SELECT * FROM {table} WHERE video_id = ?", (video_id,)).fetchone()
+        return row[1] if row else None
+
+    def put(self, table: str, video_id: str, value: str):
+        with self.lock, self.conn:
+            self.conn.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?)", (video_id, value))
+
 class YouTubeSearchTool(LLMTool):
   name: str = "YouTube Search Tool"
   description: str = "A tool capable of searching the internet for youtube videos and returns the text transcript of the videos"
   arg: str = "A single string parameter that will be searched on the internet to find relevant content"
   # Specific Parameters
   ddgs : Any = DDGS()
+  max_workers: int = 4          # videos processed concurrently
+  summary_workers: int = 4      # concurrent LLM calls for transcript chunks
+  chunk_chars: int = 12000      # longer transcripts are summarized chunk by chunk, then combined
+  cache_path: str = "youtube_cache.db"
+  cache: Any = None
+
+  def model_post_init(self, __context: Any) -> None:
+      super().model_post_init(__context)
+      if self.cache is None and self.cache_path:
+          self.cache = YouTubeCache(self.cache_path)
 
   def extract_video_id(self, url):
       """Extract video ID from YouTube URL."""
@@ -172,12 +521,14 @@ class YouTubeSearchTool(LLMTool):
               max_results=max_results*2 # Get 2x required results so get some relevant results. Sort and Filter later.
           )
 
-          results = sorted(
+          # Most viewed first; only the top max_results are needed, not a full sort
+          results = heapq.nlargest(
+              max_results,
               results,
               key=lambda x: (
-                  -(x['statistics']['viewCount'] if x['statistics']['viewCount'] is not None else float('-inf')) # Sort -> More Views First
+                  x['statistics']['viewCount'] if x['statistics']['viewCount'] is not None else float('-inf')
               )
-          )[:max_results]
+          )
 
           videos = []
           for result in results:
@@ -206,17 +557,26 @@ class YouTubeSearchTool(LLMTool):
           return f"Error searching videos: {str(e)}"
 
   def get_transcript(self, video_id):
-        """Get transcript for a YouTube video."""
+        """Get transcript for a YouTube video (cached; videos without one are cached as empty)."""
+        if self.cache is not None:
+            cached = self.cache.get("transcripts", video_id)
+            if cached is not None:
+                return cached or None
         try:
             transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            return ' '.join([entry['text'] for entry in transcript_list])
+            transcript = ' '.join([entry['text'] for entry in transcript_list])
+        except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable):
+            # Permanent: remember it so the video isn't fetched again
+            transcript = ""
         except Exception as e:
+            # Transient (network, rate limit): not cached, the next call retries
             print(f"Error getting transcript: {str(e)}")
             return None
+        if self.cache is not None:
+            self.cache.put("transcripts", video_id, transcript)
+        return transcript or None
 
-  def summarize_content(self, transcript):
-      prompt = "Create a concise summary of the following video transcript"
-
+  def summarize_content(self, transcript, prompt="Create a concise summary of the following video transcript"):
       try:
           response = self.client.chat.completions.create(
               model="gpt-4",
@@ -230,14 +590,55 @@ class YouTubeSearchTool(LLMTool):
       except Exception as e:
           return None
 
+  def chunk_transcript(self, transcript):
+      """Split a transcript into chunks of at most chunk_chars, on word boundaries."""
+      chunks = []
+      while len(transcript) > self.chunk_chars:
+          cut = transcript.rfind(' ', 0, self.chunk_chars)
+          cut = cut if cut > 0 else self.chunk_chars
+          chunks.append(transcript[:cut])
+          transcript = transcript[cut:].lstrip()
+      if transcript:
+          chunks.append(transcript)
+      return chunks
+
+  def summarize_transcript(self, video_id, transcript, summary_pool):
+      """Map-reduce summary: chunks are summarized in parallel, then combined. Cached by video_id."""
+      if self.cache is not None:
+          cached = self.cache.get("summaries", video_id)
+          if cached is not None:
+              return cached
+      chunks = self.chunk_transcript(transcript)
+      if len(chunks) == 1:
+          summary = self.summarize_content(chunks[0])
+      else:
+          partials = list(summary_pool.map(
+              lambda chunk: self.summarize_content(chunk, "Summarize this part of a video transcript"), chunks))
+          partials = [partial for partial in partials if partial]
+          summary = self.summarize_content(
+              "\n\n".join(partials),
+              "Combine these summaries of consecutive parts of one video into a single concise summary"
+          ) if partials else None
+      if summary and self.cache is not None:
+          self.cache.put("summaries", video_id, summary)
+      return summary
+
+  def process_video(self, video, summary_pool):
+      transcript = self.get_transcript(video['video_id'])
+      if not transcript:
+          return None
+      content = self.summarize_transcript(video['video_id'], transcript, summary_pool)
+      if not content:
+          return None
+      return {
+          "video": video,
+          "content": content.replace("\n\n", "\n").replace("\n\n\n", "\n")
+      }
 
   def run(self, prompt: str) -> str:
       print(f"Calling YouTube Search Tool with prompt: {prompt}")
       try:
-          # Parse the prompt for parameters
-
           # Search for videos
-          # print(f"Searching for videos about: {params['query']}")
           videos = self.search_videos(prompt, 3)
 
           if isinstance(videos, str):  # Error occurred
@@ -246,25 +647,11 @@ class YouTubeSearchTool(LLMTool):
           if not videos:  # No videos found
               return "No videos found matching the query."
 
-          results = []
-          for video in videos:
-              # print(f"\nProcessing video: {video['title']}")
-              # print(f"By: {video['uploader']}")
-              # print(f"URL: {video['link']}")
-              # print(f"Duration: {video['duration']}")
-              # print(f"Views: {video['view_count']}")
-              # print(f"Published: {video['published']}")
-
-              # Get transcript
-              transcript = self.get_transcript(video['video_id'])
-              if not transcript:
-                  continue
-
-              content = self.summarize_content(transcript)
-              results.append({
-                  "video": video,
-                  "content": content.replace("\n\n", "\n").replace("\n\n\n", "\n")
-              })
+          # Transcripts are fetched and summarized for all videos concurrently (bounded pools)
+          with ThreadPoolExecutor(max_workers=self.summary_workers) as summary_pool, \
+               ThreadPoolExecutor(max_workers=self.max_workers) as video_pool:
+              results = list(video_pool.map(lambda video: self.process_video(video, summary_pool), videos))
+          results = [result for result in results if result]
 
           if not results:
               return "Could not process any videos. Try a different search query."
@@ -276,40 +663,236 @@ class YouTubeSearchTool(LLMTool):
 
 """## Slide Generation Tool"""
 
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pptx import Presentation
-from typing import List, Dict
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yields the items of a JSON array as soon as each one is complete, from text that arrives
+    in chunks (e.g. an LLM response being streamed), without waiting for the whole array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            # Skip the array brackets, separators and whitespace between items
+            while position < len(buffer) and buffer[position] in "[], \t\r\n":
+                position += 1
+            if position >= len(buffer):
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # item not complete yet
+            yield item
+            position = end
+        buffer, position = buffer[position:], 0
+    if buffer.strip(" \t\r\n]"):
+        raise ValueError(f"Incomplete JSON at the end of the slide stream: {buffer[:80]}")
+
+class DeckBuilder:
+    """
+    Builds one PPTX deck slide by slide and saves it under a unique name in `output_dir`,
+    so concurrent agent runs never overwrite each other's decks.
+    """
+    def __init__(self, output_dir: str = "decks", path: str = None):
+        self.started = time.perf_counter()
+        self.presentation = Presentation()
+        self.path = path or os.path.join(output_dir, f"presentation-{uuid.uuid4().hex[:12]}.pptx")
+        self.slides = 0
+
+    def add_slide(self, slide: Dict[str, str]):
+        # Add a slide with a title and content layout
+        slide_layout = self.presentation.slide_layouts[1]  # Layout 1 is 'Title and Content'
+        ppt_slide = self.presentation.slides.add_slide(slide_layout)
+
+        # Set the title and content for the slide
+        ppt_slide.shapes.title.text = slide['slide_title']
+        ppt_slide.placeholders[1].text = slide['content']
+        self.slides += 1
+
+    def extend(self, slides: Iterable[Dict[str, str]]):
+        for slide in slides:
+            self.add_slide(slide)
+
+    def save(self) -> Dict:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.presentation.save(self.path)
+        return {"path": self.path, "slides": self.slides,
+                "build_seconds": round(time.perf_counter() - self.started, 3)}
+
+def build_deck(slides: Iterable[Dict[str, str]], output_dir: str = "decks") -> Dict:
+    """Build and save one deck; returns its path, slide count and build time."""
+    builder = DeckBuilder(output_dir)
+    builder.extend(slides)
+    return builder.save()
+
+def build_decks(decks: List[List[Dict[str, str]]], output_dir: str = "decks", max_workers: int = None) -> List[Dict]:
+    """
+    Build many decks in parallel, one deck per task.
+    Uses a process pool only with the fork start method: under spawn (macOS, Windows) the workers
+    re-import __main__ and can't find functions defined in a notebook, so threads are used instead.
+    """
+    if len(decks) == 1:
+        return [build_deck(decks[0], output_dir)]
+    if multiprocessing.get_context().get_start_method() == "fork":
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    with pool:
+        return list(pool.map(build_deck, decks, [output_dir] * len(decks)))
 
 class SlideGenerationTool(Tool):
     name: str = "Slide Generation Tool"
     description: str = "A tool that can create a PPTX deck for a content. It takes a list of dictionaries. Each list dictionary item represents a slide in the presentation. Each dictionary item must have two keys: 'slide_title' and 'content'."
     arg: str = "List[Dict[slide_title, content]]. Ensure the Action Input is JSON parseable so I can convert it to required format"
+    output_dir: str = "decks"
 
-    def run(self, slide_content: List[Dict[str, str]]) -> str:
+    def run(self, slide_content: Union[str, Iterable[Dict[str, str]]]) -> str:
         print(f"Calling Slide Generation Tool with slide_content TYPE :{type(slide_content)}")
         if type(slide_content) == str:
-          try:
-            slide_content = json.loads(slide_content)
-            print("Converted Slide Content from str to JSON Dictionary")
-          except Exception as e:
-            return f"Error: {e}"
-        presentation = Presentation()
-
-        # Iterate over the slides list and add content to the presentation
-        for slide in slide_content:
-            # Add a slide with a title and content layout
-            slide_layout = presentation.slide_layouts[1]  # Layout 1 is 'Title and Content'
-            ppt_slide = presentation.slides.add_slide(slide_layout)
-
-            # Set the title and content for the slide
-            title = ppt_slide.shapes.title
-            content = ppt_slide.placeholders[1]
-
-            title.text = slide['slide_title']
-            content.text = slide['content']
-
-        # Save the presentation to the specified output file
-        presentation.save("presentation.pptx")
-        return f"Presentation saved as 'presentation.pptx'."
+          # Slides are parsed one by one as the JSON is read
+          slide_content = iter_json_array([slide_content])
+        builder = DeckBuilder(self.output_dir)
+        try:
+          builder.extend(slide_content)
+        except Exception as e:
+          return f"Error: {e}"
+
+        # Save the presentation to a file unique to this request
+        deck = builder.save()
+        return f"Presentation saved as '{deck['path']}' ({deck['slides']} slides, built in {deck['build_seconds']}s)."
+
+"""## Agent Memory"""
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for the context budget."""
+    return len(text) // 4 + 1
+
+class AgentMemory:
+    """
+    Conversation memory with a token budget.
+    Tool observations are kept in a side store and only a truncated preview (with the
+    observation id) goes into the context. When the context exceeds the budget, older
+    turns are folded into a running summary; system prompts, the current task (the
+    question the agent was called with) and recent turns are kept.
+    """
+    def __init__(self, token_budget: int = 6000, max_observation_tokens: int = 800,
+                 keep_recent: int = 4, summarizer=None):
+        self.token_budget = token_budget
+        self.max_observation_tokens = max_observation_tokens
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer
+        self.pinned = []
+        self.task = None
+        self.summary = ""
+        self.turns = []
+        self.observations = {}
+
+    @property
+    def messages(self) -> List[Dict]:
+        """The messages sent to the model: pinned system prompts, the task, the summary, then recent turns."""
+        messages = list(self.pinned)
+        if self.task is not None:
+            messages.append(self.task)
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of earlier steps:\n{self.summary}"})
+        return messages + self.turns
+
+    def token_count(self) -> int:
+        return sum(estimate_tokens(message["content"]) for message in self.messages)
+
+    def add_system(self, content: str):
+        self.pinned.append({"role": "system", "content": content})
+
+    def add_task(self, content: str):
+        """Pin the user's question so compaction never folds it away; the previous one becomes a normal turn."""
+        if self.task is not None:
+            self.turns.insert(0, self.task)
+        self.task = {"role": "user", "content": content}
+        self.compact()
+
+    def add(self, role: str, content: str):
+        self.turns.append({"role": role, "content": content})
+        self.compact()
+
+    def store_observation(self, observation: str) -> Tuple[str, str]:
+        """Store the full observation; returns its id and a preview of at most `max_observation_tokens`."""
+        observation_id = f"obs-{len(self.observations) + 1}"
+        self.observations[observation_id] = observation
+        limit = self.max_observation_tokens * 4
+        if len(observation) > limit:
+            observation = (f"{observation[:limit]}\n... [truncated {estimate_tokens(observation)} tokens; "
+                           f"full text stored as {observation_id}, read it with the observation_lookup tool]")
+        return observation_id, observation
+
+    def add_observation(self, observation: str) -> str:
+        observation_id, preview = self.store_observation(observation)
+        self.add("assistant", f"Observation ({observation_id}): {preview}")
+        return observation_id
+
+    def add_observations(self, observations: List[Tuple[str, str]]) -> List[str]:
+        """Add the (action, observation) results of one turn as a single message."""
+        if not observations:
+            return []
+        if len(observations) == 1:
+            return [self.add_observation(observations[0][1])]
+        ids, parts = [], []
+        for action, observation in observations:
+            observation_id, preview = self.store_observation(observation)
+            ids.append(observation_id)
+            parts.append(f"Observation ({observation_id}, {action}): {preview}")
+        self.add("assistant", "\n\n".join(parts))
+        return ids
+
+    def get_observation(self, observation_id: str, page: int = 0) -> str:
+        """One page (`max_observation_tokens` long) of a stored observation."""
+        observation = self.observations.get(observation_id.strip())
+        if observation is None:
+            return f"No observation with id {observation_id}. Known ids: {', '.join(self.observations)}"
+        size = self.max_observation_tokens * 4
+        pages = max(1, -(-len(observation) // size))
+        text = observation[page * size:(page + 1) * size]
+        return f"{observation_id} page {page + 1}/{pages}:\n{text}"
+
+    def summarize(self, turns: List[Dict]) -> str:
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        if self.summarizer is not None:
+            try:
+                return self.summarizer(self.summary, transcript)
+            except Exception as e:
+                print(f"Error summarizing memory: {e}")
+        # Fallback: keep the first line of every turn, bounded like a single observation
+        lines = [line for line in (turn["content"].strip().split("\n")[0][:200] for turn in turns) if line]
+        return "\n".join(filter(None, [self.summary] + lines))[-self.max_observation_tokens * 4:]
+
+    def compact(self):
+        """Fold the oldest turns into the summary until the context fits the token budget."""
+        while self.token_count() > self.token_budget and len(self.turns) > self.keep_recent:
+            older = self.turns[:-self.keep_recent] if self.keep_recent else self.turns
+            # Fold at least half of the older turns at a time so summaries stay infrequent
+            folded = older[:max(1, (len(older) + 1) // 2)]
+            self.summary = self.summarize(folded)
+            self.turns = self.turns[len(folded):]
+
+class ObservationLookupTool(Tool):
+    name: str = "Observation Lookup Tool"
+    description: str = "A tool that returns the full text of an earlier tool observation that was truncated in the conversation, one page at a time"
+    arg: str = "The observation id (for example obs-3), optionally followed by a page number (for example obs-3 2)"
+    memory: Any = None
+
+    def run(self, prompt: str) -> str:
+        parts = str(prompt).split()
+        if not parts:
+            return "Error: an observation id is required"
+        page = int(parts[1]) - 1 if len(parts) > 1 and parts[1].isdigit() else 0
+        return self.memory.get_observation(parts[0], max(page, 0))
 
 """## Agent"""
 
@@ -326,47 +909,83 @@ Action: the action to take, should be one of [{tool_names}]
 Action Input: the input to the action
 Observation: the result of the action
 ... (this Thought/Action/Action Input/Observation can repeat N times)
+When several actions do not depend on each other, list all their Action/Action Input pairs in the same turn: they run in parallel and you get one Observation per action.
 Thought: I now know the final answer
 Final Answer: the final answer to the original input question
 
 Begin!
 """
 
+SUMMARY_SYSTEM_PROMPT = "You compress the scratchpad of a tool-using agent. Keep facts, tool results, observation ids and open questions; drop everything else. Respond with the updated summary only."
+
 class AgentPro:
-    def __init__(self, llm = OpenAI(), tools: List[Tool] = [], system_prompt: str = None, react_prompt: str = REACT_AGENT_SYSTEM_PROMPT):
+    def __init__(self, llm = OpenAI(), tools: List[Tool] = [], system_prompt: str = None, react_prompt: str = REACT_AGENT_SYSTEM_PROMPT,
+                 max_iterations: int = 10, token_budget: int = 6000, max_observation_tokens: int = 800,
+                 summary_model: str = "gpt-4o-mini", max_tool_workers: int = 4,
+                 default_tool_timeout: float = 120.0, tool_timeouts: Dict[str, float] = None,
+                 max_abandoned_tools: int = 8):
         super().__init__()
         self.client = llm
+        # Tools are blocking, so actions of one turn run concurrently on a thread pool
+        self.max_tool_workers = max_tool_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_tool_workers)
+        # Timed-out tools still running: in total, and in the current pool
+        self.max_abandoned_tools = max_abandoned_tools
+        self.abandoned_tools = set()
+        self.abandoned_in_pool = set()
+        self.abandoned_lock = threading.Lock()
+        self.default_tool_timeout = default_tool_timeout
+        self.tool_timeouts = {name.lower().replace(' ', '_'): timeout for name, timeout in (tool_timeouts or {}).items()}
+        self.max_iterations = max_iterations
+        self.summary_model = summary_model
+        self.memory = AgentMemory(token_budget, max_observation_tokens, summarizer=self.summarize_turns)
+        tools = list(tools) + [ObservationLookupTool(memory=self.memory)]
         self.tools = self.format_tools(tools)
         self.react_prompt = react_prompt.format(
             tools="\n\n".join(map(lambda tool: tool.get_tool_description(), tools)),
             tool_names=", ".join(map(lambda tool: tool.name, tools))
         )
         print(self.react_prompt)
-        self.messages = []
         if system_prompt:
-            self.messages.append({"role": "system", "content": system_prompt})
-        self.messages.append({"role": "system", "content": self.react_prompt})
+            self.memory.add_system(system_prompt)
+        self.memory.add_system(self.react_prompt)
+
+    @property
+    def messages(self) -> List[Dict]:
+        return self.memory.messages
+
+    def summarize_turns(self, summary: str, transcript: str) -> str:
+        response = self.client.chat.completions.create(
+            model=self.summary_model,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Current summary:\n{summary or '(empty)'}\n\nNew steps:\n{transcript}"}
+            ],
+            max_tokens=500
+        )
+        return response.choices[0].message.content.strip()
 
     def format_tools(self, tools: List[Tool]) -> Dict:
         tool_names = list(map(lambda tool: tool.name, tools))
         return dict(zip(tool_names, tools))
 
-    def parse_action_string(self, text):
+    def parse_actions(self, text):
         """
-        Parses action and action input from a string containing thoughts and actions.
-        Handles multi-line actions and optional observations.
+        Parses every Action / Action Input pair from a string containing thoughts and actions.
+        Handles multi-line action inputs and optional observations.
         """
-        lines = text.split('\n')
-        action = None
-        action_input = []
+        actions = []
+        action_input = None
         is_action_input = False
 
-        for line in lines:
+        for line in text.split('\n'):
             if line.startswith('Action:'):
-                action = line.replace('Action:', '').strip()
+                action_input = []
+                actions.append([line.replace('Action:', '').strip(), action_input])
+                is_action_input = False
                 continue
 
-            if line.startswith('Action Input:'):
+            if line.startswith('Action Input:') and action_input is not None:
                 is_action_input = True
                 # Handle single-line action input
                 input_text = line.replace('Action Input:', '').strip()
@@ -382,45 +1001,116 @@ class AgentPro:
             if is_action_input and line.strip():
                 action_input.append(line.strip())
 
-        # Join multi-line action input
-        action_input = '\n'.join(action_input)
+        parsed = []
+        for action, lines in actions:
+            # Join multi-line action input
+            action_input = '\n'.join(lines)
+            try:
+              action_input = json.loads(action_input)
+            except Exception as e:
+              pass
+            parsed.append((action, action_input))
+        return parsed
+
+    def parse_action_string(self, text):
+        """Parses the first action and action input from a model response."""
+        actions = self.parse_actions(text)
+        return actions[0] if actions else (None, "")
+
+    def run_tool(self, action, action_input, started=None):
+        if started is not None:
+          # The action's timeout counts from here, not from when it was queued
+          started.append(time.monotonic())
         try:
-          action_input = json.loads(action_input)
+          tool_name = (action or "").strip().lower()
+          if tool_name in self.tools:
+            return str(self.tools[tool_name].run(action_input))
+          return f"Unknown tool: {action}. Use one of [{', '.join(self.tools)}]"
         except Exception as e:
-          pass
-        return action, action_input
+          return f"There was an error executing the tool\nError: {e}"
+
+    def tool_timeout(self, action):
+        return self.tool_timeouts.get((action or "").strip().lower(), self.default_tool_timeout)
 
     def tool_call(self, response):
-        action, action_input = self.parse_action_string(response)
-        try:
-          if action.strip().lower() in self.tools:
-            tool_observation = self.tools[action].run(action_input)
-            return f"Observation: {tool_observation}"
-        except Exception as e:
-          return f"Obeservation: There was an error executing the tool\nError: {e}"
+        """
+        Runs every action of a model turn concurrently on the tool thread pool and
+        returns (action, observation) pairs in the order the actions were given.
+
+        Each action's timeout starts when a pool thread picks it up, so actions
+        queued behind others don't use up theirs while waiting. Threads can't be
+        killed: a tool that exceeds its timeout is reported as such and keeps its
+        thread until it returns. Once all threads of the pool are held by such
+        tools the pool is replaced, and while `max_abandoned_tools` of them are
+        still running new actions are refused instead of starting more threads.
+        """
+        calls = []
+        for action, action_input in self.parse_actions(response):
+          if len(self.abandoned_tools) >= self.max_abandoned_tools:
+            calls.append((action, action_input, None, None))
+            continue
+          started = []
+          calls.append((action, action_input, self.executor.submit(self.run_tool, action, action_input, started), started))
+
+        observations = []
+        for action, action_input, future, started in calls:
+          if future is None:
+            observations.append((action, f"Not run: {len(self.abandoned_tools)} earlier tools are still running past their timeout"))
+            continue
+          timeout = self.tool_timeout(action)
+          while True:
+            if future.cancelled():
+              # Its pool was replaced before it started; run it on the new one
+              started = []
+              future = self.executor.submit(self.run_tool, action, action_input, started)
+            if future.done() or (started and time.monotonic() - started[0] >= timeout):
+              break
+            # Until the action starts, check back regularly to start its clock
+            wait([future], timeout=max(started[0] + timeout - time.monotonic(), 0) if started else 0.05)
+          if future.done():
+            observations.append((action, future.result()))
+          else:
+            self.abandon(future)
+            observations.append((action, f"The tool did not finish within {timeout} seconds"))
+        return observations
+
+    def abandon(self, future):
+        """Leave a timed-out tool running; replace the pool once every one of its threads is stuck."""
+        with self.abandoned_lock:
+          self.abandoned_tools.add(future)
+          self.abandoned_in_pool.add(future)
+          if len(self.abandoned_in_pool) >= self.max_tool_workers:
+            # Actions still queued on the old pool are cancelled and resubmitted by tool_call
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = ThreadPoolExecutor(max_workers=self.max_tool_workers)
+            self.abandoned_in_pool = set()
+        future.add_done_callback(self.forget_abandoned)
+
+    def forget_abandoned(self, future):
+        with self.abandoned_lock:
+          self.abandoned_tools.discard(future)
+          self.abandoned_in_pool.discard(future)
 
     def __call__(self, prompt):
-        self.messages.append(
-            {"role": "user", "content": prompt}
-        )
+        self.memory.add_task(prompt)
         response = ""
-        while True:
+        for iteration in range(self.max_iterations):
             response = self.client.chat.completions.create(
                     model="gpt-4",
                     messages=self.messages,
                     max_tokens=2000
                 ).choices[0].message.content.strip()
-            self.messages.append({"role":"assistant", "content": response})
+            self.memory.add("assistant", response)
             print("="*80)
             if "Final Answer" in response:
               return response.split("Final Answer:")[-1].strip()
             print(response)
             print("="*80)
             if "Action" in response and "Action Input" in response:
-              observation = self.tool_call(response)
-              self.messages.append(
-                  {"role": "assistant", "content": observation}
-              )
+              observations = self.tool_call(response)
+              self.memory.add_observations(observations)
+        print(f"Stopped after {self.max_iterations} iterations without a final answer")
+        return f"No final answer after {self.max_iterations} steps. Last response:\n{response}"
 
 """## Using Agent with Multiple Tools"""
 
@@ -1,12 +1,18 @@
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, ConfigDict, Field
-import requests
+import asyncio
 import json
 import os
-from dotenv import load_dotenv
+import threading
+from .config import load_config
+from .tracing import record_llm_usage, span
+
+
+# (ollama_base_url, model) -> runs currently holding a pin, shared by every tool in the process
+_model_pins: Dict[Tuple[str, str], int] = {}
+_model_pins_lock = threading.Lock()
 
-load_dotenv()
 
 class Tool(ABC, BaseModel):
     name: str
@@ -26,34 +32,122 @@ class Tool(ABC, BaseModel):
         return f"Tool: {self.name}\nDescription: {self.description}\nArg: {self.arg}\n"
 
 class LLMTool(Tool):
-    ollama_base_url: str = Field(default="http://localhost:11434")
+    ollama_base_url: str = Field(default_factory=lambda: os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"))
     model: str = Field(default="mistral")
+    embedding_model: str = Field(default="nomic-embed-text")
+    keep_alive: Union[int, str] = Field(default="5m")
+    # Optional shared requests.Session (connection pool); plain requests.post otherwise
+    http_session: Optional[Any] = Field(default=None, exclude=True)
     
     def __init__(self, **data):
+        load_config()
         super().__init__(**data)
+
+    @property
+    def http(self):
+        if self.http_session is not None:
+            return self.http_session
+        import requests
+        return requests
         
     async def generate_response(self, prompt: str, system_prompt: str = None) -> str:
         """Generate response using Ollama."""
-        try:
-            url = f"{self.ollama_base_url}/api/generate"
-            
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "stream": False
-            }
-            
-            response = requests.post(url, json=payload)
+        with span("llm_call", **{"llm.model": self.model, "llm.endpoint": "chat", "tool": self.name}) as current:
+            try:
+                url = f"{self.ollama_base_url}/api/chat"
+                
+                messages = []
+                if system_prompt:
+                    messages.append({"role": "system", "content": system_prompt})
+                messages.append({"role": "user", "content": prompt})
+                
+                payload = {
+                    "model": self.model,
+                    "messages": messages,
+                    "stream": False,
+                    "keep_alive": self.keep_alive
+                }
+                
+                response = await asyncio.to_thread(self.http.post, url, json=payload)
+                response.raise_for_status()
+                
+                result = response.json()
+                record_llm_usage(current, result)
+                return result.get("message", {}).get("content", "")
+                
+            except Exception as e:
+                current.error = f"{type(e).__name__}: {e}"
+                print(f"Error generating response: {str(e)}")
+                return ""
+
+    async def generate_completion(self, prompt: str, system_prompt: str = None,
+                                  keep_alive: Union[int, str] = None,
+                                  options: Optional[Dict] = None) -> Dict:
+        """Run a raw /api/generate call and return Ollama's full response body.
+
+        Unlike generate_response this keeps the timing and token counters
+        (prompt_eval_count, prompt_eval_duration, ...) so callers can see how
+        much of the prompt was actually evaluated.
+        """
+        url = f"{self.ollama_base_url}/api/generate"
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive if keep_alive is None else keep_alive
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        if options:
+            payload["options"] = options
+
+        with span("llm_call", **{"llm.model": self.model, "llm.endpoint": "generate", "tool": self.name}) as current:
+            response = await asyncio.to_thread(self.http.post, url, json=payload)
             response.raise_for_status()
-            
             result = response.json()
-            return result.get("message", {}).get("content", "")
-            
+            record_llm_usage(current, result)
+            return result
+
+    async def load_model(self, keep_alive: Union[int, str, None] = None) -> None:
+        """Load the model into Ollama's memory for `keep_alive` (the tool's default if None)."""
+        try:
+            await self.generate_completion("", keep_alive=keep_alive)
         except Exception as e:
-            print(f"Error generating response: {str(e)}")
-            return "" 
\ No newline at end of file
+            print(f"Error loading model: {str(e)}")
+
+    async def pin_model(self, keep_alive: Union[int, str] = -1) -> None:
+        """Load the model and keep it resident until every pin is released.
+
+        Pins are counted per (ollama_base_url, model) within the process, so
+        concurrent runs sharing a model don't unpin it for each other.
+        """
+        key = (self.ollama_base_url, self.model)
+        with _model_pins_lock:
+            _model_pins[key] = _model_pins.get(key, 0) + 1
+        await self.load_model(keep_alive)
+
+    async def release_model(self) -> None:
+        """Drop one pin; the last one hands the model back to Ollama's default keep_alive expiry."""
+        key = (self.ollama_base_url, self.model)
+        with _model_pins_lock:
+            pins = _model_pins.get(key, 0)
+            if pins > 1:
+                _model_pins[key] = pins - 1
+                return
+            _model_pins.pop(key, None)
+            if not pins:
+                return
+        await self.load_model(self.keep_alive)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with Ollama's /api/embed endpoint."""
+        url = f"{self.ollama_base_url}/api/embed"
+        payload = {
+            "model": self.embedding_model,
+            "input": texts,
+            "keep_alive": self.keep_alive
+        }
+        with span("llm_embed", **{"llm.model": self.embedding_model, "llm.batch": len(texts), "tool": self.name}):
+            response = await asyncio.to_thread(self.http.post, url, json=payload)
+            response.raise_for_status()
+            return response.json().get("embeddings", [])
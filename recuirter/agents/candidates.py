@@ -0,0 +1,247 @@
+import json
+import sys
+from array import array
+from collections.abc import MutableMapping
+from heapq import nlargest
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Keys every candidate has, in the order they are serialized
+REQUIRED_FIELDS = ("name", "cv_path", "match_score", "phone", "email", "links")
+# Keys set later in the pipeline; absent until they are given a value
+OPTIONAL_FIELDS = ("older_versions", "job_title", "available_slots", "interview")
+
+
+class CandidateRecord(MutableMapping):
+    """A scored candidate in fixed slots instead of a per-candidate dict.
+
+    It is still a mutable mapping, so `candidate["job_title"] = ...`,
+    `candidate.get("available_slots")` and `dict(candidate)` keep working.
+    Optional fields are only present once they are set (not None), and
+    unknown keys (e.g. a shard's `mtime` and `signature`) go to a small
+    side dict. CV paths are interned, so repeated results share one string.
+    """
+
+    __slots__ = REQUIRED_FIELDS + OPTIONAL_FIELDS + ("extra",)
+
+    def __init__(self, name: str, cv_path: str, match_score: float, phone: str = "", email: str = "",
+                 links: Sequence[str] = (), older_versions: Optional[List[str]] = None,
+                 job_title: Optional[str] = None, available_slots: Optional[List[str]] = None,
+                 interview: Optional[Dict] = None, **extra):
+        self.name = name
+        self.cv_path = sys.intern(cv_path)
+        self.match_score = float(match_score)
+        self.phone = phone
+        self.email = email
+        self.links = list(links)
+        self.older_versions = older_versions
+        self.job_title = job_title
+        self.available_slots = available_slots
+        self.interview = interview
+        self.extra: Optional[Dict[str, Any]] = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CandidateRecord":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in REQUIRED_FIELDS}
+        for field in OPTIONAL_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key in REQUIRED_FIELDS:
+            return getattr(self, key)
+        if key in OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in REQUIRED_FIELDS or key in OPTIONAL_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in REQUIRED_FIELDS:
+            raise KeyError(f"{key} is required and cannot be removed")
+        if key in OPTIONAL_FIELDS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from REQUIRED_FIELDS
+        for field in OPTIONAL_FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return (len(REQUIRED_FIELDS) + sum(getattr(self, field) is not None for field in OPTIONAL_FIELDS)
+                + len(self.extra or ()))
+
+    def __repr__(self) -> str:
+        return f"CandidateRecord({self.to_dict()!r})"
+
+
+def to_jsonable(value: Any) -> Any:
+    """`default=` hook for json.dumps: candidate records as dicts, anything else stringified."""
+    if isinstance(value, CandidateRecord):
+        return value.to_dict()
+    if isinstance(value, CandidateBatch):
+        return value.to_columns()
+    return str(value)
+
+
+class CandidateBatch:
+    """Columnar store for the scored candidates of one job.
+
+    Scores live in an `array('d')` (8 bytes each instead of a float object
+    per dict), paths are interned and keys are stored once per column
+    rather than once per candidate. Rows are materialized as
+    `CandidateRecord`s only when asked for, e.g. for the top-K.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.paths: List[str] = []
+        self.scores = array('d')
+        self.phones: List[str] = []
+        self.emails: List[str] = []
+        self.links: List[tuple] = []
+        # Row index -> older versions it replaced; only near-duplicates have one
+        self.older_versions: Dict[int, List[str]] = {}
+
+    def append(self, candidate: Any) -> None:
+        """Add a candidate (a `CandidateRecord` or any mapping with the required keys)."""
+        if isinstance(candidate, CandidateRecord):
+            self.names.append(candidate.name)
+            self.paths.append(candidate.cv_path)
+            self.scores.append(candidate.match_score)
+            self.phones.append(candidate.phone)
+            self.emails.append(candidate.email)
+            self.links.append(tuple(candidate.links))
+            if candidate.older_versions:
+                self.older_versions[len(self.scores) - 1] = candidate.older_versions
+            return
+        self.names.append(candidate["name"])
+        self.paths.append(sys.intern(candidate["cv_path"]))
+        self.scores.append(candidate["match_score"])
+        self.phones.append(candidate.get("phone", ""))
+        self.emails.append(candidate.get("email", ""))
+        self.links.append(tuple(candidate.get("links", ())))
+        if candidate.get("older_versions"):
+            self.older_versions[len(self.scores) - 1] = list(candidate["older_versions"])
+
+    def extend(self, candidates: Iterable[Any]) -> None:
+        for candidate in candidates:
+            self.append(candidate)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __getitem__(self, index: int) -> CandidateRecord:
+        if index < 0:
+            index += len(self)
+        return CandidateRecord(self.names[index], self.paths[index], self.scores[index], self.phones[index],
+                               self.emails[index], self.links[index], self.older_versions.get(index))
+
+    def __iter__(self) -> Iterator[CandidateRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def duplicates_skipped(self) -> int:
+        return sum(len(paths) for paths in self.older_versions.values())
+
+    def top(self, k: int) -> List[CandidateRecord]:
+        """The k best candidates, best first; ties keep scoring order."""
+        return [self[index] for index in nlargest(k, range(len(self)), key=self.scores.__getitem__)]
+
+    def to_columns(self) -> Dict[str, list]:
+        return {
+            "name": self.names,
+            "cv_path": self.paths,
+            "match_score": self.scores.tolist(),
+            "phone": self.phones,
+            "email": self.emails,
+            "links": [list(links) for links in self.links],
+            "older_versions": [self.older_versions.get(index, []) for index in range(len(self))],
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list]) -> "CandidateBatch":
+        batch = cls()
+        batch.names = list(columns["name"])
+        batch.paths = [sys.intern(path) for path in columns["cv_path"]]
+        batch.scores = array('d', columns["match_score"])
+        batch.phones = list(columns["phone"])
+        batch.emails = list(columns["email"])
+        batch.links = [tuple(links) for links in columns["links"]]
+        batch.older_versions = {index: list(paths) for index, paths in enumerate(columns.get("older_versions", []))
+                                if paths}
+        return batch
+
+    def write_jsonl(self, file: IO[str]) -> int:
+        """Write one compact JSON object per candidate; returns the number of rows."""
+        dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+        for index in range(len(self)):
+            row = {"name": self.names[index], "cv_path": self.paths[index], "match_score": self.scores[index],
+                   "phone": self.phones[index], "email": self.emails[index], "links": self.links[index]}
+            if index in self.older_versions:
+                row["older_versions"] = self.older_versions[index]
+            file.write(dumps(row))
+            file.write("\n")
+        return len(self)
+
+    @classmethod
+    def read_jsonl(cls, file: IO[str]) -> "CandidateBatch":
+        batch = cls()
+        for line in file:
+            if line.strip():
+                batch.append(json.loads(line))
+        return batch
+
+    def save(self, path: str) -> str:
+        """Write the batch by extension: `.parquet` (needs pyarrow), `.jsonl`, or column-wise JSON otherwise."""
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Saving candidates as Parquet requires pyarrow (pip install pyarrow)") from e
+            pq.write_table(pa.table(self.to_columns()), path)
+        elif path.endswith(".jsonl"):
+            with open(path, "w", encoding="utf-8") as file:
+                self.write_jsonl(file)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.to_columns(), file, separators=(',', ':'), ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "CandidateBatch":
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            return cls.from_columns(pq.read_table(path).to_pydict())
+        with open(path, encoding="utf-8") as file:
+            if path.endswith(".jsonl"):
+                return cls.read_jsonl(file)
+            return cls.from_columns(json.load(file))
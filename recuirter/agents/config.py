@@ -0,0 +1,33 @@
+import os
+import threading
+from typing import Optional
+
+# The directory holding main.py; its .env is used when none is found from the working directory
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config(path: Optional[str] = None) -> None:
+    """Load `.env` into the environment once per process; later calls are free.
+
+    The file is `path` if given, else the nearest `.env` from the working
+    directory upwards, else the one next to main.py, so the app finds its
+    settings wherever it is launched from.
+
+    Entry points call this before reading settings, and every tool calls it on
+    construction so tools built directly (scripts, benchmarks) see `.env` too.
+    Variables already set in the environment win, as with python-dotenv.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import find_dotenv, load_dotenv
+        path = path or find_dotenv(usecwd=True) or os.path.join(PACKAGE_ROOT, ".env")
+        if os.path.isfile(path):
+            load_dotenv(path)
+        _loaded = True
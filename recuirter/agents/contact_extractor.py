@@ -0,0 +1,110 @@
+import os
+import re
+from typing import Dict, List, Optional
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Digits with optional +/00 prefix and common separators; validated after normalization
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+|00)?\d[\d \t().-]{6,18}\d(?!\w)")
+URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s,;<>()]+"
+    r"|(?:linkedin\.com|github\.com|gitlab\.com)/[^\s,;<>()]+",
+    re.IGNORECASE
+)
+NAME_LINE_RE = re.compile(r"^[A-Z][A-Za-z'.-]+(?: [A-Z][A-Za-z'.-]+){1,3}$")
+DATE_LIKE_RE = re.compile(r"^\d{4}\s*[-./]\s*\d{1,2}(?:\s*[-./]\s*\d{1,2})?$|^\d{1,2}\s*[-./]\s*\d{4}$")
+# Employment periods such as "2010 - 2015", "01.2019 - 12.2021" or "2018.03 - 2021.06"
+_YEAR_OR_MONTH = r"(?:(?:19|20)\d{2}(?:[./-](?:0?[1-9]|1[0-2]))?|(?:0?[1-9]|1[0-2])[./-](?:19|20)\d{2})"
+DATE_RANGE_RE = re.compile(rf"(?<![\d.]){_YEAR_OR_MONTH}\s*[-\u2013\u2014]\s*{_YEAR_OR_MONTH}(?![\d.])")
+ISBN_RE = re.compile(r"\bISBN(?:-1[03])?:?\s*[\dXx -]{10,17}", re.IGNORECASE)
+# A label just before a number on the same line, e.g. "Phone:", "Tel.", "Mobile No."
+PHONE_LABEL_RE = re.compile(r"\b(?:phone|tel(?:ephone)?|mobile|mob|cell|whatsapp)\b[^\d\n]{0,12}$", re.IGNORECASE)
+NON_NAME_WORDS = {"curriculum", "vitae", "resume", "profile", "summary", "contact", "experience", "skills",
+                  "education", "developer", "engineer", "manager", "page"}
+
+
+def normalize_phone(raw: str, default_country_code: str = "") -> str:
+    """Normalize a phone number to E.164 (+<digits>); "" if it doesn't look like one.
+
+    Numbers without an international prefix get `default_country_code`
+    (digits only, e.g. "971") when they start with a trunk 0; otherwise they
+    are only accepted if they are already long enough to carry a country code.
+    """
+    raw = raw.strip()
+    if DATE_LIKE_RE.match(raw) or DATE_RANGE_RE.search(raw):
+        return ""
+    digits = re.sub(r"\D", "", raw)
+    if not raw.startswith(("+", "00")) and is_isbn13(digits):
+        return ""
+    if raw.startswith("+"):
+        pass
+    elif raw.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0") and default_country_code:
+        digits = default_country_code.lstrip("+") + digits[1:]
+    elif len(digits) < 11:
+        return ""
+    # E.164: at most 15 digits and country codes never start with 0
+    if not 8 <= len(digits) <= 15 or digits.startswith("0"):
+        return ""
+    return "+" + digits
+
+
+def is_isbn13(digits: str) -> bool:
+    """True for a 978/979 number with a valid ISBN-13 check digit."""
+    if len(digits) != 13 or not digits.startswith(("978", "979")):
+        return False
+    total = sum(int(digit) * (3 if index % 2 else 1) for index, digit in enumerate(digits[:12]))
+    return (10 - total % 10) % 10 == int(digits[12])
+
+
+def guess_name(lines: List[str], fallback: str = "") -> str:
+    """The first line near the top that looks like a person's name."""
+    for line in lines[:8]:
+        line = line.strip()
+        if not line or not NAME_LINE_RE.match(line):
+            continue
+        if any(word.lower().strip(".") in NON_NAME_WORDS for word in line.split()):
+            continue
+        return line
+    return fallback
+
+
+def name_from_filename(path: str) -> str:
+    stem = os.path.basename(path).split('.')[0]
+    return re.sub(r"[_\-]+", " ", stem).strip().title()
+
+
+def extract_contacts(text: str, default_country_code: str = "", path: Optional[str] = None) -> Dict:
+    """Pull name, email, phone and links out of extracted CV text."""
+    email_match = EMAIL_RE.search(text)
+
+    # Blank out date ranges and ISBNs so their digits can't run into a number
+    phone_text = ISBN_RE.sub("\n", DATE_RANGE_RE.sub("\n", text))
+    phone = ""
+    for match in PHONE_RE.finditer(phone_text):
+        candidate = normalize_phone(match.group(0), default_country_code)
+        if not candidate:
+            continue
+        # An international or labelled number wins; an unlabelled one is only taken in national
+        # format (trunk 0 plus the default country code), so stray digit runs aren't phone numbers
+        line_start = phone_text.rfind("\n", 0, match.start()) + 1
+        if match.group(0).startswith(("+", "00")) or PHONE_LABEL_RE.search(phone_text[line_start:match.start()]):
+            phone = candidate
+            break
+        if match.group(0).startswith("0") and default_country_code:
+            phone = phone or candidate
+
+    links = []
+    for match in URL_RE.finditer(text):
+        link = match.group(0).rstrip('.')
+        if link not in links and "@" not in link:
+            links.append(link)
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    fallback = name_from_filename(path) if path else ""
+    return {
+        "name": guess_name(lines, fallback),
+        "email": email_match.group(0).lower() if email_match else "",
+        "phone": phone,
+        "links": links
+    }
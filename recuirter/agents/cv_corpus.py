@@ -0,0 +1,160 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from .contact_extractor import extract_contacts, name_from_filename
+from .tracing import metrics, span
+
+
+def extract_pdf_text(pdf_path: str) -> Tuple[str, float]:
+    """Extract the text of a PDF; runs inside extraction worker processes."""
+    import PyPDF2
+
+    start = time.perf_counter()
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text()
+    return text, time.perf_counter() - start
+
+
+def extract_cv(pdf_path: str, default_country_code: str = "") -> Tuple[Dict[str, Any], float]:
+    """Extract text, contact fields and MinHash signature of a CV; runs inside extraction worker processes."""
+    from .dedup import minhash_signature
+
+    text, seconds = extract_pdf_text(pdf_path)
+    start = time.perf_counter()
+    extracted = {
+        "text": text,
+        "contacts": extract_contacts(text, default_country_code, path=pdf_path),
+        "signature": minhash_signature(text),
+    }
+    return extracted, seconds + time.perf_counter() - start
+
+
+class CVDocument:
+    def __init__(self, path: str, text: str, mtime: float, contacts: Optional[Dict] = None,
+                 signature: Optional[Any] = None, extract_seconds: float = 0.0, cached: bool = False):
+        self.path = path
+        self.text = text
+        self.mtime = mtime
+        self.contacts = contacts or {}
+        self.signature = signature
+        self.extract_seconds = extract_seconds
+        self.cached = cached
+
+    @classmethod
+    def from_extracted(cls, path: str, mtime: float, extracted: Dict[str, Any], **kwargs) -> "CVDocument":
+        return cls(path, extracted["text"], mtime, extracted["contacts"], extracted["signature"], **kwargs)
+
+    @property
+    def name(self) -> str:
+        return self.contacts.get("name") or name_from_filename(self.path)
+
+    @property
+    def email(self) -> str:
+        return self.contacts.get("email", "")
+
+    @property
+    def phone(self) -> str:
+        return self.contacts.get("phone", "")
+
+    @property
+    def links(self) -> List[str]:
+        return self.contacts.get("links", [])
+
+
+class CVTextCache:
+    """Extraction results (text, contacts, signature) keyed by path, invalidated when the file's mtime or size changes."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        return None
+
+    def put(self, path: str, stat: os.stat_result, extracted: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, extracted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def list_cv_files(directory: str) -> List[str]:
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.pdf'))
+
+
+async def load_cv_corpus(paths: List[str], cache: CVTextCache,
+                         executor: Optional[Executor] = None, max_workers: Optional[int] = None,
+                         default_country_code: str = "") -> List[CVDocument]:
+    """Return the text, contacts and signature of every CV, extracting cache misses in a process pool.
+
+    Without a shared `executor` a temporary pool is created for the misses
+    (or the single miss is extracted in a thread).
+    """
+    loop = asyncio.get_running_loop()
+    documents: List[Optional[CVDocument]] = [None] * len(paths)
+    misses = []
+
+    with span("cv_corpus_load", **{"cv.count": len(paths)}) as current:
+        for index, path in enumerate(paths):
+            stat = os.stat(path)
+            extracted = cache.get(path, stat)
+            if extracted is None:
+                misses.append((index, path, stat))
+            else:
+                documents[index] = CVDocument.from_extracted(path, stat.st_mtime, extracted, cached=True)
+        current.set_attribute("cv.extracted", len(misses))
+
+        if misses:
+            owned = None
+            if executor is None and len(misses) > 1:
+                workers = max_workers or os.cpu_count() or 1
+                executor = owned = ProcessPoolExecutor(max_workers=min(workers, len(misses)))
+            extract = partial(extract_cv, default_country_code=default_country_code)
+            try:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(executor, extract, path) for _, path, _ in misses
+                ))
+            finally:
+                if owned is not None:
+                    owned.shutdown(wait=False)
+
+            for (index, path, stat), (extracted, seconds) in zip(misses, results):
+                cache.put(path, stat, extracted)
+                metrics.observe("recruiter_stage_duration_seconds", seconds, stage="pdf_extraction")
+                documents[index] = CVDocument.from_extracted(path, stat.st_mtime, extracted, extract_seconds=seconds)
+
+    return documents
+
+
+def deduplicate_documents(documents: List[CVDocument],
+                          threshold: float = 0.85) -> Tuple[List[CVDocument], Dict[str, List[str]]]:
+    """Keep only the newest CV of every near-duplicate cluster.
+
+    Returns the kept documents (in their original order) and a mapping from
+    each kept path to the paths of the older versions it replaced.
+    """
+    from .dedup import near_duplicate_clusters
+
+    clusters = near_duplicate_clusters([document.signature for document in documents], threshold)
+    dropped = set()
+    replaced: Dict[str, List[str]] = {}
+    for members in clusters:
+        newest = max(members, key=lambda index: (documents[index].mtime, documents[index].path))
+        older = [index for index in members if index != newest]
+        dropped.update(older)
+        replaced[documents[newest].path] = [documents[index].path for index in older]
+    kept = [document for index, document in enumerate(documents) if index not in dropped]
+    return kept, replaced
@@ -1,48 +1,76 @@
+import asyncio
 import os
-from typing import List, Dict
-import PyPDF2
+import re
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple, Union
 from .base_tool import LLMTool
+from .candidates import CandidateBatch, CandidateRecord
+from .cv_corpus import (CVDocument, CVTextCache, deduplicate_documents, extract_pdf_text, list_cv_files,
+                        load_cv_corpus)
+from .prompt_cache import PrefixCacheStats, normalize_prompt_text
+from .tracing import span
 from pydantic import Field
-from dotenv import load_dotenv
 
-load_dotenv()
+
+SCORING_SYSTEM_PROMPT = (
+    "You are an expert CV analyzer. Your task is to analyze a CV against a job description "
+    "and provide a match score from 0 to 1.\n"
+    "Consider skills, experience, and qualifications. Return ONLY a number between 0 and 1, nothing else."
+)
 
 class CVMatcherTool(LLMTool):
     name: str = "CV Matching Tool"
     description: str = "A tool that analyzes CVs against job descriptions and provides match scores"
     arg: str = "A job description to match against available CVs"
     cv_directory: str = Field(default="cvs")
+    # Shared-prefix scoring: keep system prompt + job description byte-identical
+    # across CVs so Ollama can reuse the KV cache instead of re-evaluating it.
+    reuse_prompt_prefix: bool = Field(default=False)
+    job_keep_alive: Union[int, str] = Field(default=-1)
+    # Extracted text is cached per file and extraction runs in a process pool;
+    # both can be shared between tools (see resources.ToolContainer).
+    text_cache: Optional[Any] = Field(default=None, exclude=True)
+    extraction_executor: Optional[Any] = Field(default=None, exclude=True)
+    # Country code (digits) for CV phone numbers written in national format, e.g. "971"
+    default_phone_country_code: str = Field(default="")
+    # Score only the newest version of near-duplicate CVs (MinHash/LSH, estimated Jaccard)
+    deduplicate: bool = Field(default=True)
+    dedup_threshold: float = Field(default=0.85)
+    # Write every scored candidate of a run here (.jsonl, .parquet or column JSON); None disables it
+    results_path: Optional[str] = Field(default=None)
 
     def __init__(self, **data):
         super().__init__(**data)
+        if self.text_cache is None:
+            self.text_cache = CVTextCache()
+
+    async def load_corpus(self) -> List[CVDocument]:
+        """Extract (or fetch from cache) the text and contact fields of every CV in the directory."""
+        return await load_cv_corpus(list_cv_files(self.cv_directory), self.text_cache, self.extraction_executor,
+                                    default_country_code=self.default_phone_country_code)
         
+    async def load_unique_corpus(self) -> Tuple[List[CVDocument], Dict[str, List[str]]]:
+        """Load the corpus and drop older versions of near-duplicate CVs.
+
+        Returns the documents to score and, per kept path, the older paths it replaced.
+        """
+        documents = await self.load_corpus()
+        if not self.deduplicate:
+            return documents, {}
+        with span("cv_dedup", **{"cv.count": len(documents)}) as current:
+            documents, replaced = deduplicate_documents(documents, self.dedup_threshold)
+            current.set_attribute("cv.duplicates", sum(len(paths) for paths in replaced.values()))
+        return documents, replaced
+
     async def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from a PDF file."""
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
+        with span("pdf_extraction", **{"cv.path": pdf_path}) as current:
+            text, _ = await asyncio.to_thread(extract_pdf_text, pdf_path)
+            current.set_attribute("cv.chars", len(text))
         return text
 
-    async def analyze_cv(self, cv_text: str, job_description: str) -> float:
-        """Analyze CV against job description using Ollama."""
-        system_prompt = """You are an expert CV analyzer. Your task is to analyze a CV against a job description and provide a match score from 0 to 1.
-        Consider skills, experience, and qualifications. Return ONLY a number between 0 and 1, nothing else."""
-        
-        prompt = f"""
-        Job Description:
-        {job_description}
-        
-        CV:
-        {cv_text}
-        """
-        
-        response = await self.generate_response(prompt, system_prompt)
-        
+    def parse_score(self, response: str) -> float:
+        """Extract the first number from a model response and clamp it to [0, 1]."""
         try:
-            # Extract the first number from the response
-            import re
             numbers = re.findall(r"[-+]?\d*\.\d+|\d+", response)
             if numbers:
                 score = float(numbers[0])
@@ -51,13 +79,71 @@ class CVMatcherTool(LLMTool):
         except:
             return 0.0
 
+    async def analyze_cv(self, cv_text: str, job_description: str) -> float:
+        """Analyze CV against job description using Ollama."""
+        # Same system prompt and layout as analyze_cv_with_prefix, so both modes score alike
+        prompt = self.build_prompt_prefix(job_description) + normalize_prompt_text(cv_text)
+        
+        response = await self.generate_response(prompt, SCORING_SYSTEM_PROMPT)
+        return self.parse_score(response)
+
+    def build_prompt_prefix(self, job_description: str) -> str:
+        """Build the part of the scoring prompt that is identical for every CV of a job."""
+        return f"Job Description:\n{normalize_prompt_text(job_description)}\n\nCV:\n"
+
+    def prefix_options(self, stats: PrefixCacheStats) -> Optional[Dict]:
+        """Ollama options that keep the prefix tokens when the context window shifts."""
+        if not stats.prefix_tokens:
+            return None
+        return {"num_keep": stats.prefix_tokens}
+
+    async def warm_prompt_prefix(self, job_description: str) -> PrefixCacheStats:
+        """Pin the model and evaluate the job's prompt prefix once so later calls hit the cache."""
+        await self.pin_model(self.job_keep_alive)
+        return await self.evaluate_prompt_prefix(job_description)
+
+    async def evaluate_prompt_prefix(self, job_description: str) -> PrefixCacheStats:
+        """Evaluate the job's prompt prefix once and measure its tokens (the caller pins the model)."""
+        stats = PrefixCacheStats(self.build_prompt_prefix(job_description), SCORING_SYSTEM_PROMPT)
+        try:
+            response = await self.generate_completion(
+                stats.prefix,
+                SCORING_SYSTEM_PROMPT,
+                keep_alive=self.job_keep_alive,
+                options={"num_predict": 1}
+            )
+            stats.record_warmup(response)
+        except Exception as e:
+            print(f"Error warming prompt prefix: {str(e)}")
+        return stats
+
+    async def analyze_cv_with_prefix(self, cv_text: str, stats: PrefixCacheStats) -> float:
+        """Score a CV using the job's shared prompt prefix."""
+        suffix = normalize_prompt_text(cv_text)
+        try:
+            response = await self.generate_completion(
+                stats.prefix + suffix,
+                SCORING_SYSTEM_PROMPT,
+                keep_alive=self.job_keep_alive,
+                options=self.prefix_options(stats)
+            )
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            return 0.0
+        stats.record(suffix, response)
+        return self.parse_score(response.get("response", ""))
+
+    def ensure_cv_directory(self) -> bool:
+        """Create the CV directory if it is missing; returns False when there was none (no CVs)."""
+        if os.path.exists(self.cv_directory):
+            return True
+        os.makedirs(self.cv_directory)
+        return False
+
     async def run(self, job_description: str) -> str:
         """Match CVs with job description and return top candidates."""
-        candidates = []
-        
         # Ensure CV directory exists
-        if not os.path.exists(self.cv_directory):
-            os.makedirs(self.cv_directory)
+        if not self.ensure_cv_directory():
             return {
                 "status": "error",
                 "error": "No CVs found in the directory.",
@@ -65,27 +151,19 @@ class CVMatcherTool(LLMTool):
                 "total_candidates": 0
             }
         
-        # Process each CV in the directory
-        for filename in os.listdir(self.cv_directory):
-            if filename.endswith('.pdf'):
-                cv_path = os.path.join(self.cv_directory, filename)
-                cv_text = await self.extract_text_from_pdf(cv_path)
-                
-                # Extract basic information from CV
-                name = filename.split('.')[0]  # Using filename as name for now
-                
-                # Analyze CV against job description
-                match_score = await self.analyze_cv(cv_text, job_description)
-                
-                candidates.append({
-                    "name": name,
-                    "cv_path": cv_path,
-                    "match_score": match_score,
-                    "phone": "",  # You'll need to extract this from CV
-                    "email": ""   # You'll need to extract this from CV
-                })
-        
-        if not candidates:
+        prefix_stats = None
+        if self.reuse_prompt_prefix:
+            prefix_stats = await self.warm_prompt_prefix(job_description)
+
+        try:
+            with span("cv_matching", **{"cv.directory": self.cv_directory}) as current:
+                batch = await self._score_directory(job_description, prefix_stats)
+                current.set_attribute("cv.count", len(batch))
+        finally:
+            if prefix_stats is not None:
+                await self.release_model()
+
+        if not batch:
             return {
                 "status": "error",
                 "error": "No CVs found in the directory.",
@@ -93,13 +171,68 @@ class CVMatcherTool(LLMTool):
                 "total_candidates": 0
             }
         
-        # Sort candidates by match score
-        candidates.sort(key=lambda x: x["match_score"], reverse=True)
-        
+        if self.results_path:
+            batch.save(self.results_path)
+
         # Return top 5 candidates
-        top_candidates = candidates[:5]
-        return {
+        top_candidates = batch.top(5)
+        result = {
             "status": "success",
             "candidates": top_candidates,
-            "total_candidates": len(candidates)
-        } 
\ No newline at end of file
+            "total_candidates": len(batch),
+            "duplicates_skipped": batch.duplicates_skipped
+        }
+        if prefix_stats is not None:
+            result["prefix_cache"] = prefix_stats.to_dict()
+        return result
+
+    async def stream(self, job_description: str) -> AsyncIterator[CandidateRecord]:
+        """Like run(), but yield every candidate as soon as its CV is scored (unsorted).
+
+        Closing the generator early stops scoring and releases a pinned model.
+        Like run(), a missing CV directory is created and yields no candidates.
+        """
+        if not self.ensure_cv_directory():
+            return
+        prefix_stats = None
+        if self.reuse_prompt_prefix:
+            prefix_stats = await self.warm_prompt_prefix(job_description)
+        try:
+            async for candidate in self.iter_scores(job_description, prefix_stats):
+                yield candidate
+        finally:
+            if prefix_stats is not None:
+                await self.release_model()
+
+    async def iter_scores(self, job_description: str,
+                          prefix_stats: Optional[PrefixCacheStats] = None) -> AsyncIterator[CandidateRecord]:
+        """Extract the CV directory and yield a candidate record per CV as it is scored."""
+        if not self.ensure_cv_directory():
+            return
+        documents, replaced = await self.load_unique_corpus()
+
+        # Process each CV in the directory
+        for document in documents:
+            # Analyze CV against job description
+            if prefix_stats is not None:
+                match_score = await self.analyze_cv_with_prefix(document.text, prefix_stats)
+            else:
+                match_score = await self.analyze_cv(document.text, job_description)
+            
+            yield CandidateRecord(
+                name=document.name,
+                cv_path=document.path,
+                match_score=match_score,
+                phone=document.phone,
+                email=document.email,
+                links=document.links,
+                older_versions=replaced.get(document.path)
+            )
+
+    async def _score_directory(self, job_description: str,
+                               prefix_stats: Optional[PrefixCacheStats] = None) -> CandidateBatch:
+        """Extract and score every PDF in the CV directory into a columnar batch."""
+        batch = CandidateBatch()
+        async for candidate in self.iter_scores(job_description, prefix_stats):
+            batch.append(candidate)
+        return batch
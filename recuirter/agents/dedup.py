@@ -0,0 +1,109 @@
+import re
+import zlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 31) - 1
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_rng = np.random.RandomState(1)
+# Fixed hash permutations (a * x + b) mod p; fixed so signatures can be cached across runs
+_PERM_A = _rng.randint(1, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """31-bit hashes of the word n-grams of the lowercased, punctuation-free text."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    hashes = {zlib.crc32(gram.encode('utf-8')) & MERSENNE_PRIME for gram in grams}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a document's shingle set."""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return np.full(NUM_PERM, MERSENNE_PRIME, dtype=np.uint32)
+    # (NUM_PERM, shingles) matrix of permuted hashes; products stay below 2**62
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def bands_for_threshold(threshold: float, num_perm: int = NUM_PERM) -> int:
+    """Pick the LSH band count whose S-curve midpoint (1/b)^(1/r) is closest to `threshold`."""
+    best, best_error = 1, float("inf")
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if error < best_error:
+            best, best_error = bands, error
+    return best
+
+
+def near_duplicate_clusters(signatures: Sequence[np.ndarray], threshold: float = 0.85) -> List[List[int]]:
+    """Group documents whose estimated Jaccard similarity reaches `threshold`.
+
+    Identical signatures (re-uploads of the same CV) are merged up front so
+    only one copy of each enters the buckets. Locality-sensitive hashing then
+    buckets signatures by band so only documents sharing a bucket are
+    compared; matches are merged with union-find.
+    The band S-curve is centred below `threshold` so pairs just above it are
+    rarely missed; every candidate pair is verified on the full signature.
+    Returns clusters of two or more indices.
+    """
+    count = len(signatures)
+    if count < 2:
+        return []
+    bands = bands_for_threshold(max(threshold - 0.2, 0.05))
+    rows = NUM_PERM // bands
+    matrix = np.vstack(signatures)
+
+    parent = list(range(count))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Documents without any text all share the same signature; never group them
+    empty = (matrix == MERSENNE_PRIME).all(axis=1)
+
+    distinct: Dict[bytes, int] = {}
+    for index in range(count):
+        if empty[index]:
+            continue
+        first = distinct.setdefault(matrix[index].tobytes(), index)
+        if first != index:
+            parent[index] = first
+    representatives = list(distinct.values())
+
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        band_rows = matrix[:, band * rows:(band + 1) * rows]
+        for index in representatives:
+            buckets.setdefault(band_rows[index].tobytes(), []).append(index)
+        for members in buckets.values():
+            for position, first in enumerate(members):
+                for other in members[position + 1:]:
+                    root_a, root_b = find(first), find(other)
+                    if root_a != root_b and estimated_jaccard(matrix[first], matrix[other]) >= threshold:
+                        parent[root_b] = root_a
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(count):
+        clusters.setdefault(find(index), []).append(index)
+    return [members for members in clusters.values() if len(members) > 1]
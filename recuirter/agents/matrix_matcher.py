@@ -0,0 +1,209 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import Field
+
+from .cv_corpus import CVDocument
+from .cv_matcher import CVMatcherTool
+from .prompt_cache import PrefixCacheStats
+from .tracing import span
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of CV embeddings keyed by (cv_path, mtime), holding at most `max_entries`."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: Hashable, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BulkCVMatcherTool(CVMatcherTool):
+    """Scores many job descriptions against the CV corpus in one pass.
+
+    Every CV is extracted and embedded once. A cosine-similarity matrix
+    (jobs x CVs) prefilters a shortlist per job, and the LLM then refines
+    all (job, CV) shortlist pairs from one shared work queue.
+    """
+
+    name: str = "Bulk CV Matching Tool"
+    description: str = "A tool that matches a batch of job descriptions against the available CVs and returns the top candidates per job"
+    arg: str = "A list of job descriptions to match against available CVs"
+    top_k: int = Field(default=5)
+    prefilter_k: int = Field(default=25)
+    refine_workers: int = Field(default=4)
+    embed_batch_size: int = Field(default=32)
+    embed_max_chars: int = Field(default=8000)
+    # (cv_path, mtime) -> unit-length embedding; an EmbeddingCache that can be shared across tools
+    embedding_cache: Optional[Any] = Field(default=None, exclude=True)
+    embedding_cache_size: int = Field(default=10000)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if self.embedding_cache is None:
+            self.embedding_cache = EmbeddingCache(self.embedding_cache_size)
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches and return L2-normalized rows."""
+        rows = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = [text[:self.embed_max_chars] for text in texts[start:start + self.embed_batch_size]]
+            rows.extend(await self.embed(batch))
+        matrix = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    async def embed_corpus(self, documents: List[CVDocument]) -> np.ndarray:
+        """Embedding matrix for the corpus, embedding only CVs not seen before."""
+        keys = [(document.path, document.mtime) for document in documents]
+        vectors = [self.embedding_cache.get(key) for key in keys]
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await self.embed_texts([documents[index].text for index in missing])
+            for index, vector in zip(missing, embedded):
+                vectors[index] = vector
+                self.embedding_cache.put(keys[index], vector)
+        # Built from the local list: a corpus larger than the cache evicts its own first rows
+        return np.stack(vectors)
+
+    def shortlist(self, similarity: np.ndarray) -> np.ndarray:
+        """Indices of the `prefilter_k` most similar CVs for every job (one row per job)."""
+        jobs, cvs = similarity.shape
+        k = min(self.prefilter_k, cvs)
+        if k == cvs:
+            return np.tile(np.arange(cvs), (jobs, 1))
+        return np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+
+    async def refine(self, job_descriptions: List[str], documents: List[CVDocument], shortlist: np.ndarray,
+                     prefixes: Optional[Dict[int, PrefixCacheStats]] = None) -> Dict[Tuple[int, int], float]:
+        """LLM-score every shortlisted (job, CV) pair using a pool of queue workers.
+
+        With a `prefixes` dict the shared prompt prefix is reused: each job's
+        prefix is evaluated right before its first pair (Ollama only keeps the
+        latest prefix cached, so warming every job up front would be wasted)
+        and its PrefixCacheStats is stored in the dict under the job index.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        # Job-major order keeps consecutive prompts on the same prefix for Ollama's KV cache
+        for job_index, row in enumerate(shortlist):
+            for cv_index in row:
+                queue.put_nowait((job_index, int(cv_index)))
+
+        scores: Dict[Tuple[int, int], float] = {}
+        # Job index -> its prefix evaluation; workers that reach the job meanwhile wait for it
+        warmups: Dict[int, asyncio.Future] = {}
+
+        async def prefix_for(job_index: int) -> PrefixCacheStats:
+            if job_index not in warmups:
+                warmups[job_index] = asyncio.ensure_future(
+                    self.evaluate_prompt_prefix(job_descriptions[job_index]))
+            prefixes[job_index] = await warmups[job_index]
+            return prefixes[job_index]
+
+        async def worker():
+            while True:
+                try:
+                    job_index, cv_index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                text = documents[cv_index].text
+                if prefixes is not None:
+                    score = await self.analyze_cv_with_prefix(text, await prefix_for(job_index))
+                else:
+                    score = await self.analyze_cv(text, job_descriptions[job_index])
+                scores[(job_index, cv_index)] = score
+
+        await asyncio.gather(*(worker() for _ in range(max(self.refine_workers, 1))))
+        return scores
+
+    async def run(self, job_descriptions: List[str], top_k: Optional[int] = None) -> Dict:
+        """Match every job description against the CV corpus and return per-job top-K lists."""
+        top_k = top_k or self.top_k
+        if not job_descriptions:
+            return {"status": "error", "error": "No job descriptions provided.", "jobs": [], "total_candidates": 0}
+
+        documents, replaced = await self.load_unique_corpus() if os.path.isdir(self.cv_directory) else ([], {})
+        if not documents:
+            return {"status": "error", "error": "No CVs found in the directory.", "jobs": [], "total_candidates": 0}
+
+        with span("bulk_matching", **{"jobs": len(job_descriptions), "cv.count": len(documents)}):
+            if self.prefilter_k >= len(documents):
+                # Nothing to prefilter: skip embedding altogether
+                similarity = np.zeros((len(job_descriptions), len(documents)), dtype=np.float32)
+            else:
+                try:
+                    cv_vectors = await self.embed_corpus(documents)
+                    job_vectors = await self.embed_texts(job_descriptions)
+                except Exception as e:
+                    return {"status": "error", "error": f"Embedding failed: {e}", "jobs": [],
+                            "total_candidates": len(documents)}
+                similarity = job_vectors @ cv_vectors.T
+            shortlist = self.shortlist(similarity)
+
+            prefixes = {} if self.reuse_prompt_prefix else None
+            if self.reuse_prompt_prefix:
+                await self.pin_model(self.job_keep_alive)
+            try:
+                scores = await self.refine(job_descriptions, documents, shortlist, prefixes)
+            finally:
+                if self.reuse_prompt_prefix:
+                    await self.release_model()
+
+        jobs = []
+        for job_index, row in enumerate(shortlist):
+            ranked = sorted(
+                (int(cv_index) for cv_index in row),
+                key=lambda cv_index: (scores[(job_index, cv_index)], similarity[job_index, cv_index]),
+                reverse=True
+            )[:top_k]
+            jobs.append({
+                "job_index": job_index,
+                "shortlisted": len(row),
+                "candidates": [
+                    {
+                        "name": documents[cv_index].name,
+                        "cv_path": documents[cv_index].path,
+                        "match_score": scores[(job_index, cv_index)],
+                        "similarity": round(float(similarity[job_index, cv_index]), 4),
+                        "phone": documents[cv_index].phone,
+                        "email": documents[cv_index].email,
+                        "links": documents[cv_index].links,
+                        **({"older_versions": replaced[documents[cv_index].path]}
+                           if documents[cv_index].path in replaced else {})
+                    }
+                    for cv_index in ranked
+                ]
+            })
+            if prefixes is not None and job_index in prefixes:
+                jobs[-1]["prefix_cache"] = prefixes[job_index].to_dict()
+
+        return {
+            "status": "success",
+            "jobs": jobs,
+            "total_candidates": len(documents),
+            "duplicates_skipped": sum(len(paths) for paths in replaced.values()),
+            "llm_calls": len(scores)
+        }
+
@@ -0,0 +1,69 @@
+from typing import Dict, Optional
+
+
+def normalize_prompt_text(text: str) -> str:
+    """Normalize line endings and surrounding whitespace so equal inputs produce equal bytes."""
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+class PrefixCacheStats:
+    """Tracks how much of a shared prompt prefix Ollama re-evaluated during a job.
+
+    Ollama reuses the KV cache for the longest common prefix of consecutive
+    prompts and only reports the tokens it actually evaluated in
+    `prompt_eval_count`. The size of the prefix is measured once by a warm-up
+    call; the suffix size of each scoring call is estimated from its length
+    using the prefix's chars-per-token ratio.
+    """
+
+    def __init__(self, prefix: str, system_prompt: str = ""):
+        self.prefix = prefix
+        # The system prompt is templated in front of the prefix, so it is part of
+        # the cached span as far as token accounting goes.
+        self.prefix_chars = len(system_prompt) + len(prefix)
+        self.prefix_tokens = 0
+        self.warmup_seconds = 0.0
+        self.calls = 0
+        self.prompt_eval_tokens = 0
+        self.prompt_eval_seconds = 0.0
+        self.estimated_cached_tokens = 0
+
+    @property
+    def tokens_per_char(self) -> float:
+        if not self.prefix_chars or not self.prefix_tokens:
+            return 0.25
+        return self.prefix_tokens / self.prefix_chars
+
+    def record_warmup(self, response: Dict) -> None:
+        """Record the warm-up call that evaluated the prefix on its own."""
+        self.prefix_tokens = response.get("prompt_eval_count", 0) or 0
+        self.warmup_seconds = (response.get("prompt_eval_duration", 0) or 0) / 1e9
+
+    def record(self, suffix: str, response: Dict) -> None:
+        """Record one scoring call whose prompt was prefix + suffix."""
+        evaluated = response.get("prompt_eval_count", 0) or 0
+        expected = self.prefix_tokens + int(len(suffix) * self.tokens_per_char)
+
+        self.calls += 1
+        self.prompt_eval_tokens += evaluated
+        self.prompt_eval_seconds += (response.get("prompt_eval_duration", 0) or 0) / 1e9
+        self.estimated_cached_tokens += min(max(expected - evaluated, 0), self.prefix_tokens)
+
+    def hit_ratio(self) -> Optional[float]:
+        """Fraction of prefix tokens served from the KV cache across all calls."""
+        if not self.calls or not self.prefix_tokens:
+            return None
+        return self.estimated_cached_tokens / (self.calls * self.prefix_tokens)
+
+    def to_dict(self) -> Dict:
+        hit_ratio = self.hit_ratio()
+        return {
+            "prefix_chars": self.prefix_chars,
+            "prefix_tokens": self.prefix_tokens,
+            "warmup_seconds": round(self.warmup_seconds, 3),
+            "calls": self.calls,
+            "prompt_eval_tokens": self.prompt_eval_tokens,
+            "prompt_eval_seconds": round(self.prompt_eval_seconds, 3),
+            "estimated_cached_tokens": self.estimated_cached_tokens,
+            "hit_ratio": round(hit_ratio, 3) if hit_ratio is not None else None
+        }
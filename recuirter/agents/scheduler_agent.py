@@ -1,11 +1,13 @@
+import asyncio
 import os
-from typing import Dict, Optional, List, Any
+import sqlite3
+import threading
+from typing import Dict, Optional, List, Any, Set
 from datetime import datetime, timedelta, timezone
 from .base_tool import LLMTool
 from pydantic import Field, ConfigDict
-from dotenv import load_dotenv
+from .tracing import span
 
-load_dotenv()
 
 class MockCalendarEvent:
     def __init__(self, summary: str, start: datetime, end: datetime):
@@ -13,12 +15,22 @@ class MockCalendarEvent:
         self.start = start
         self.end = end
 
+def _parse_event_time(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
 class MockCalendarService:
     def __init__(self):
         self.events: List[MockCalendarEvent] = []
+        self._lock = threading.Lock()
     
     def list_events(self, calendarId: str, timeMin: str, timeMax: str, singleEvents: bool, orderBy: str) -> Dict:
-        """Mock implementation of calendar events list."""
+        """Mock implementation of calendar events list: events overlapping [timeMin, timeMax)."""
+        window_start, window_end = _parse_event_time(timeMin), _parse_event_time(timeMax)
+        with self._lock:
+            events = [event for event in self.events if event.end > window_start and event.start < window_end]
         return {
             'items': [
                 {
@@ -26,14 +38,14 @@ class MockCalendarService:
                     'start': {'dateTime': event.start.isoformat()},
                     'end': {'dateTime': event.end.isoformat()}
                 }
-                for event in self.events
+                for event in sorted(events, key=lambda event: event.start)
             ]
         }
     
     def insert_event(self, calendarId: str, body: Dict) -> Dict:
         """Mock implementation of event creation."""
-        start_time = datetime.fromisoformat(body['start']['dateTime'].replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(body['end']['dateTime'].replace('Z', '+00:00'))
+        start_time = _parse_event_time(body['start']['dateTime'])
+        end_time = _parse_event_time(body['end']['dateTime'])
         
         event = MockCalendarEvent(
             summary=body['summary'],
@@ -49,33 +61,201 @@ class MockCalendarService:
             'end': {'dateTime': event.end.isoformat()}
         }
 
+    def insert_event_if_free(self, calendarId: str, body: Dict) -> Optional[Dict]:
+        """Insert the event unless it overlaps an existing one; None on conflict."""
+        start_time = _parse_event_time(body['start']['dateTime'])
+        end_time = _parse_event_time(body['end']['dateTime'])
+        with self._lock:
+            for event in self.events:
+                if event.start < end_time and event.end > start_time:
+                    return None
+            return self.insert_event(calendarId, body)
+
+    def close(self) -> None:
+        pass
+
+class SQLiteCalendarService:
+    """Calendar backed by a SQLite file, shared by every worker process on the host.
+
+    Bookings go through insert_event_if_free, which checks for overlaps and
+    inserts inside one IMMEDIATE transaction, so two workers can never book
+    the same slot.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        # Every connection opened by any thread, so close() can close them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    calendar_id TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    start_ts REAL NOT NULL,
+                    end_ts REAL NOT NULL,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS events_by_time ON events (calendar_id, start_ts, end_ts)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; only close() touches a connection from another thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _event_dict(self, row) -> Dict:
+        event_id, summary, start, end = row
+        return {
+            'id': f'event_{event_id}',
+            'summary': summary,
+            'start': {'dateTime': start},
+            'end': {'dateTime': end}
+        }
+
+    def list_events(self, calendarId: str, timeMin: str, timeMax: str, singleEvents: bool, orderBy: str) -> Dict:
+        rows = self._connection().execute(
+            "SELECT id, summary, start, end FROM events "
+            "WHERE calendar_id = ? AND end_ts > ? AND start_ts < ? ORDER BY start_ts",
+            (calendarId, _parse_event_time(timeMin).timestamp(), _parse_event_time(timeMax).timestamp())
+        ).fetchall()
+        return {'items': [self._event_dict(row) for row in rows]}
+
+    def _insert(self, conn: sqlite3.Connection, calendarId: str, body: Dict,
+                start_time: datetime, end_time: datetime) -> Dict:
+        cursor = conn.execute(
+            "INSERT INTO events (calendar_id, summary, start_ts, end_ts, start, end) VALUES (?, ?, ?, ?, ?, ?)",
+            (calendarId, body['summary'], start_time.timestamp(), end_time.timestamp(),
+             start_time.isoformat(), end_time.isoformat())
+        )
+        return self._event_dict((cursor.lastrowid, body['summary'], start_time.isoformat(), end_time.isoformat()))
+
+    def insert_event(self, calendarId: str, body: Dict) -> Dict:
+        start_time = _parse_event_time(body['start']['dateTime'])
+        end_time = _parse_event_time(body['end']['dateTime'])
+        return self._insert(self._connection(), calendarId, body, start_time, end_time)
+
+    def insert_event_if_free(self, calendarId: str, body: Dict) -> Optional[Dict]:
+        """Insert the event unless it overlaps an existing one; None on conflict."""
+        start_time = _parse_event_time(body['start']['dateTime'])
+        end_time = _parse_event_time(body['end']['dateTime'])
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conflict = conn.execute(
+                "SELECT 1 FROM events WHERE calendar_id = ? AND start_ts < ? AND end_ts > ? LIMIT 1",
+                (calendarId, end_time.timestamp(), start_time.timestamp())
+            ).fetchone()
+            event = None if conflict else self._insert(conn, calendarId, body, start_time, end_time)
+            conn.execute("COMMIT")
+            return event
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the connections of every thread (calls run in asyncio.to_thread workers)."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+class HTTPCalendarService:
+    """Minimal client for the load test's calendar stand-in (Google Calendar v3 style paths).
+
+    It exists so load tests exercise a networked calendar; it is not a Google
+    Calendar integration (no OAuth, no retries). insert_event_if_free lists
+    the events overlapping the slot and inserts only when there are none; the
+    scheduler tries the next slot when the stand-in answers 409. Throttled
+    (429) responses raise, so the load test reports them as errors.
+    """
+
+    def __init__(self, base_url: str, token: str = "", session: Optional[Any] = None, timeout: float = 10.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+
+    def _events_url(self, calendarId: str) -> str:
+        return f"{self.base_url}/calendars/{calendarId}/events"
+
+    def _request(self, method: str, url: str, **kwargs):
+        return self.session.request(method, url, headers=self.headers, timeout=self.timeout, **kwargs)
+
+    def list_events(self, calendarId: str, timeMin: str, timeMax: str, singleEvents: bool, orderBy: str) -> Dict:
+        response = self._request(
+            "GET",
+            self._events_url(calendarId),
+            params={"timeMin": timeMin, "timeMax": timeMax, "singleEvents": str(singleEvents).lower(),
+                    "orderBy": orderBy}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def insert_event(self, calendarId: str, body: Dict) -> Dict:
+        response = self._request("POST", self._events_url(calendarId), json=body)
+        response.raise_for_status()
+        return response.json()
+
+    def insert_event_if_free(self, calendarId: str, body: Dict) -> Optional[Dict]:
+        """Insert the event unless it overlaps an existing one; None on conflict."""
+        existing = self.list_events(calendarId, body['start']['dateTime'], body['end']['dateTime'],
+                                    singleEvents=True, orderBy='startTime')
+        if existing.get('items'):
+            return None
+        response = self._request("POST", self._events_url(calendarId), json=body)
+        if response.status_code == 409:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        # The session may be the tools' shared pool; its owner closes it
+        pass
+
 class SchedulerTool(LLMTool):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
     name: str = "Interview Scheduler Tool"
     description: str = "A tool that manages interview scheduling using Google Calendar"
     arg: str = "A candidate object with available slots and job details"
-    service: Optional[MockCalendarService] = Field(default=None)
+    service: Optional[Any] = Field(default=None)
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.service = MockCalendarService()
+        if self.service is None:
+            self.service = MockCalendarService()
     
-    def find_available_slot(self, candidate_slots: list) -> Optional[Dict]:
+    def find_available_slot(self, candidate_slots: list, exclude: Optional[Set[str]] = None) -> Optional[Dict]:
         """Find an available slot that matches the interviewer's calendar."""
         # Get interviewer's calendar events for the next 7 days
         now = datetime.now(timezone.utc)
         end = now + timedelta(days=7)
         
-        events_result = self.service.list_events(
-            calendarId='primary',
-            timeMin=now.isoformat(),
-            timeMax=end.isoformat(),
-            singleEvents=True,
-            orderBy='startTime'
-        )
-        
-        busy_slots = events_result.get('items', [])
+        with span("calendar_query", **{"calendar.id": "primary"}) as current:
+            events_result = self.service.list_events(
+                calendarId='primary',
+                timeMin=now.isoformat(),
+                timeMax=end.isoformat(),
+                singleEvents=True,
+                orderBy='startTime'
+            )
+            
+            busy_slots = events_result.get('items', [])
+            current.set_attribute("calendar.events", len(busy_slots))
         
         # Convert candidate slots to datetime objects with UTC timezone
         candidate_dt_slots = []
@@ -91,6 +271,8 @@ class SchedulerTool(LLMTool):
         
         # Find first available slot that doesn't conflict with interviewer's calendar
         for slot in candidate_dt_slots:
+            if exclude and slot.strftime("%Y-%m-%dT%H:%M") in exclude:
+                continue
             slot_end = slot + timedelta(hours=1)  # Assuming 1-hour interviews
             
             # Check if slot conflicts with any existing events
@@ -125,20 +307,28 @@ class SchedulerTool(LLMTool):
         if not candidate.get('available_slots'):
             return None
         
-        # Find an available slot
-        interview_slot = self.find_available_slot(candidate['available_slots'])
-        
-        if interview_slot:
+        # Slots another request booked between our calendar query and our insert
+        taken: Set[str] = set()
+        while True:
+            # Find an available slot
+            # Calendar services block (SQLite, HTTP); keep them off the event loop
+            interview_slot = await asyncio.to_thread(self.find_available_slot, candidate['available_slots'], taken)
+            if not interview_slot:
+                return None
+
+            start = datetime.fromisoformat(f"{interview_slot['date']}T{interview_slot['time']}:00+00:00")
+            end = start + timedelta(hours=1)
+
             # Create calendar event
             event = {
                 'summary': f'Interview: {candidate["name"]} - {job_title}',
                 'description': f'Initial screening interview with {candidate["name"]} for {job_title} position.',
                 'start': {
-                    'dateTime': f"{interview_slot['date']}T{interview_slot['time']}:00Z",
+                    'dateTime': start.strftime("%Y-%m-%dT%H:%M:%SZ"),
                     'timeZone': 'UTC',
                 },
                 'end': {
-                    'dateTime': f"{interview_slot['date']}T{interview_slot['time']}:00Z",
+                    'dateTime': end.strftime("%Y-%m-%dT%H:%M:%SZ"),
                     'timeZone': 'UTC',
                 },
                 'reminders': {
@@ -150,15 +340,17 @@ class SchedulerTool(LLMTool):
                 },
             }
             
-            event = self.service.insert_event(calendarId='primary', body=event)
+            with span("calendar_insert", **{"calendar.id": "primary"}):
+                event = await asyncio.to_thread(self.service.insert_event_if_free, 'primary', event)
+            if event is None:
+                taken.add(f"{interview_slot['date']}T{interview_slot['time']}")
+                continue
             
             return {
                 **interview_slot,
                 "event_id": event['id'],
                 "meeting_link": "https://meet.google.com/xxx-yyyy-zzz"  # Mock meeting link
             }
-        
-        return None
 
     async def run(self, candidate: dict) -> str:
         """Main entry point for the scheduler tool."""
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from multiprocessing import AuthenticationError, Process
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import Field
+
+from .cv_corpus import CVDocument, list_cv_files, load_cv_corpus
+from .config import load_config
+from .cv_matcher import CVMatcherTool
+from .dedup import near_duplicate_clusters
+from .tracing import span
+
+logger = logging.getLogger('Sharding')
+
+Address = Union[str, Tuple[str, int]]
+
+
+def shard_of(path: str, shard_count: int) -> int:
+    """Stable shard of a CV file; uses the file name so nodes with different mount points agree."""
+    return zlib.crc32(os.path.basename(path).encode('utf-8')) % shard_count
+
+
+def parse_address(address: str) -> Address:
+    """"host:port" for TCP, anything else (e.g. "/tmp/shard0.sock") is a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def default_authkey() -> bytes:
+    """The shared key from RECRUITER_SHARD_AUTHKEY.
+
+    Messages are pickles, so anyone holding the key can run code on the other
+    side; there is no built-in fallback and workers refuse to start without one.
+    """
+    key = os.getenv("RECRUITER_SHARD_AUTHKEY", "")
+    if not key:
+        raise RuntimeError("RECRUITER_SHARD_AUTHKEY must be set to a secret shared by the shard workers "
+                           "and the coordinator")
+    return key.encode('utf-8')
+
+
+class ShardCVMatcherTool(CVMatcherTool):
+    """Scores only the CVs of one hash partition of the directory and returns a local top-K."""
+
+    shard_index: int = Field(default=0)
+    shard_count: int = Field(default=1)
+
+    async def load_corpus(self) -> List[CVDocument]:
+        paths = [path for path in list_cv_files(self.cv_directory)
+                 if shard_of(path, self.shard_count) == self.shard_index]
+        return await load_cv_corpus(paths, self.text_cache, self.extraction_executor,
+                                    default_country_code=self.default_phone_country_code)
+
+    async def score_shard(self, job_description: str, top_k: int) -> Dict:
+        """Score this shard; candidates carry mtime and MinHash signature so the coordinator can dedup."""
+        if not os.path.isdir(self.cv_directory):
+            return {"status": "error", "error": "CV directory not found.", "candidates": [], "scored": 0}
+
+        top: List[Tuple[float, int, Dict]] = []
+        scored = duplicates = 0
+        async with aclosing(self.stream(job_description)) as candidates:
+            async for candidate in candidates:
+                scored += 1
+                duplicates += len(candidate.get("older_versions", []))
+                entry = (candidate["match_score"], -scored, candidate)
+                if len(top) < top_k:
+                    heapq.heappush(top, entry)
+                elif entry[:2] > top[0][:2]:
+                    heapq.heapreplace(top, entry)
+
+        results = []
+        for _, _, candidate in sorted(top, reverse=True):
+            stat = os.stat(candidate["cv_path"])
+            extracted = self.text_cache.get(candidate["cv_path"], stat)
+            candidate["mtime"] = stat.st_mtime
+            candidate["signature"] = extracted["signature"] if extracted else None
+            results.append(candidate)
+        return {"status": "success", "candidates": results, "scored": scored, "duplicates_skipped": duplicates}
+
+
+class ShardWorker:
+    """Serves one shard over a multiprocessing.connection listener (TCP or Unix socket).
+
+    Requests are dicts: {"op": "score", "job_description", "top_k"}, {"op": "ping"}
+    or {"op": "shutdown"}; every connection is handled on its own thread.
+    """
+
+    def __init__(self, tool: ShardCVMatcherTool, address: str, authkey: Optional[bytes] = None):
+        self.tool = tool
+        self.address = address
+        self.authkey = authkey or default_authkey()
+        self._listener: Optional[Listener] = None
+        self._stopped = threading.Event()
+
+    def handle(self, request: Dict) -> Dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"status": "success", "shard": self.tool.shard_index}
+        if op == "score":
+            started = time.perf_counter()
+            response = asyncio.run(self.tool.score_shard(request["job_description"], request.get("top_k", 5)))
+            response.update(shard=self.tool.shard_index, seconds=round(time.perf_counter() - started, 4))
+            return response
+        return {"status": "error", "error": f"Unknown op: {op}"}
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while not self._stopped.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if request.get("op") == "shutdown":
+                    conn.send({"status": "success"})
+                    self.stop()
+                    return
+                try:
+                    response = self.handle(request)
+                except Exception as e:
+                    logger.exception("Shard request failed")
+                    response = {"status": "error", "error": str(e)}
+                conn.send(response)
+
+    def serve_forever(self) -> None:
+        self._listener = Listener(parse_address(self.address), authkey=self.authkey)
+        logger.info("Shard %d/%d listening on %s", self.tool.shard_index, self.tool.shard_count, self.address)
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    # A client that failed authentication, or the wake-up connection from stop()
+                    continue
+                if self._stopped.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+
+    def stop(self) -> None:
+        """Stop accepting connections; a throwaway connection wakes the blocked accept()."""
+        self._stopped.set()
+        address = parse_address(self.address)
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        with socket.socket(family) as wake:
+            try:
+                wake.connect(address)
+            except OSError:
+                pass
+
+
+def serve_shard(address: str, shard_index: int, shard_count: int, cv_directory: str,
+                tool_cls: Type[ShardCVMatcherTool] = ShardCVMatcherTool,
+                extraction_workers: int = 1, authkey: Optional[bytes] = None, **tool_kwargs) -> None:
+    """Run a shard worker until it receives a shutdown request (process entry point)."""
+    executor = ProcessPoolExecutor(max_workers=max(extraction_workers, 1))
+    # Fork the extraction workers now, before any connection threads exist
+    executor.submit(os.getpid).result()
+    tool = tool_cls(cv_directory=cv_directory, shard_index=shard_index, shard_count=shard_count,
+                    extraction_executor=executor, **tool_kwargs)
+    try:
+        ShardWorker(tool, address, authkey).serve_forever()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def spawn_local_workers(cv_directory: str, shard_count: int, socket_dir: Optional[str] = None,
+                        tool_cls: Type[ShardCVMatcherTool] = ShardCVMatcherTool,
+                        ready_timeout: float = 30.0, **tool_kwargs) -> Tuple[List[str], List[Process], bytes]:
+    """Start one worker process per shard on Unix sockets and wait until they answer a ping.
+
+    Returns the socket paths, the processes and the random key generated for
+    this run (pass it to ShardedCVMatcherTool as `shard_authkey`). Workers are
+    not daemonic (they own an extraction process pool); stop them with
+    stop_local_workers().
+    """
+    socket_dir = socket_dir or tempfile.mkdtemp(prefix="recruiter-shards-")
+    addresses = [os.path.join(socket_dir, f"shard{index}.sock") for index in range(shard_count)]
+    authkey = os.urandom(32)
+    processes = []
+    for index, address in enumerate(addresses):
+        process = Process(target=serve_shard, args=(address, index, shard_count, cv_directory, tool_cls),
+                          kwargs={**tool_kwargs, "authkey": authkey})
+        process.start()
+        processes.append(process)
+
+    deadline = time.monotonic() + ready_timeout
+    for address in addresses:
+        while True:
+            try:
+                send_request(address, {"op": "ping"}, authkey, timeout=max(deadline - time.monotonic(), 0.1))
+                break
+            except (OSError, EOFError):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Shard worker {address} did not start")
+                time.sleep(0.05)
+    return addresses, processes, authkey
+
+
+def stop_local_workers(addresses: List[str], processes: List[Process], authkey: Optional[bytes] = None,
+                       timeout: float = 5.0) -> None:
+    for address in addresses:
+        try:
+            send_request(address, {"op": "shutdown"}, authkey, timeout=timeout)
+        except (OSError, EOFError, TimeoutError):
+            pass
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+
+
+def _set_io_timeout(sock: socket.socket, seconds: float) -> None:
+    """Bound every blocking read and write on the socket (the Connection uses the raw descriptor)."""
+    seconds = max(seconds, 0.001)
+    value = struct.pack("ll", int(seconds), int(seconds % 1 * 1_000_000))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, value)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, value)
+
+
+def send_request(address: str, request: Dict, authkey: Optional[bytes] = None,
+                 timeout: Optional[float] = None) -> Dict:
+    """Send one request to a shard worker and wait for the reply.
+
+    With a timeout, connecting, authenticating, sending and receiving together
+    take at most about that long; each step gets whatever is left of it.
+    """
+    authkey = authkey or default_authkey()
+    address = parse_address(address)
+    if timeout is None:
+        with Client(address, authkey=authkey) as conn:
+            conn.send(request)
+            return conn.recv()
+
+    deadline = time.monotonic() + timeout
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.setblocking(True)
+        try:
+            with Connection(os.dup(sock.fileno())) as conn:
+                _set_io_timeout(sock, deadline - time.monotonic())
+                answer_challenge(conn, authkey)
+                deliver_challenge(conn, authkey)
+                conn.send(request)
+                if not conn.poll(max(deadline - time.monotonic(), 0)):
+                    raise TimeoutError(f"Shard {address} did not answer within {timeout}s")
+                _set_io_timeout(sock, deadline - time.monotonic())
+                return conn.recv()
+        except BlockingIOError as e:
+            raise TimeoutError(f"Shard {address} did not answer within {timeout}s") from e
+
+
+class ShardedCVMatcherTool(CVMatcherTool):
+    """Coordinator: fans a job out to shard workers and merges their local top-K lists.
+
+    Near-duplicates that landed in different shards are collapsed at merge time
+    (newest wins) using the MinHash signatures the workers return.
+    """
+
+    name: str = "Sharded CV Matching Tool"
+    shard_addresses: List[str] = Field(default_factory=list)
+    shard_timeout: float = Field(default=600.0)
+    # Defaults to RECRUITER_SHARD_AUTHKEY; spawn_local_workers() returns a per-run key
+    shard_authkey: Optional[bytes] = Field(default=None, exclude=True, repr=False)
+    top_k: int = Field(default=5)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if not self.shard_addresses:
+            self.shard_addresses = [address.strip() for address in os.getenv("CV_SHARD_ADDRESSES", "").split(",")
+                                    if address.strip()]
+
+    async def load_corpus(self) -> List[CVDocument]:
+        """The corpus is extracted by the shard workers, not the coordinator."""
+        return []
+
+    async def query_shard(self, address: str, job_description: str, top_k: int) -> Dict:
+        request = {"op": "score", "job_description": job_description, "top_k": top_k}
+        try:
+            with span("shard_query", **{"shard.address": address}):
+                response = await asyncio.to_thread(send_request, address, request, self.shard_authkey,
+                                                   self.shard_timeout)
+        except Exception as e:
+            response = {"status": "error", "error": str(e)}
+        response["address"] = address
+        return response
+
+    def merge(self, responses: List[Dict], top_k: int) -> Tuple[List[Dict], int]:
+        """Global top-K from the shards' local top-K lists; returns it and the cross-shard duplicates dropped."""
+        candidates = [candidate for response in responses if response.get("status") == "success"
+                      for candidate in response["candidates"]]
+        dropped = set()
+        signed = [index for index, candidate in enumerate(candidates) if candidate.get("signature") is not None]
+        if self.deduplicate and len(signed) > 1:
+            clusters = near_duplicate_clusters([candidates[index]["signature"] for index in signed],
+                                               self.dedup_threshold)
+            for members in clusters:
+                members = [signed[member] for member in members]
+                newest = max(members, key=lambda index: (candidates[index]["mtime"], candidates[index]["cv_path"]))
+                for index in members:
+                    if index != newest:
+                        dropped.add(index)
+                        candidates[newest].setdefault("older_versions", []).append(candidates[index]["cv_path"])
+
+        kept = [candidate for index, candidate in enumerate(candidates) if index not in dropped]
+        for candidate in kept:
+            candidate.pop("signature", None)
+            candidate.pop("mtime", None)
+        return heapq.nlargest(top_k, kept, key=lambda candidate: candidate["match_score"]), len(dropped)
+
+    async def run(self, job_description: str) -> Dict:
+        """Match CVs across all shards and return the top candidates."""
+        if not self.shard_addresses:
+            return {"status": "error", "error": "No shard workers configured.", "candidates": [],
+                    "total_candidates": 0}
+
+        with span("sharded_matching", **{"shards": len(self.shard_addresses)}) as current:
+            responses = await asyncio.gather(*(
+                self.query_shard(address, job_description, self.top_k) for address in self.shard_addresses
+            ))
+            top_candidates, cross_shard_duplicates = self.merge(responses, self.top_k)
+            current.set_attribute("shards.failed", sum(r.get("status") != "success" for r in responses))
+
+        shards = [{key: response.get(key) for key in ("address", "status", "scored", "seconds", "error")
+                   if response.get(key) is not None} for response in responses]
+        total = sum(response.get("scored", 0) for response in responses)
+        if not top_candidates:
+            return {"status": "error", "error": "No CVs scored by any shard.", "candidates": [],
+                    "total_candidates": total, "shards": shards}
+        return {
+            "status": "success",
+            "candidates": top_candidates,
+            "total_candidates": total,
+            "duplicates_skipped": cross_shard_duplicates + sum(r.get("duplicates_skipped", 0) for r in responses),
+            "shards": shards
+        }
+
+    async def stream(self, job_description: str) -> AsyncIterator[Dict]:
+        """Shards only return their top-K, so the merged candidates are yielded once all shards answer."""
+        result = await self.run(job_description)
+        for candidate in result.get("candidates", []):
+            yield candidate
+
+
+def main(argv=None) -> None:
+    load_config()
+    parser = argparse.ArgumentParser(prog="python -m agents.sharding", description="Run one CV shard worker.")
+    parser.add_argument("--address", required=True, help="host:port or a Unix socket path")
+    parser.add_argument("--shard", type=int, required=True, help="index of this shard")
+    parser.add_argument("--shards", type=int, required=True, help="total number of shards")
+    parser.add_argument("--cv-directory", default=os.getenv("CV_DIRECTORY", "cvs"))
+    parser.add_argument("--extraction-workers", type=int, default=1)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    serve_shard(args.address, args.shard, args.shards, args.cv_directory,
+                extraction_workers=args.extraction_workers,
+                default_phone_country_code=os.getenv("DEFAULT_PHONE_COUNTRY_CODE", ""))
+
+
+if __name__ == "__main__":
+    main()
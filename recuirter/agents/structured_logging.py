@@ -0,0 +1,194 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from .candidates import to_jsonable
+from .tracing import current_correlation_id
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def dump_payload(payload: Any) -> str:
+    """Compact JSON for log payloads; candidate records become dicts, anything else json can't handle is stringified."""
+    return json.dumps(payload, separators=(',', ':'), default=to_jsonable, ensure_ascii=False)
+
+
+def payload_json(record: logging.LogRecord) -> Optional[str]:
+    """The record's payload as compact JSON, serialized once and shared by every handler's formatter."""
+    if getattr(record, "payload_json", None) is None and getattr(record, "payload", None) is not None:
+        record.payload_json = dump_payload(record.payload)
+        record.payload = None
+    return getattr(record, "payload_json", None)
+
+
+class JSONLineFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in ("event", "correlation_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False)
+
+        payload = payload_json(record)
+        if payload is not None:
+            # Splice the compact payload in instead of nesting and re-encoding it.
+            line = f'{line[:-1]},"payload":{payload}}}'
+        return line
+
+
+class PayloadTextFormatter(logging.Formatter):
+    """The classic text format with the compact payload appended to the message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        payload = payload_json(record)
+        if payload is not None:
+            line = f"{line} {payload}"
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in N records per event name, e.g. {"candidate.contacted": 0.1} keeps 10%.
+
+    Only records tagged with an `event` below WARNING are sampled. Sampling is
+    counter based rather than random so volumes are predictable.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.intervals = {}
+        for event, rate in (rates or {}).items():
+            self.intervals[event] = 0 if rate <= 0 else max(int(round(1 / min(rate, 1.0))), 1)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno >= logging.WARNING or event not in self.intervals:
+            return True
+        interval = self.intervals[event]
+        if interval == 0:
+            return False
+        with self._lock:
+            count = self._counts.get(event, 0)
+            self._counts[event] = count + 1
+        return count % interval == 0
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that only renders the message on the caller's thread.
+
+    Payload serialization, formatting into the final line and all file/stream
+    I/O happen on the QueueListener thread, so the payload is written as it is
+    at that point; log a copy if the caller mutates it right after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "correlation_id", None) is None:
+            record.correlation_id = current_correlation_id()
+        return record
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "event=0.1,other=0.5" into a rate mapping."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        event, _, rate = item.partition('=')
+        rates[event.strip()] = float(rate)
+    return rates
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def configure_logging(mode: Optional[str] = None, level: int = logging.INFO,
+                      log_file: Optional[str] = 'agent_execution.log',
+                      sample_rates: Optional[Dict[str, float]] = None,
+                      stream: bool = True) -> logging.handlers.QueueListener:
+    """Route the root logger through a queue to a background writer thread.
+
+    `mode` is "json" for compact JSON lines or "text" for the classic format;
+    it defaults to $RECRUITER_LOG_MODE (text). Sample rates default to
+    $RECRUITER_LOG_SAMPLE ("event=rate,..."). Calling it again replaces the
+    previous configuration after flushing and closing its handlers.
+    """
+    global _listener
+    mode = mode or os.getenv("RECRUITER_LOG_MODE", "text")
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("RECRUITER_LOG_SAMPLE", ""))
+    formatter = JSONLineFormatter() if mode == "json" else PayloadTextFormatter(TEXT_FORMAT)
+
+    handlers: List[logging.Handler] = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    if stream:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    with _listener_lock:
+        _stop_listener()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the writer thread and close its handlers."""
+    with _listener_lock:
+        _stop_listener()
+
+
+atexit.register(shutdown_logging)
+
+
+def log_event(logger: logging.Logger, level: int, event: str, message: str, payload: Any = None) -> None:
+    """Log `message` tagged with `event`, attaching `payload` only if the level is enabled."""
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"event": event}
+    if payload is not None:
+        extra["payload"] = payload
+    logger.log(level, message, extra=extra, stacklevel=2)
@@ -0,0 +1,320 @@
+import atexit
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # label key -> (per-bucket counts, sum, count)
+        self.values: Dict[LabelKey, List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            entry[0][index] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        with self._lock:
+            self._metrics[name].inc(amount, **labels)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._metrics[name].observe(value, **labels)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            lines = []
+            for name in sorted(self._metrics):
+                lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.histogram("recruiter_stage_duration_seconds", "Duration of traced workflow stages")
+metrics.counter("recruiter_stage_errors_total", "Traced workflow stages that raised")
+metrics.counter("recruiter_llm_prompt_tokens_total", "Prompt tokens evaluated by the LLM")
+metrics.counter("recruiter_llm_completion_tokens_total", "Completion tokens generated by the LLM")
+metrics.histogram("recruiter_llm_time_to_first_token_seconds",
+                  "Model load plus prompt evaluation time reported by Ollama")
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict:
+        """Serialize as an OTLP/JSON span (the format of the collector's file exporter)."""
+        attributes = []
+        for key, value in self.attributes.items():
+            if isinstance(value, bool):
+                typed = {"boolValue": value}
+            elif isinstance(value, int):
+                typed = {"intValue": str(value)}
+            elif isinstance(value, float):
+                typed = {"doubleValue": value}
+            else:
+                typed = {"stringValue": str(value)}
+            attributes.append({"key": key, "value": typed})
+
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": attributes,
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class FileSpanExporter:
+    """Appends finished spans to a file as OTLP/JSON lines.
+
+    export() only enqueues the span; serialization and file I/O happen on a
+    background writer thread, so spans ending on the event loop never block it.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, service_name: str = "recruiter-agent"):
+        self.path = path
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self._file = open(path, 'a')
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def format(self, span: Span) -> str:
+        return json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{"scope": {"name": "recruiter.tracing"}, "spans": [span.to_otlp()]}]
+            }]
+        }, separators=(',', ':'))
+
+    def _write_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            # Block for one span, then write everything that queued up meanwhile in one go
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for item in batch:
+                if item is self._STOP:
+                    stopping = True
+                else:
+                    lines.append(self.format(item) + "\n")
+            if lines:
+                self._file.write("".join(lines))
+                self._file.flush()
+        self._file.close()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Write the spans still queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("recruiter_current_span", default=None)
+_correlation_id: ContextVar[Optional[str]] = ContextVar("recruiter_correlation_id", default=None)
+_exporter: Optional[FileSpanExporter] = (
+    FileSpanExporter(os.environ["RECRUITER_TRACE_FILE"]) if os.getenv("RECRUITER_TRACE_FILE") else None
+)
+
+
+def configure_trace_file(path: Optional[str]) -> None:
+    """Export finished spans to `path` as OTLP/JSON lines, or stop exporting with None."""
+    global _exporter
+    shutdown_tracing()
+    _exporter = FileSpanExporter(path) if path else None
+
+
+def shutdown_tracing() -> None:
+    """Flush queued spans to the trace file and stop its writer thread."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
+
+
+atexit.register(shutdown_tracing)
+
+
+def current_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _is_trace_id(value: str) -> bool:
+    return len(value) == 32 and all(c in "0123456789abcdef" for c in value)
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """Tag every span started inside the block with a request/job correlation id."""
+    correlation_id = correlation_id or uuid.uuid4().hex
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """Time a workflow stage, record it in the metrics registry and export it as a span."""
+    parent = _current_span.get()
+    correlation_id = _correlation_id.get()
+    if correlation_id:
+        attributes.setdefault("correlation.id", correlation_id)
+    if parent is not None:
+        trace_id = parent.trace_id
+    elif correlation_id and _is_trace_id(correlation_id):
+        trace_id = correlation_id
+    else:
+        trace_id = uuid.uuid4().hex
+    current = Span(name, trace_id, parent.span_id if parent else None, attributes)
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        metrics.observe("recruiter_stage_duration_seconds", current.duration, stage=name)
+        if current.error:
+            metrics.inc("recruiter_stage_errors_total", stage=name)
+        if _exporter is not None:
+            _exporter.export(current)
+
+
+def record_llm_usage(current: Span, response: Dict) -> None:
+    """Copy Ollama's token counters and time-to-first-token onto a span and the metrics."""
+    prompt_tokens = response.get("prompt_eval_count", 0) or 0
+    completion_tokens = response.get("eval_count", 0) or 0
+    model = current.attributes.get("llm.model", "")
+    current.set_attribute("llm.prompt_tokens", prompt_tokens)
+    current.set_attribute("llm.completion_tokens", completion_tokens)
+    metrics.inc("recruiter_llm_prompt_tokens_total", prompt_tokens, model=model)
+    metrics.inc("recruiter_llm_completion_tokens_total", completion_tokens, model=model)
+
+    if "prompt_eval_duration" in response:
+        # Non-streaming calls cannot observe the first token directly; Ollama's
+        # load + prompt evaluation time is exactly the time before decoding starts.
+        ttft = ((response.get("load_duration", 0) or 0) + (response.get("prompt_eval_duration", 0) or 0)) / 1e9
+        current.set_attribute("llm.time_to_first_token_s", ttft)
+        metrics.observe("recruiter_llm_time_to_first_token_seconds", ttft, model=model)
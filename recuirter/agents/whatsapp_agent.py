@@ -1,21 +1,71 @@
+import asyncio
 import os
+import random
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 from .base_tool import LLMTool
 from pydantic import Field
-from dotenv import load_dotenv
+from .tracing import span
+
+
+def simulated_slots(count: int = 3, days: int = 6, now: datetime = None, rng: random.Random = None) -> List[str]:
+    """Stand-in for the candidate's reply: `count` distinct one-hour weekday slots (UTC, 09:00-17:00).
+
+    Slots fall within the next `days` days (inside the scheduler's 7-day
+    window) and are drawn afresh for every contact, so candidates and
+    repeated jobs don't all compete for the same few slots.
+    """
+    now = now or datetime.now(timezone.utc)
+    rng = rng or random.Random()
+    first_day = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    options = [first_day + timedelta(days=day, hours=hour) for day in range(days) for hour in range(9, 17)
+               if (first_day + timedelta(days=day)).weekday() < 5]
+    return [slot.isoformat() for slot in sorted(rng.sample(options, min(count, len(options))))]
 
-load_dotenv()
 
 class WhatsAppTool(LLMTool):
     name: str = "WhatsApp Communication Tool"
     description: str = "A tool that handles WhatsApp communication with candidates for interview scheduling"
     arg: str = "A candidate object containing contact information and interview details"
     whatsapp_token: str = Field(default="")
+    # Base URL of the load test's Cloud API stand-in; messages are only simulated without it
+    whatsapp_api_url: str = Field(default="")
+    whatsapp_phone_number_id: str = Field(default="")
+    send_timeout: float = Field(default=10.0)
 
     def __init__(self, **data):
         super().__init__(**data)
         if not self.whatsapp_token:
             self.whatsapp_token = os.getenv("WHATSAPP_TOKEN", "")
+        if not self.whatsapp_api_url:
+            self.whatsapp_api_url = os.getenv("WHATSAPP_API_URL", "")
+        if not self.whatsapp_phone_number_id:
+            self.whatsapp_phone_number_id = os.getenv("WHATSAPP_PHONE_NUMBER_ID", "")
+
+    async def send_message(self, phone: str, message: str) -> bool:
+        """POST the message to `whatsapp_api_url` in Cloud API shape (one attempt); True when it was accepted.
+
+        Only the load test sets the URL, so its stand-in sees real traffic;
+        the candidate's reply is still simulated either way.
+        """
+        if not self.whatsapp_api_url:
+            return True
+        url = f"{self.whatsapp_api_url.rstrip('/')}/{self.whatsapp_phone_number_id}/messages"
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": phone,
+            "type": "text",
+            "text": {"body": message}
+        }
+        headers = {"Authorization": f"Bearer {self.whatsapp_token}"}
+        try:
+            response = await asyncio.to_thread(self.http.post, url, json=payload, headers=headers,
+                                               timeout=self.send_timeout)
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            print(f"Error sending WhatsApp message: {str(e)}")
+            return False
         
     async def contact_candidate(self, candidate: dict) -> Dict:
         """Contact candidate via WhatsApp and get available slots."""
@@ -27,18 +77,15 @@ class WhatsAppTool(LLMTool):
         Name: {candidate['name']}
         """
         
-        message = await self.generate_response(prompt, system_prompt)
+        with span("message_send", **{"whatsapp.action": "contact"}):
+            message = await self.generate_response(prompt, system_prompt)
+            sent = await self.send_message(candidate.get('phone', ''), message)
         
-        # In a real implementation, you would send this message via WhatsApp API
-        # For now, we'll simulate the response
+        # The candidate's reply (their available slots) is still simulated
         return {
-            "success": True,
+            "success": sent,
             "message": message,
-            "available_slots": [
-                "2024-03-20T10:00:00",
-                "2024-03-20T14:00:00",
-                "2024-03-21T11:00:00"
-            ]
+            "available_slots": simulated_slots()
         }
     
     async def send_interview_confirmation(self, candidate: dict, interview: dict) -> bool:
@@ -54,10 +101,9 @@ class WhatsAppTool(LLMTool):
         Format: {interview['format']}
         """
         
-        message = await self.generate_response(prompt, system_prompt)
-        
-        # In a real implementation, you would send this message via WhatsApp API
-        return True
+        with span("message_send", **{"whatsapp.action": "confirmation"}):
+            message = await self.generate_response(prompt, system_prompt)
+            return await self.send_message(candidate.get('phone', ''), message)
 
     async def run(self, candidate: dict) -> str:
         """Main entry point for the WhatsApp tool."""
@@ -0,0 +1,4 @@
+"""Reproducible benchmarks for the recruitment workflow.
+
+Run with `python -m benchmarks --help` from the `recuirter` directory.
+"""
@@ -0,0 +1,49 @@
+import json
+import os
+from typing import Dict, List
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def baseline_path(name: str) -> str:
+    if name.endswith('.json') or os.sep in name:
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(report: Dict, name: str) -> str:
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(name: str) -> Dict:
+    with open(baseline_path(name)) as file:
+        return json.load(file)
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = 0.10) -> List[Dict]:
+    """List stage metrics that regressed by more than `tolerance` relative to the baseline.
+
+    Latency percentiles regress when they grow, throughput when it shrinks.
+    """
+    regressions = []
+    base_stages = baseline.get("stages", {})
+    for stage, metrics in current.get("stages", {}).items():
+        base = base_stages.get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base.get(key) and metrics.get(key, 0) > base[key] * (1 + tolerance):
+                regressions.append({"stage": stage, "metric": key, "baseline": base[key], "current": metrics[key]})
+        key = "throughput_per_s"
+        if base.get(key) and metrics.get(key) is not None and metrics[key] < base[key] * (1 - tolerance):
+            regressions.append({"stage": stage, "metric": key, "baseline": base[key], "current": metrics[key]})
+
+    base_memory = baseline.get("memory", {}).get("peak_traced_mb")
+    memory = current.get("memory", {}).get("peak_traced_mb")
+    if base_memory and memory and memory > base_memory * (1 + tolerance):
+        regressions.append({"stage": "memory", "metric": "peak_traced_mb", "baseline": base_memory, "current": memory})
+    return regressions
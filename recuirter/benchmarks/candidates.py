@@ -0,0 +1,104 @@
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from agents.candidates import CandidateBatch, CandidateRecord
+
+from .corpus import synthetic_cv
+
+
+def scored_rows(count: int, seed: int) -> List[Tuple]:
+    """(name, cv_path, score, phone, email, links) per candidate, as CVMatcherTool produces them."""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        cv = synthetic_cv(rng, index)
+        path = os.path.join("cvs", f"cv_{index:06d}.pdf")
+        links = [f"https://github.com/{cv['email'].split('@')[0]}"]
+        rows.append((cv["name"], path, rng.random(), cv["phone"], cv["email"], links))
+    return rows
+
+
+def measure(build: Callable[[], object]) -> Tuple[object, int, float]:
+    """Build a structure and return it with its traced allocation size and build time."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, seconds
+
+
+def timed(action: Callable[[], object]) -> Tuple[object, float]:
+    started = time.perf_counter()
+    value = action()
+    return value, time.perf_counter() - started
+
+
+def compare(count: int, seed: int = 0, top_k: int = 5) -> Dict:
+    rows = scored_rows(count, seed)
+    keys = ("name", "cv_path", "match_score", "phone", "email", "links")
+
+    def as_dicts():
+        return [dict(zip(keys, (name, path, score, phone, email, list(links))))
+                for name, path, score, phone, email, links in rows]
+
+    def as_batch():
+        batch = CandidateBatch()
+        for name, path, score, phone, email, links in rows:
+            batch.append(CandidateRecord(name, path, score, phone, email, links))
+        return batch
+
+    dicts, dicts_bytes, dicts_build = measure(as_dicts)
+    batch, batch_bytes, batch_build = measure(as_batch)
+
+    dict_top, dict_top_seconds = timed(lambda: sorted(dicts, key=lambda c: c["match_score"], reverse=True)[:top_k])
+    batch_top, batch_top_seconds = timed(lambda: batch.top(top_k))
+    assert [c["cv_path"] for c in dict_top] == [c.cv_path for c in batch_top]
+
+    dict_json, dict_dump = timed(lambda: "\n".join(json.dumps(c, separators=(',', ':')) for c in dicts))
+    buffer = io.StringIO()
+    _, jsonl_dump = timed(lambda: batch.write_jsonl(buffer))
+    columns, columns_dump = timed(lambda: json.dumps(batch.to_columns(), separators=(',', ':')))
+    _, columns_load = timed(lambda: CandidateBatch.from_columns(json.loads(columns)))
+
+    return {
+        "candidates": count,
+        "dicts": {"memory_mb": round(dicts_bytes / 2 ** 20, 2), "build_ms": round(dicts_build * 1000, 1),
+                  "top_k_ms": round(dict_top_seconds * 1000, 2), "jsonl_ms": round(dict_dump * 1000, 1),
+                  "jsonl_mb": round(len(dict_json) / 2 ** 20, 2)},
+        "batch": {"memory_mb": round(batch_bytes / 2 ** 20, 2), "build_ms": round(batch_build * 1000, 1),
+                  "top_k_ms": round(batch_top_seconds * 1000, 2), "jsonl_ms": round(jsonl_dump * 1000, 1),
+                  "jsonl_mb": round(len(buffer.getvalue()) / 2 ** 20, 2),
+                  "columns_ms": round(columns_dump * 1000, 1), "columns_mb": round(len(columns) / 2 ** 20, 2),
+                  "columns_load_ms": round(columns_load * 1000, 1)},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.candidates",
+                                     description="Compare candidate dicts with the columnar CandidateBatch.")
+    parser.add_argument("--count", type=int, default=100000, help="scored candidates to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = compare(args.count, args.seed)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Ali", "Sara", "John", "Jane", "Omar", "Fatima", "Wei", "Priya", "Carlos", "Amina",
+               "Lucas", "Noor", "Hassan", "Emma", "Ivan", "Mei", "Zara", "David", "Aisha", "Tom"]
+LAST_NAMES = ["Khan", "Smith", "Doe", "Ahmed", "Chen", "Patel", "Garcia", "Hussain", "Ivanova",
+              "Malik", "Brown", "Silva", "Rahman", "Kim", "Novak", "Lopez", "Iqbal", "Wilson"]
+SKILLS = ["Python", "FastAPI", "Django", "Flask", "AWS", "GCP", "Azure", "Docker", "Kubernetes",
+          "PostgreSQL", "Redis", "Kafka", "React", "TypeScript", "Go", "Rust", "Terraform",
+          "Machine Learning", "PyTorch", "Pandas", "Airflow", "CI/CD", "Linux", "GraphQL"]
+TITLES = ["Backend Developer", "Software Engineer", "Data Engineer", "DevOps Engineer",
+          "Full Stack Developer", "ML Engineer", "Platform Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Tech"]
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(lines: List[str]) -> bytes:
+    """Build a minimal single-page PDF whose text PyPDF2 can extract line by line."""
+    content = "BT /F1 10 Tf 50 770 Td 13 TL\n"
+    content += "".join(f"({_escape_pdf_text(line)}) Tj T*\n" for line in lines)
+    content += "ET"
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode('latin-1')
+    return out
+
+
+def synthetic_cv(rng: random.Random, index: int) -> Dict:
+    """Generate the fields of one synthetic candidate."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    years = rng.randint(1, 15)
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "phone": f"+9715{rng.randint(0, 9)}{rng.randint(1000000, 9999999)}",
+        "title": rng.choice(TITLES),
+        "skills": skills,
+        "experience_years": years,
+        "companies": rng.sample(COMPANIES, min(3, 1 + years // 5)),
+    }
+
+
+def cv_lines(cv: Dict, rng: random.Random) -> List[str]:
+    lines = [
+        cv["name"],
+        f"{cv['title']} | {cv['email']} | {cv['phone']}",
+        "",
+        "Summary",
+        f"{cv['title']} with {cv['experience_years']} years of experience building production systems.",
+        "",
+        "Skills",
+        ", ".join(cv["skills"]),
+        "",
+        "Experience",
+    ]
+    for company in cv["companies"]:
+        skill = rng.choice(cv["skills"])
+        lines.append(f"{company} - {cv['title']}")
+        lines.append(f"Delivered services using {skill}; improved reliability and latency.")
+    return lines
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0, duplicate_ratio: float = 0.0) -> List[str]:
+    """Write `count` synthetic CV PDFs into `directory` and return their paths.
+
+    With `duplicate_ratio` that fraction of files are lightly edited re-uploads
+    of an earlier CV (a near-duplicate written later, so it is the newest version).
+    Generation is deterministic for a given (count, seed, duplicate_ratio); an
+    existing corpus with a matching marker file is reused so large corpora are
+    only written once.
+    """
+    os.makedirs(directory, exist_ok=True)
+    marker = os.path.join(directory, ".corpus")
+    signature = f"{count}:{seed}:{duplicate_ratio}"
+    paths = [os.path.join(directory, f"cv_{index:06d}.pdf") for index in range(count)]
+
+    if os.path.exists(marker):
+        with open(marker) as file:
+            if file.read().strip() == signature:
+                return paths
+
+    for name in os.listdir(directory):
+        if name.endswith('.pdf'):
+            os.remove(os.path.join(directory, name))
+
+    rng = random.Random(seed)
+    written: List[List[str]] = []
+    for index, path in enumerate(paths):
+        if written and rng.random() < duplicate_ratio:
+            lines = list(rng.choice(written))
+            lines.append("References available on request.")
+        else:
+            lines = cv_lines(synthetic_cv(rng, index), rng)
+            written.append(lines)
+        with open(path, 'wb') as file:
+            file.write(pdf_bytes(lines))
+
+    with open(marker, 'w') as file:
+        file.write(signature)
+    return paths
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import random
+import time
+import re
+from typing import Dict, List, Optional, Type, Union
+
+EMBEDDING_DIM = 256
+
+
+class FakeLLMMixin:
+    """Deterministic stand-in for the Ollama calls made by LLMTool.
+
+    Scores are derived from a hash of the prompt so repeated runs produce the
+    same ranking. Latency is `fake_latency` +/- `fake_jitter` seconds; with
+    `fake_blocking` the delay blocks the event loop, which shows what an
+    unthreaded HTTP call would cost.
+    """
+
+    def _fake_rng(self, prompt: str) -> random.Random:
+        digest = hashlib.blake2b(f"{self.fake_seed}:{prompt}".encode('utf-8'), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest, 'big'))
+
+    async def _fake_delay(self, rng: random.Random) -> None:
+        delay = max(self.fake_latency + rng.uniform(-self.fake_jitter, self.fake_jitter), 0.0)
+        if not delay:
+            return
+        if self.fake_blocking:
+            time.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+
+    async def generate_response(self, prompt: str, system_prompt: str = None) -> str:
+        rng = self._fake_rng(prompt)
+        await self._fake_delay(rng)
+        return f"{rng.random():.3f}"
+
+    async def generate_completion(self, prompt: str, system_prompt: str = None,
+                                  keep_alive: Union[int, str] = None,
+                                  options: Optional[Dict] = None) -> Dict:
+        rng = self._fake_rng(prompt)
+        await self._fake_delay(rng)
+        prompt_tokens = len(prompt) // 4
+        return {
+            "response": f"{rng.random():.3f}",
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(self.fake_latency * 1e9),
+            "eval_count": 3
+        }
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Hashed bag-of-words vectors: deterministic, and similar texts stay similar."""
+        await self._fake_delay(self._fake_rng(texts[0] if texts else ""))
+        vectors = []
+        for text in texts:
+            vector = [0.0] * EMBEDDING_DIM
+            for word in re.findall(r"\w+", text.lower()):
+                bucket = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=4).digest(), 'big')
+                vector[bucket % EMBEDDING_DIM] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+def fake_tool_class(tool_cls: Type) -> Type:
+    """Build a subclass of an LLMTool whose model calls are served by FakeLLMMixin."""
+
+    class FakeTool(FakeLLMMixin, tool_cls):
+        fake_latency: float = 0.0
+        fake_jitter: float = 0.0
+        fake_blocking: bool = False
+        fake_seed: int = 0
+
+    FakeTool.__name__ = FakeTool.__qualname__ = f"Fake{tool_cls.__name__}"
+    return FakeTool
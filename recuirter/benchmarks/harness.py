@@ -0,0 +1,85 @@
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an unsorted list (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class StageRecorder:
+    """Collects per-call latencies for named stages of the workflow."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.wall_time: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies.setdefault(stage, []).append(time.perf_counter() - start)
+
+    @contextmanager
+    def wall(self, stage: str):
+        """Measure the wall-clock time of a whole stage, used for throughput."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wall_time[stage] = self.wall_time.get(stage, 0.0) + time.perf_counter() - start
+
+    def summary(self) -> Dict[str, Dict]:
+        stages = {}
+        for stage, values in self.latencies.items():
+            wall = self.wall_time.get(stage, sum(values))
+            stages[stage] = {
+                "count": len(values),
+                "throughput_per_s": round(len(values) / wall, 3) if wall else None,
+                "mean_ms": round(1000 * sum(values) / len(values), 3),
+                "p50_ms": round(1000 * percentile(values, 50), 3),
+                "p95_ms": round(1000 * percentile(values, 95), 3),
+                "p99_ms": round(1000 * percentile(values, 99), 3),
+                "max_ms": round(1000 * max(values), 3),
+            }
+        return stages
+
+
+class MemoryTracker:
+    """Peak Python heap (tracemalloc) and process RSS over a benchmark run."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.peak_traced_bytes = 0
+
+    def __enter__(self):
+        if self.enabled:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            _, self.peak_traced_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return False
+
+    def summary(self) -> Dict:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            max_rss *= 1024  # Linux reports kilobytes, macOS bytes
+        return {
+            "peak_traced_mb": round(self.peak_traced_bytes / 2**20, 3) if self.enabled else None,
+            "max_rss_mb": round(max_rss / 2**20, 3),
+        }
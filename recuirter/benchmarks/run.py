@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from agents.cv_matcher import CVMatcherTool
+from agents.matrix_matcher import BulkCVMatcherTool
+from agents.sharding import ShardCVMatcherTool, ShardedCVMatcherTool, spawn_local_workers, stop_local_workers
+from agents.whatsapp_agent import WhatsAppTool
+from agents.scheduler_agent import SchedulerTool
+
+from .baseline import compare_reports, load_baseline, save_baseline
+from .corpus import generate_corpus, synthetic_cv
+from .fake_llm import fake_tool_class
+from .harness import MemoryTracker, StageRecorder
+
+SCENARIOS = ["cv_matching", "bulk_matching", "sharded_matching", "whatsapp", "scheduler", "process_job"]
+
+JOB_TITLE = "Senior Python Developer"
+JOB_DESCRIPTION = ("We are looking for an experienced Python developer with strong backend skills "
+                   "in FastAPI, AWS and Docker.")
+BULK_JOB_SKILLS = [["Python", "FastAPI", "AWS"], ["Go", "Kubernetes", "Terraform"], ["React", "TypeScript", "GraphQL"],
+                   ["PyTorch", "Machine Learning", "Pandas"], ["Kafka", "Airflow", "PostgreSQL"]]
+
+
+def recorded_cv_matcher_class(recorder: StageRecorder):
+    """Fake CV matcher that records per-CV extraction and scoring latency."""
+    base = fake_tool_class(CVMatcherTool)
+
+    class RecordedCVMatcherTool(base):
+        async def load_corpus(self):
+            documents = await super().load_corpus()
+            extracted = [document.extract_seconds for document in documents if not document.cached]
+            recorder.latencies.setdefault("pdf_extraction", []).extend(extracted)
+            return documents
+
+        async def analyze_cv(self, cv_text: str, job_description: str) -> float:
+            with recorder.measure("llm_scoring"):
+                return await super().analyze_cv(cv_text, job_description)
+
+        async def analyze_cv_with_prefix(self, cv_text: str, stats) -> float:
+            with recorder.measure("llm_scoring"):
+                return await super().analyze_cv_with_prefix(cv_text, stats)
+
+    return RecordedCVMatcherTool
+
+
+def build_tools(args, recorder: StageRecorder) -> Dict:
+    llm = {"fake_latency": args.latency, "fake_jitter": args.jitter,
+           "fake_blocking": args.blocking_llm, "fake_seed": args.seed}
+    return {
+        "cv_matcher": recorded_cv_matcher_class(recorder)(
+            cv_directory=args.corpus_dir, reuse_prompt_prefix=args.prefix_cache, **llm),
+        "whatsapp_tool": fake_tool_class(WhatsAppTool)(**llm),
+        "scheduler_tool": fake_tool_class(SchedulerTool)(**llm),
+        "bulk_matcher": fake_tool_class(BulkCVMatcherTool)(
+            cv_directory=args.corpus_dir, reuse_prompt_prefix=args.prefix_cache,
+            prefilter_k=args.prefilter_k, refine_workers=args.refine_workers, **llm),
+    }
+
+
+def synthetic_candidates(count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    start = datetime(2030, 1, 7, 9, tzinfo=timezone.utc)
+    candidates = []
+    for index in range(count):
+        cv = synthetic_cv(rng, index)
+        slots = [(start + timedelta(hours=rng.randint(0, 24 * 5))).replace(tzinfo=None).isoformat()
+                 for _ in range(3)]
+        candidates.append({
+            "name": cv["name"],
+            "phone": cv["phone"],
+            "email": cv["email"],
+            "cv_path": f"cv_{index:06d}.pdf",
+            "match_score": rng.random(),
+            "job_title": JOB_TITLE,
+            "available_slots": slots,
+        })
+    return candidates
+
+
+async def bench_cv_matching(tools: Dict, recorder: StageRecorder, args) -> None:
+    for _ in range(args.jobs):
+        with recorder.wall("cv_matching"):
+            with recorder.measure("cv_matching"):
+                await tools["cv_matcher"].run(JOB_DESCRIPTION)
+
+
+async def bench_bulk_matching(tools: Dict, recorder: StageRecorder, args) -> None:
+    jobs = [f"Hiring an engineer skilled in {', '.join(BULK_JOB_SKILLS[index % len(BULK_JOB_SKILLS)])}."
+            for index in range(args.bulk_jobs)]
+    with recorder.wall("bulk_matching"):
+        with recorder.measure("bulk_matching"):
+            await tools["bulk_matcher"].run(jobs)
+
+
+async def bench_sharded_matching(tools: Dict, recorder: StageRecorder, args) -> None:
+    """Score the corpus with `--shards` local worker processes behind a coordinator."""
+    llm = {"fake_latency": args.latency, "fake_jitter": args.jitter,
+           "fake_blocking": args.blocking_llm, "fake_seed": args.seed}
+    addresses, processes, authkey = spawn_local_workers(args.corpus_dir, args.shards,
+                                                        tool_cls=fake_tool_class(ShardCVMatcherTool), **llm)
+    try:
+        coordinator = ShardedCVMatcherTool(shard_addresses=addresses, shard_authkey=authkey)
+        with recorder.wall("sharded_matching"):
+            for _ in range(args.jobs):
+                with recorder.measure("sharded_matching"):
+                    await coordinator.run(JOB_DESCRIPTION)
+    finally:
+        stop_local_workers(addresses, processes, authkey)
+
+
+async def bench_whatsapp(tools: Dict, recorder: StageRecorder, args) -> None:
+    candidates = synthetic_candidates(args.candidates, args.seed)
+    interview = {"date": "2030-01-07", "time": "10:00", "format": "Video Call"}
+    with recorder.wall("whatsapp_contact"):
+        for candidate in candidates:
+            with recorder.measure("whatsapp_contact"):
+                await tools["whatsapp_tool"].run(candidate)
+    with recorder.wall("whatsapp_confirmation"):
+        for candidate in candidates:
+            with recorder.measure("whatsapp_confirmation"):
+                await tools["whatsapp_tool"].run({**candidate, "interview": interview})
+
+
+async def bench_scheduler(tools: Dict, recorder: StageRecorder, args) -> None:
+    with recorder.wall("scheduling"):
+        for candidate in synthetic_candidates(args.candidates, args.seed):
+            with recorder.measure("scheduling"):
+                await tools["scheduler_tool"].run(candidate)
+
+
+async def bench_process_job(tools: Dict, recorder: StageRecorder, args) -> None:
+    """Drive the /process-job route handler with the fake tools injected."""
+    import main
+    from resources import ToolContainer
+
+    container = ToolContainer(**tools)
+
+    job = main.JobDescription(
+        title=JOB_TITLE,
+        description=JOB_DESCRIPTION,
+        requirements=["Python", "FastAPI", "AWS", "Docker"],
+        location="Remote",
+        employment_type="Full-time"
+    )
+    with recorder.wall("process_job"):
+        for _ in range(args.jobs):
+            with recorder.measure("process_job"):
+                await main.process_job(job, container)
+
+
+BENCHMARKS = {
+    "cv_matching": bench_cv_matching,
+    "bulk_matching": bench_bulk_matching,
+    "sharded_matching": bench_sharded_matching,
+    "whatsapp": bench_whatsapp,
+    "scheduler": bench_scheduler,
+    "process_job": bench_process_job,
+}
+
+
+async def run_benchmarks(args) -> Dict:
+    recorder = StageRecorder()
+    generate_corpus(args.corpus_dir, args.cvs, args.seed, args.duplicate_ratio)
+
+    started = time.perf_counter()
+    with MemoryTracker(enabled=not args.no_tracemalloc) as memory:
+        for scenario in args.scenarios:
+            # Fresh tools per scenario so calendar state does not leak between them
+            await BENCHMARKS[scenario](build_tools(args, recorder), recorder, args)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "scenarios": args.scenarios,
+            "cvs": args.cvs,
+            "duplicate_ratio": args.duplicate_ratio,
+            "candidates": args.candidates,
+            "jobs": args.jobs,
+            "bulk_jobs": args.bulk_jobs,
+            "prefilter_k": args.prefilter_k,
+            "refine_workers": args.refine_workers,
+            "shards": args.shards,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "blocking_llm": args.blocking_llm,
+            "prefix_cache": args.prefix_cache,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "stages": recorder.summary(),
+        "memory": memory.summary(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the recruitment workflow against a fake LLM.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--cvs", type=int, default=200, help="number of synthetic CV PDFs")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0,
+                        help="fraction of CVs that are near-duplicate re-uploads")
+    parser.add_argument("--candidates", type=int, default=100,
+                        help="candidates for the WhatsApp and scheduler scenarios")
+    parser.add_argument("--jobs", type=int, default=1, help="job runs for cv_matching / process_job")
+    parser.add_argument("--bulk-jobs", type=int, default=10, help="job descriptions for bulk_matching")
+    parser.add_argument("--prefilter-k", type=int, default=25, help="bulk_matching shortlist size per job")
+    parser.add_argument("--refine-workers", type=int, default=4, help="bulk_matching LLM queue workers")
+    parser.add_argument("--shards", type=int, default=2, help="worker processes for sharded_matching")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- jitter on the fake latency")
+    parser.add_argument("--blocking-llm", action="store_true",
+                        help="fake LLM blocks the event loop instead of sleeping with asyncio")
+    parser.add_argument("--prefix-cache", action="store_true", help="score with reuse_prompt_prefix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus-dir", default=None,
+                        help="where to write the corpus (default: a per-size temp directory)")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="skip tracemalloc, which slows allocation-heavy runs")
+    parser.add_argument("--output", help="write the report JSON to this file")
+    parser.add_argument("--save-baseline", metavar="NAME", help="store the report as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a named baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative slowdown allowed before --compare reports a regression")
+    args = parser.parse_args(argv)
+    if args.corpus_dir is None:
+        args.corpus_dir = os.path.join(tempfile.gettempdir(),
+                                       f"recruiter-bench-{args.cvs}-{args.seed}-{args.duplicate_ratio}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmarks(args))
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        print(f"Baseline saved to {save_baseline(report, args.save_baseline)}", file=sys.stderr)
+    if args.compare:
+        regressions = compare_reports(load_baseline(args.compare), report, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['stage']}.{regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
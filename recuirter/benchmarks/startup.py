@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of `python -X importtime` output: name, depth, self and cumulative microseconds."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One space after the separator, then two more per nesting level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append({"name": name.strip(), "depth": depth,
+                     "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return rows
+
+
+def import_profile(module: str, runs: int = 3, top: int = 10) -> Dict:
+    """Import `module` in fresh interpreters and report the wall time and the costliest imports."""
+    walls, totals, costs = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=ROOT, capture_output=True, text=True)
+        walls.append(time.perf_counter() - started)
+        if completed.returncode:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+        rows = parse_importtime(completed.stderr)
+        totals.append(sum(row["cumulative_us"] for row in rows if row["depth"] == 0))
+        # Cost per top-level package, counting imports made directly or by the module itself
+        run_costs: Dict[str, int] = {}
+        for row in rows:
+            if row["depth"] <= 1 and row["name"] != module:
+                package = row["name"].split(".")[0]
+                run_costs[package] = run_costs.get(package, 0) + row["cumulative_us"]
+        for package, value in run_costs.items():
+            costs.setdefault(package, []).append(value)
+
+    heaviest = sorted(((name, statistics.median(values)) for name, values in costs.items()),
+                      key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "process_wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "heaviest_ms": {name: round(value / 1000, 1) for name, value in heaviest},
+    }
+
+
+async def init_profile(warm: bool = False) -> Dict:
+    """Time ToolContainer.build() (and warm() against a live Ollama) on an empty CV folder."""
+    sys.path.insert(0, ROOT)
+    started = time.perf_counter()
+    from resources import ToolContainer
+    timings = {"import_resources_ms": (time.perf_counter() - started) * 1000}
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        tools = ToolContainer.build(cv_directory=os.path.join(directory, "cvs"),
+                                    calendar_db_path=os.path.join(directory, "calendar.db"))
+        timings["build_ms"] = (time.perf_counter() - started) * 1000
+        try:
+            if warm:
+                started = time.perf_counter()
+                await tools.warm()
+                timings["warm_ms"] = (time.perf_counter() - started) * 1000
+        finally:
+            started = time.perf_counter()
+            tools.close()
+            timings["close_ms"] = (time.perf_counter() - started) * 1000
+    return {name: round(value, 1) for name, value in timings.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="Report import and initialization costs of the entry points.")
+    parser.add_argument("--modules", nargs="+", default=["main", "run_agents"],
+                        help="modules to import in fresh interpreters")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list per module")
+    parser.add_argument("--warm", action="store_true", help="also time ToolContainer.warm() (needs Ollama)")
+    parser.add_argument("--output", help="write the report JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": [import_profile(module, args.runs, args.top) for module in args.modules],
+        "init": asyncio.run(init_profile(args.warm)),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
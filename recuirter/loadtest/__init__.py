@@ -0,0 +1,4 @@
+"""Load tests for the recruiter API against local stand-ins for its external services.
+
+Run with `python -m loadtest --help` from the `recuirter` directory.
+"""
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.corpus import generate_corpus
+
+from .generator import find_saturation, load_jobs, run_steps, synthetic_jobs
+from .stand_ins import free_port
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_stand_ins(profile: Optional[str], seed: int) -> Tuple[subprocess.Popen, Dict]:
+    """Start the stand-in services in a child process and return it with their URLs and env."""
+    command = [sys.executable, "-m", "loadtest.stand_ins", "--seed", str(seed)]
+    if profile:
+        command += ["--profile", profile]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError("Stand-in services failed to start")
+    return process, json.loads(line)
+
+
+def start_app(env: Dict[str, str], workers: int) -> Tuple[subprocess.Popen, str]:
+    """Run main:app under uvicorn with `workers` processes; returns it with its base URL.
+
+    The app's prints go to stderr so they can't interleave with the JSON report on stdout.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env={**os.environ, **env}, stdout=sys.stderr
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+
+def wait_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode} during start-up")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"App at {base_url} did not become healthy within {timeout:.0f}s")
+
+
+def stop(process: Optional[subprocess.Popen]) -> None:
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def service_stats(urls: Dict[str, str]) -> Dict[str, Dict]:
+    stats = {}
+    for service, url in urls.items():
+        try:
+            stats[service] = httpx.get(f"{url}/_stats", timeout=5.0).json()
+        except httpx.HTTPError as e:
+            stats[service] = {"error": str(e)}
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest",
+                                     description="Load-test /process-job against local stand-ins for every external service.")
+    parser.add_argument("--target", help="base URL of an already running app (skips starting the app and stand-ins)")
+    parser.add_argument("--profile", help="JSON file overriding the stand-ins' latency, error and rate-limit profile")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the app")
+    parser.add_argument("--cvs", type=int, default=20, help="synthetic CVs in the app's CV directory")
+    parser.add_argument("--rates", type=float, nargs="+",
+                        help="open-loop steps: requests per second (Poisson arrivals)")
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        help="closed-loop steps: concurrent users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per step")
+    parser.add_argument("--timeout", type=float, default=120.0, help="client timeout per request")
+    parser.add_argument("--max-in-flight", type=int, default=256,
+                        help="outstanding requests before open-loop arrivals are shed")
+    parser.add_argument("--replay", help="JSON lines of recorded /process-job bodies (default: synthetic jobs)")
+    parser.add_argument("--jobs", type=int, default=50, help="distinct synthetic jobs to cycle through")
+    parser.add_argument("--slo-p99-ms", type=float, help="p99 latency objective for the saturation point")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-latency-growth", type=float, default=1.5,
+                        help="late/early median latency ratio above which an open-loop step counts as overloaded")
+    parser.add_argument("--min-throughput-ratio", type=float, default=0.9,
+                        help="share of arrivals an open-loop step must complete per second to count as keeping up")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report JSON to this file")
+    args = parser.parse_args(argv)
+    if not args.rates and not args.concurrency:
+        args.rates = [0.5, 1, 2, 4]
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    jobs = load_jobs(args.replay) if args.replay else synthetic_jobs(args.jobs, args.seed)
+
+    stand_ins = app = None
+    urls: Dict[str, str] = {}
+    workdir = tempfile.TemporaryDirectory(prefix="recruiter-loadtest-")
+    try:
+        base_url = args.target
+        if base_url is None:
+            stand_ins, services = start_stand_ins(args.profile, args.seed)
+            urls = services["urls"]
+            cv_directory = os.path.join(tempfile.gettempdir(), f"recruiter-loadtest-cvs-{args.cvs}-{args.seed}")
+            generate_corpus(cv_directory, args.cvs, args.seed)
+            env = {**services["env"], "CV_DIRECTORY": cv_directory,
+                   "CALENDAR_DB_PATH": os.path.join(workdir.name, "calendar.db")}
+            app, base_url = start_app(env, args.workers)
+            wait_healthy(base_url, app)
+
+        started = time.perf_counter()
+        steps: List[Dict] = asyncio.run(run_steps(
+            base_url, jobs, args.rates, args.concurrency, args.duration, args.timeout,
+            max_in_flight=args.max_in_flight, seed=args.seed
+        ))
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "environment": {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "config": {
+                "target": args.target or "local",
+                "workers": None if args.target else args.workers,
+                "cvs": None if args.target else args.cvs,
+                "profile": args.profile,
+                "replay": args.replay,
+                "duration": args.duration,
+                "seed": args.seed,
+            },
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "steps": steps,
+            "saturation": find_saturation(steps, args.max_error_rate, args.slo_p99_ms, args.max_latency_growth,
+                                      args.min_throughput_ratio),
+        }
+        if urls:
+            report["services"] = service_stats(urls)
+    finally:
+        stop(app)
+        stop(stand_ins)
+        workdir.cleanup()
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import SKILLS, TITLES
+from benchmarks.harness import percentile
+
+EMPLOYMENT_TYPES = ["Full-time", "Full-time", "Full-time", "Contract", "Part-time"]
+LOCATIONS = ["Remote", "Dubai", "Karachi", "London", "Berlin"]
+
+
+def synthetic_jobs(count: int, seed: int = 0) -> List[Dict]:
+    """/process-job bodies with varied titles, skills and description lengths."""
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        title = f"{rng.choice(['Junior', 'Mid-level', 'Senior', 'Lead'])} {rng.choice(TITLES)}"
+        skills = rng.sample(SKILLS, rng.randint(3, 7))
+        duties = " ".join(f"You will work with {skill} on production systems." for skill in skills)
+        jobs.append({
+            "title": title,
+            "description": f"We are hiring a {title}. {duties} " * rng.randint(1, 3),
+            "requirements": skills,
+            "location": rng.choice(LOCATIONS),
+            "employment_type": rng.choice(EMPLOYMENT_TYPES),
+        })
+    return jobs
+
+
+def load_jobs(path: str) -> List[Dict]:
+    """Recorded /process-job bodies, one JSON object per line."""
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class Sample:
+    __slots__ = ("started", "seconds", "status")
+
+    def __init__(self, started: float, seconds: float, status: int):
+        self.started = started
+        self.seconds = seconds
+        # HTTP status, or 0 for a client-side timeout or connection error
+        self.status = status
+
+
+async def send(client: httpx.AsyncClient, path: str, job: Dict, samples: List[Sample]) -> None:
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, json=job)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0
+    samples.append(Sample(started, time.perf_counter() - started, status))
+
+
+def latency_growth(samples: List[Sample]) -> Optional[float]:
+    """Median latency of the last third of arrivals over that of the first third.
+
+    Close to 1 while the app keeps up; it keeps growing when requests queue
+    faster than they are served.
+    """
+    ordered = sorted((sample for sample in samples if 200 <= sample.status < 300), key=lambda s: s.started)
+    third = len(ordered) // 3
+    if third < 2:
+        return None
+    first = percentile([sample.seconds for sample in ordered[:third]], 50)
+    last = percentile([sample.seconds for sample in ordered[-third:]], 50)
+    return round(last / first, 3) if first else None
+
+
+def completion_rate(samples: List[Sample], started: float, duration: float) -> float:
+    """Successful responses per second while load was applied, skipping the warm-up.
+
+    Warm-up is the time until the first responses arrive (the median latency
+    of the first third of requests, at most half the step). Counting only
+    completions inside the load window gives the offered rate while the app
+    keeps up and its service rate once requests queue. When responses take
+    longer than the step and none lands in the window, the rate is taken
+    over the whole run instead, up to the last completion (drain included).
+    """
+    ok = sorted((sample for sample in samples if 200 <= sample.status < 300), key=lambda s: s.started)
+    if not ok:
+        return 0.0
+    warmup = min(percentile([sample.seconds for sample in ok[:max(len(ok) // 3, 1)]], 50), duration / 2)
+    window_start, window_end = started + warmup, started + duration
+    completed = sum(window_start <= sample.started + sample.seconds <= window_end for sample in ok)
+    if completed:
+        return completed / (window_end - window_start)
+    drained = max(sample.started + sample.seconds for sample in ok)
+    return len(ok) / (drained - started)
+
+
+def summarize(samples: List[Sample], throughput: float, offered: Optional[float] = None, shed: int = 0) -> Dict:
+    """Throughput and latency of one load step; latencies cover successful requests only."""
+    ok = [sample.seconds for sample in samples if 200 <= sample.status < 300]
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        key = str(sample.status) if sample.status else "timeout"
+        statuses[key] = statuses.get(key, 0) + 1
+    sent = len(samples) + shed
+    summary = {
+        "requests": len(samples),
+        "shed": shed,
+        "throughput_per_s": round(throughput, 3),
+        "error_rate": round(1 - len(ok) / sent, 4) if sent else 0.0,
+        "statuses": statuses,
+        "p50_ms": round(1000 * percentile(ok, 50), 1),
+        "p90_ms": round(1000 * percentile(ok, 90), 1),
+        "p95_ms": round(1000 * percentile(ok, 95), 1),
+        "p99_ms": round(1000 * percentile(ok, 99), 1),
+        "max_ms": round(1000 * max(ok), 1) if ok else 0.0,
+        "latency_growth": latency_growth(samples),
+    }
+    if offered is not None:
+        summary["offered_per_s"] = offered
+    return summary
+
+
+async def open_loop(client: httpx.AsyncClient, path: str, jobs: List[Dict], rate: float, duration: float,
+                    max_in_flight: int = 256, seed: int = 0) -> Dict:
+    """Send requests with Poisson arrivals at `rate` per second for `duration` seconds.
+
+    Arrivals do not wait for earlier responses, so queueing in the app shows
+    up as latency. Arrivals beyond `max_in_flight` outstanding requests are
+    shed (counted as errors) instead of growing the backlog without bound.
+    """
+    rng = random.Random(seed)
+    samples: List[Sample] = []
+    tasks = set()
+    shed = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    next_arrival = started
+    index = 0
+    while next_arrival < deadline:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        if len(tasks) >= max_in_flight:
+            shed += 1
+        else:
+            task = asyncio.create_task(send(client, path, jobs[index % len(jobs)], samples))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        index += 1
+        next_arrival += rng.expovariate(rate)
+    if tasks:
+        await asyncio.wait(set(tasks))
+    summary = summarize(samples, completion_rate(samples, started, duration), offered=rate, shed=shed)
+    # What the Poisson process actually sent, which is what the app had to keep up with
+    summary["arrival_per_s"] = round((len(samples) + shed) / duration, 3)
+    return summary
+
+
+async def closed_loop(client: httpx.AsyncClient, path: str, jobs: List[Dict], concurrency: int,
+                      duration: float) -> Dict:
+    """`concurrency` users each sending their next request as soon as the last one returns."""
+    samples: List[Sample] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    counter = iter(range(1 << 62))
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await send(client, path, jobs[next(counter) % len(jobs)], samples)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    ok = sum(200 <= sample.status < 300 for sample in samples)
+    summary = summarize(samples, ok / (time.perf_counter() - started))
+    summary["concurrency"] = concurrency
+    return summary
+
+
+def find_saturation(steps: List[Dict], max_error_rate: float = 0.01, slo_p99_ms: Optional[float] = None,
+                    max_latency_growth: float = 1.5, min_throughput_ratio: float = 0.9) -> Dict:
+    """The highest throughput reached while the app still kept up.
+
+    Every step must stay within `max_error_rate` and, if given, the p99
+    latency objective. An open-loop step must also not build a backlog
+    (`latency_growth` at most `max_latency_growth`) and must serve at least
+    `min_throughput_ratio` of the requests that arrived; a closed-loop step
+    must add at least 10% throughput over the previous one. The first step
+    that fails is the knee.
+    """
+    best, knee = None, None
+    for step in steps:
+        healthy = step["error_rate"] <= max_error_rate
+        if "offered_per_s" in step:
+            growth = step.get("latency_growth")
+            arrived = step.get("arrival_per_s", step["offered_per_s"])
+            healthy = (healthy and (growth is None or growth <= max_latency_growth)
+                       and step["throughput_per_s"] >= min_throughput_ratio * arrived)
+        elif best is not None:
+            healthy = healthy and step["throughput_per_s"] >= 1.1 * best["throughput_per_s"]
+        if slo_p99_ms is not None:
+            healthy = healthy and step["p99_ms"] <= slo_p99_ms
+        if not healthy:
+            knee = step
+            break
+        if best is None or step["throughput_per_s"] > best["throughput_per_s"]:
+            best = step
+    result = {
+        "saturation_throughput_per_s": best["throughput_per_s"] if best else 0.0,
+        "p99_ms_at_saturation": best["p99_ms"] if best else None,
+        "knee": None,
+    }
+    if knee is not None:
+        result["knee"] = {key: knee[key] for key in ("offered_per_s", "arrival_per_s", "concurrency",
+                                                     "throughput_per_s", "error_rate", "p99_ms", "latency_growth")
+                          if key in knee}
+    return result
+
+
+async def run_steps(base_url: str, jobs: List[Dict], rates: Optional[List[float]] = None,
+                    concurrency: Optional[List[int]] = None, duration: float = 20.0, timeout: float = 120.0,
+                    path: str = "/process-job", max_in_flight: int = 256, seed: int = 0) -> List[Dict]:
+    """Run one load step per rate (open loop) or per concurrency level (closed loop)."""
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    steps = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for rate in rates or []:
+            steps.append(await open_loop(client, path, jobs, rate, duration, max_in_flight, seed))
+        for users in concurrency or []:
+            steps.append(await closed_loop(client, path, jobs, users, duration))
+    return steps
@@ -0,0 +1,475 @@
+"""Local stand-ins for the external services: Ollama, WhatsApp Cloud API, Google Calendar, Ares and OpenAI.
+
+Every service runs as its own FastAPI app on its own port. A `Behavior`
+gives each one a latency distribution, an injected error rate, a rate limit
+(429 with Retry-After) and a concurrency limit (requests queue beyond it,
+like Ollama's OLLAMA_NUM_PARALLEL). `GET /_stats` on each service reports
+what it served.
+
+    python -m loadtest.stand_ins --profile profile.json
+
+prints the base URL of every service as one JSON line and serves until
+interrupted.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import math
+import random
+import socket
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from agents.scheduler_agent import _parse_event_time
+from benchmarks.harness import percentile
+
+SERVICES = ("ollama", "whatsapp", "calendar", "ares", "openai")
+
+# Latencies in milliseconds. Ollama also pays per 1000 prompt characters and
+# serves `concurrency` requests at a time; the Calendar limit mirrors Google's
+# per-user queries-per-second quota.
+DEFAULT_PROFILE: Dict[str, Dict[str, Any]] = {
+    "ollama": {"latency": {"distribution": "lognormal", "median_ms": 80, "sigma": 0.4, "per_kchar_ms": 10},
+               "concurrency": 4},
+    "whatsapp": {"latency": {"distribution": "lognormal", "median_ms": 150, "sigma": 0.5},
+                 "error_rate": 0.01, "rate_limit": {"per_second": 80, "burst": 20}},
+    "calendar": {"latency": {"distribution": "lognormal", "median_ms": 120, "sigma": 0.4},
+                 "error_rate": 0.005, "rate_limit": {"per_second": 10, "burst": 10}, "keep_events": False},
+    "ares": {"latency": {"distribution": "lognormal", "median_ms": 1500, "sigma": 0.3}},
+    "openai": {"latency": {"distribution": "lognormal", "median_ms": 800, "sigma": 0.5},
+               "rate_limit": {"per_second": 50, "burst": 50}},
+}
+
+
+def merge_profile(overrides: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """DEFAULT_PROFILE with per-service overrides applied key by key."""
+    profile = copy.deepcopy(DEFAULT_PROFILE)
+    for service, settings in (overrides or {}).items():
+        if service not in profile:
+            raise ValueError(f"Unknown service in profile: {service}")
+        for key, value in settings.items():
+            if isinstance(value, dict) and isinstance(profile[service].get(key), dict):
+                profile[service][key].update(value)
+            else:
+                profile[service][key] = value
+    return profile
+
+
+class TokenBucket:
+    """`per_second` requests on average with bursts of up to `burst`."""
+
+    def __init__(self, per_second: float, burst: Optional[float] = None):
+        self.rate = per_second
+        self.capacity = burst or max(per_second, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """0 when a request may proceed, otherwise the seconds until a token is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class Reservoir:
+    """Uniform sample of at most `size` values from an unbounded stream (Algorithm R)."""
+
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        self.size = size
+        self.values: List[float] = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+
+    def add(self, value: float) -> None:
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+        else:
+            index = self.rng.randrange(self.seen)
+            if index < self.size:
+                self.values[index] = value
+
+
+class Behavior:
+    """Latency, failures and limits applied to every request of one stand-in service."""
+
+    def __init__(self, latency: Optional[Dict] = None, error_rate: float = 0.0, error_status: int = 503,
+                 rate_limit: Optional[Dict] = None, concurrency: Optional[int] = None,
+                 seed: Optional[int] = None, **settings):
+        self.latency = latency or {"distribution": "fixed", "ms": 0}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bucket = TokenBucket(**rate_limit) if rate_limit else None
+        self.concurrency = concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.settings = settings
+        self.rng = random.Random(seed)
+        self.counts = {"requests": 0, "ok": 0, "throttled": 0, "failed": 0}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Bounded samples, so a long run doesn't grow the stand-in's memory
+        self.service_times = Reservoir(seed=seed)
+        self.queue_times = Reservoir(seed=seed)
+
+    def sample_latency(self, chars: int = 0) -> float:
+        """Seconds of simulated service time for a request carrying `chars` characters."""
+        spec = self.latency
+        distribution = spec.get("distribution", "fixed")
+        if distribution == "fixed":
+            ms = spec.get("ms", 0)
+        elif distribution == "uniform":
+            ms = self.rng.uniform(spec["min_ms"], spec["max_ms"])
+        elif distribution == "exponential":
+            ms = self.rng.expovariate(1 / spec["mean_ms"]) if spec["mean_ms"] else 0
+        elif distribution == "lognormal":
+            ms = self.rng.lognormvariate(math.log(spec["median_ms"]), spec.get("sigma", 0.5))
+        else:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        ms += spec.get("per_kchar_ms", 0) * chars / 1000
+        return ms / 1000
+
+    async def handle(self, chars: int = 0) -> Optional[JSONResponse]:
+        """Wait out the simulated service time; returns an error response to send instead, if any."""
+        self.counts["requests"] += 1
+        if self.bucket is not None:
+            retry_after = self.bucket.take()
+            if retry_after:
+                self.counts["throttled"] += 1
+                return JSONResponse({"error": {"code": 429, "message": "Rate limit exceeded"}}, status_code=429,
+                                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+        if self.concurrency and self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        queued = time.perf_counter()
+        if self._slots is not None:
+            await self._slots.acquire()
+        started = time.perf_counter()
+        self.queue_times.add(started - queued)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.sample_latency(chars))
+        finally:
+            self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+            self.service_times.add(time.perf_counter() - started)
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.counts["failed"] += 1
+            return JSONResponse({"error": {"code": self.error_status, "message": "Injected failure"}},
+                                status_code=self.error_status)
+        self.counts["ok"] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "peak_in_flight": self.peak_in_flight,
+            "service_p50_ms": round(1000 * percentile(self.service_times.values, 50), 3),
+            "service_p99_ms": round(1000 * percentile(self.service_times.values, 99), 3),
+            "queue_p99_ms": round(1000 * percentile(self.queue_times.values, 99), 3),
+        }
+
+
+def _service_app(title: str, behavior: Behavior) -> FastAPI:
+    app = FastAPI(title=title)
+    app.state.behavior = behavior
+
+    @app.get("/_stats")
+    async def stats():
+        return behavior.stats()
+
+    return app
+
+
+def _fraction(text: str) -> float:
+    """A stable pseudo-random number in [0, 1) for a piece of text."""
+    return zlib.crc32(text.encode('utf-8')) / 2 ** 32
+
+
+def create_ollama_app(behavior: Behavior) -> FastAPI:
+    """/api/chat, /api/generate and /api/embed with Ollama's response shapes.
+
+    Scoring prompts get a score that is stable per prompt; other prompts get
+    a short canned message.
+    """
+    app = _service_app("Ollama stand-in", behavior)
+    dimensions = behavior.settings.get("embedding_dimensions", 64)
+
+    def reply(prompt: str, system: str) -> str:
+        if "match score" in system:
+            return f"{_fraction(prompt):.2f}"
+        return "Hello! Thank you for your application. Could you share a few times that suit you for a short call?"
+
+    def counters(prompt: str, response: str, seconds: float) -> Dict[str, int]:
+        return {
+            "prompt_eval_count": len(prompt) // 4,
+            "prompt_eval_duration": int(seconds * 0.7e9),
+            "eval_count": max(len(response) // 4, 1),
+            "eval_duration": int(seconds * 0.3e9),
+            "total_duration": int(seconds * 1e9),
+        }
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        prompt = " ".join(m.get("content", "") for m in messages if m.get("role") != "system")
+        started = time.perf_counter()
+        error = await behavior.handle(len(system) + len(prompt))
+        if error is not None:
+            return error
+        content = reply(prompt, system)
+        return {"model": body.get("model"), "message": {"role": "assistant", "content": content}, "done": True,
+                **counters(system + prompt, content, time.perf_counter() - started)}
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        prompt, system = body.get("prompt", ""), body.get("system", "")
+        started = time.perf_counter()
+        # An empty prompt only loads (or unloads) the model
+        error = await behavior.handle(len(system) + len(prompt)) if prompt else None
+        if error is not None:
+            return error
+        content = reply(prompt, system) if prompt else ""
+        return {"model": body.get("model"), "response": content, "done": True,
+                **counters(system + prompt, content, time.perf_counter() - started)}
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        texts = body.get("input", [])
+        texts = [texts] if isinstance(texts, str) else texts
+        error = await behavior.handle(sum(len(text) for text in texts))
+        if error is not None:
+            return error
+        embeddings = []
+        for text in texts:
+            rng = random.Random(zlib.crc32(text.encode('utf-8')))
+            embeddings.append([rng.uniform(-1, 1) for _ in range(dimensions)])
+        return {"model": body.get("model"), "embeddings": embeddings}
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": "mistral:latest"}, {"name": "nomic-embed-text:latest"}]}
+
+    return app
+
+
+def create_whatsapp_app(behavior: Behavior) -> FastAPI:
+    """POST /{phone_number_id}/messages of the WhatsApp Cloud API."""
+    app = _service_app("WhatsApp stand-in", behavior)
+    sent = [0]
+
+    @app.post("/{phone_number_id}/messages")
+    async def send(phone_number_id: str, request: Request):
+        body = await request.json()
+        if not body.get("to") or not body.get("text", {}).get("body"):
+            return JSONResponse({"error": {"code": 100, "message": "Invalid parameter"}}, status_code=400)
+        error = await behavior.handle()
+        if error is not None:
+            return error
+        sent[0] += 1
+        return {"messaging_product": "whatsapp", "contacts": [{"input": body["to"], "wa_id": body["to"].lstrip("+")}],
+                "messages": [{"id": f"wamid.{phone_number_id}.{sent[0]}"}]}
+
+    return app
+
+
+def create_calendar_app(behavior: Behavior) -> FastAPI:
+    """Google Calendar v3 events list/insert.
+
+    With `keep_events` off (the default) inserts succeed without being stored,
+    so every job can book the same slots and the workload stays the same
+    over a long run; turn it on to exercise conflicts (409).
+    """
+    app = _service_app("Calendar stand-in", behavior)
+    keep_events = behavior.settings.get("keep_events", False)
+    events: Dict[str, List[Dict]] = {}
+    created = [0]
+
+    def parse(value: str) -> float:
+        return _parse_event_time(value).timestamp()
+
+    def overlapping(calendar_id: str, start: float, end: float) -> List[Dict]:
+        return [event for event in events.get(calendar_id, [])
+                if parse(event['start']['dateTime']) < end and parse(event['end']['dateTime']) > start]
+
+    @app.get("/calendars/{calendar_id}/events")
+    async def list_events(calendar_id: str, timeMin: str, timeMax: str):
+        error = await behavior.handle()
+        if error is not None:
+            return error
+        items = overlapping(calendar_id, parse(timeMin), parse(timeMax))
+        return {"kind": "calendar#events", "items": sorted(items, key=lambda event: event['start']['dateTime'])}
+
+    @app.post("/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        body = await request.json()
+        error = await behavior.handle()
+        if error is not None:
+            return error
+        if keep_events and overlapping(calendar_id, parse(body['start']['dateTime']), parse(body['end']['dateTime'])):
+            return JSONResponse({"error": {"code": 409, "message": "The requested time is not available"}},
+                                status_code=409)
+        created[0] += 1
+        event = {"id": f"event_{created[0]}", "status": "confirmed", "summary": body.get("summary", ""),
+                 "start": body["start"], "end": body["end"]}
+        if keep_events:
+            events.setdefault(calendar_id, []).append(event)
+        return event
+
+    return app
+
+
+def create_ares_app(behavior: Behavior) -> FastAPI:
+    """POST /live/predict: one answer per query of the batch."""
+    app = _service_app("Ares stand-in", behavior)
+
+    @app.post("/live/predict")
+    async def predict(request: Request):
+        body = await request.json()
+        queries = body.get("query", [])
+        queries = [queries] if isinstance(queries, str) else queries
+        error = await behavior.handle(sum(len(query) for query in queries))
+        if error is not None:
+            return error
+        answers = [f"Search results for '{query}': nothing noteworthy (stand-in)." for query in queries]
+        return {"data": {"response_text": answers}}
+
+    return app
+
+
+def create_openai_app(behavior: Behavior) -> FastAPI:
+    """POST /v1/chat/completions answering every ReAct turn with a final answer."""
+    app = _service_app("OpenAI stand-in", behavior)
+    completions = [0]
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+        error = await behavior.handle(prompt_chars)
+        if error is not None:
+            return error
+        completions[0] += 1
+        content = "Thought: I can answer directly.\nFinal Answer: This is a stand-in answer."
+        return {
+            "id": f"chatcmpl-{completions[0]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (prompt_chars + len(content)) // 4},
+        }
+
+    return app
+
+
+FACTORIES = {
+    "ollama": create_ollama_app,
+    "whatsapp": create_whatsapp_app,
+    "calendar": create_calendar_app,
+    "ares": create_ares_app,
+    "openai": create_openai_app,
+}
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def service_env(urls: Dict[str, str]) -> Dict[str, str]:
+    """Environment that points the recruiter app (and agentpropartb.py) at the stand-ins."""
+    return {
+        "OLLAMA_BASE_URL": urls["ollama"],
+        "WHATSAPP_API_URL": urls["whatsapp"],
+        "WHATSAPP_PHONE_NUMBER_ID": "1000000000",
+        "WHATSAPP_TOKEN": "stand-in",
+        "CALENDAR_API_URL": urls["calendar"],
+        "CALENDAR_API_TOKEN": "stand-in",
+        "ARES_API_URL": f"{urls['ares']}/live/predict",
+        "TRAVERSAAL_ARES_API_KEY": "stand-in",
+        "OPENAI_BASE_URL": f"{urls['openai']}/v1",
+        "OPENAI_API_KEY": "stand-in",
+    }
+
+
+async def serve(profile: Dict[str, Dict], host: str = "127.0.0.1", ports: Optional[Dict[str, int]] = None,
+                seed: int = 0, ready: Optional[Any] = None) -> None:
+    """Run every stand-in in this event loop until cancelled; `ready(urls)` is called once all listen."""
+    import uvicorn
+
+    ports = ports or {}
+    servers, urls = [], {}
+    for index, service in enumerate(SERVICES):
+        behavior = Behavior(seed=seed + index, **profile[service])
+        port = ports.get(service) or free_port(host)
+        config = uvicorn.Config(FACTORIES[service](behavior), host=host, port=port, log_level="warning",
+                                access_log=False)
+        servers.append(uvicorn.Server(config))
+        urls[service] = f"http://{host}:{port}"
+
+    tasks = [asyncio.create_task(server.serve()) for server in servers]
+    try:
+        while not all(server.started for server in servers):
+            if any(task.done() for task in tasks):
+                # A server failed to start (e.g. port in use); surface its error
+                await asyncio.gather(*tasks)
+            await asyncio.sleep(0.05)
+        if ready is not None:
+            ready(urls)
+        await asyncio.gather(*tasks)
+    finally:
+        for server in servers:
+            server.should_exit = True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest.stand_ins",
+                                     description="Serve local stand-ins for the recruiter's external services.")
+    parser.add_argument("--profile", help="JSON file with per-service overrides of DEFAULT_PROFILE")
+    parser.add_argument("--host", default="127.0.0.1")
+    for service in SERVICES:
+        parser.add_argument(f"--{service}-port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    overrides = None
+    if args.profile:
+        with open(args.profile) as file:
+            overrides = json.load(file)
+    ports = {service: getattr(args, f"{service}_port") for service in SERVICES}
+
+    def ready(urls: Dict[str, str]) -> None:
+        print(json.dumps({"urls": urls, "env": service_env(urls)}), flush=True)
+
+    try:
+        asyncio.run(serve(merge_profile(overrides), args.host, ports, args.seed, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
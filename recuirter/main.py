@@ -1,16 +1,43 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
-from dotenv import load_dotenv
-from agents.cv_matcher import CVMatcherTool
-from agents.whatsapp_agent import WhatsAppTool
-from agents.scheduler_agent import SchedulerTool
+from agents.config import load_config
+from agents.tracing import correlation_scope, metrics, span
+from resources import ToolContainer
+from streaming import job_events, sse_stream
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (once per process)
+load_config()
 
-app = FastAPI(title="AI Recruiter Agent")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the tools once per worker, warm them up and close them on shutdown."""
+    with span("startup_build"):
+        tools = ToolContainer.build()
+    with span("startup_warm"):
+        await tools.warm()
+    app.state.tools = tools
+    try:
+        yield
+    finally:
+        tools.close()
+
+app = FastAPI(title="AI Recruiter Agent", lifespan=lifespan)
+
+def get_tools(request: Request) -> ToolContainer:
+    return request.app.state.tools
+
+@app.middleware("http")
+async def correlation_id_middleware(request: Request, call_next):
+    """Tag all spans of a request with its X-Request-ID (or a fresh id) and echo it back."""
+    with correlation_scope(request.headers.get("x-request-id")) as correlation_id:
+        with span("http_request", **{"http.method": request.method, "http.route": request.url.path}):
+            response = await call_next(request)
+    response.headers["X-Request-ID"] = correlation_id
+    return response
 
 class JobDescription(BaseModel):
     title: str
@@ -19,6 +46,10 @@ class JobDescription(BaseModel):
     location: str
     employment_type: str
 
+class JobBatch(BaseModel):
+    jobs: List[JobDescription]
+    top_k: Optional[int] = None
+
 class Candidate(BaseModel):
     name: str
     phone: str
@@ -28,13 +59,11 @@ class Candidate(BaseModel):
     available_slots: Optional[List[str]] = None
     job_title: Optional[str] = None
 
-# Initialize tools
-cv_matcher = CVMatcherTool()
-whatsapp_tool = WhatsAppTool()
-scheduler_tool = SchedulerTool()
-
 @app.post("/process-job")
-async def process_job(job: JobDescription):
+async def process_job(job: JobDescription, tools: ToolContainer = Depends(get_tools)):
+    cv_matcher = tools.cv_matcher
+    whatsapp_tool = tools.whatsapp_tool
+    scheduler_tool = tools.scheduler_tool
     try:
         # Step 1: Match CVs with job description
         cv_matching_result = await cv_matcher.run(job.description)
@@ -46,23 +75,23 @@ async def process_job(job: JobDescription):
         # Step 2: Contact candidates via WhatsApp
         contacted_candidates = []
         for candidate in top_candidates[:5]:  # Top 5 candidates
-            candidate["job_title"] = job.title
+            candidate.job_title = job.title
             whatsapp_result = await whatsapp_tool.run(candidate)
             if whatsapp_result.get("status") == "success":
-                candidate["available_slots"] = whatsapp_result.get("available_slots", [])
+                candidate.available_slots = whatsapp_result.get("available_slots", [])
                 contacted_candidates.append(candidate)
         
         # Step 3: Schedule interviews
         scheduled_interviews = []
         for candidate in contacted_candidates:
-            if candidate.get("available_slots"):
+            if candidate.available_slots:
                 scheduler_result = await scheduler_tool.run(candidate)
                 if scheduler_result.get("status") == "success":
                     interview = scheduler_result.get("interview")
                     scheduled_interviews.append(interview)
                     
                     # Send confirmation via WhatsApp
-                    candidate["interview"] = interview
+                    candidate.interview = interview
                     await whatsapp_tool.run(candidate)
         
         return {
@@ -76,6 +105,35 @@ async def process_job(job: JobDescription):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/process-job/stream")
+async def process_job_stream(job: JobDescription, request: Request, top_k: int = 5,
+                             tools: ToolContainer = Depends(get_tools)):
+    """/process-job as server-sent events: scored, ranking, contacted, booked, then done (or error).
+
+    Disconnecting cancels the job; CVs not yet scored are skipped.
+    """
+    return StreamingResponse(
+        sse_stream(job_events(job, tools, top_k), request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/match-jobs")
+async def match_jobs(batch: JobBatch, tools: ToolContainer = Depends(get_tools)):
+    """Score a batch of job descriptions against the CV corpus in one pass and return per-job top-K."""
+    result = await tools.bulk_matcher.run([job.description for job in batch.jobs], top_k=batch.top_k)
+    if result.get("status") != "success":
+        raise HTTPException(status_code=500, detail=result.get("error", "CV matching failed"))
+
+    for job, entry in zip(batch.jobs, result["jobs"]):
+        entry["job_title"] = job.title
+    return result
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint for the per-stage timings and LLM token counters."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,123 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from agents.config import load_config
+from agents.cv_corpus import CVTextCache, list_cv_files
+from agents.cv_matcher import CVMatcherTool
+from agents.whatsapp_agent import WhatsAppTool
+from agents.scheduler_agent import HTTPCalendarService, MockCalendarService, SchedulerTool, SQLiteCalendarService
+
+if TYPE_CHECKING:
+    import requests
+    from agents.matrix_matcher import BulkCVMatcherTool
+
+logger = logging.getLogger('ToolContainer')
+
+
+def create_http_session(pool_size: int = 20) -> "requests.Session":
+    """A requests.Session with a connection pool big enough for concurrent tool calls."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ToolContainer:
+    """The tools and the shared resources behind them, built once per worker process.
+
+    The tools share one HTTP connection pool, one calendar service and the CV
+    text/embedding caches plus the PDF extraction process pool. With a
+    `calendar_db_path` (or CALENDAR_DB_PATH) the calendar lives in SQLite so
+    all uvicorn workers see (and atomically book against) the same events;
+    otherwise it is the in-memory mock.
+    """
+
+    def __init__(self, cv_matcher: CVMatcherTool, whatsapp_tool: WhatsAppTool, scheduler_tool: SchedulerTool,
+                 bulk_matcher: Optional["BulkCVMatcherTool"] = None,
+                 http_session: Optional["requests.Session"] = None,
+                 extraction_executor: Optional[ProcessPoolExecutor] = None,
+                 corpus_settings: Optional[Dict[str, Any]] = None):
+        self.cv_matcher = cv_matcher
+        self.whatsapp_tool = whatsapp_tool
+        self.scheduler_tool = scheduler_tool
+        self._bulk_matcher = bulk_matcher
+        self.http_session = http_session
+        self.extraction_executor = extraction_executor
+        self._corpus_settings = corpus_settings
+
+    @property
+    def bulk_matcher(self) -> Optional["BulkCVMatcherTool"]:
+        """Built on first use so the NumPy-backed matcher stays out of worker start-up."""
+        if self._bulk_matcher is None and self._corpus_settings is not None:
+            from agents.matrix_matcher import BulkCVMatcherTool
+            self._bulk_matcher = BulkCVMatcherTool(**self._corpus_settings)
+        return self._bulk_matcher
+
+    @classmethod
+    def build(cls, cv_directory: Optional[str] = None, calendar_db_path: Optional[str] = None,
+              pool_size: int = 20, extraction_workers: Optional[int] = None) -> "ToolContainer":
+        load_config()
+        if cv_directory is None:
+            cv_directory = os.getenv("CV_DIRECTORY", "cvs")
+        if calendar_db_path is None:
+            calendar_db_path = os.getenv("CALENDAR_DB_PATH", "")
+
+        if extraction_workers is None:
+            extraction_workers = int(os.getenv("EXTRACTION_WORKERS", "0")) or os.cpu_count() or 1
+
+        session = create_http_session(pool_size)
+        # CALENDAR_API_URL is the load test's calendar stand-in (python -m loadtest)
+        calendar_api_url = os.getenv("CALENDAR_API_URL", "")
+        if calendar_api_url:
+            calendar = HTTPCalendarService(calendar_api_url, os.getenv("CALENDAR_API_TOKEN", ""), session)
+        elif calendar_db_path:
+            calendar = SQLiteCalendarService(calendar_db_path)
+        else:
+            calendar = MockCalendarService()
+        executor = ProcessPoolExecutor(max_workers=extraction_workers)
+        corpus = {
+            "cv_directory": cv_directory,
+            "text_cache": CVTextCache(),
+            "extraction_executor": executor,
+            "default_phone_country_code": os.getenv("DEFAULT_PHONE_COUNTRY_CODE", ""),
+            "http_session": session,
+        }
+        # With CV_SHARD_ADDRESSES the corpus is scored by shard workers (python -m agents.sharding)
+        shard_addresses = [address.strip() for address in os.getenv("CV_SHARD_ADDRESSES", "").split(",")
+                           if address.strip()]
+        if shard_addresses:
+            from agents.sharding import ShardedCVMatcherTool
+            cv_matcher = ShardedCVMatcherTool(shard_addresses=shard_addresses, **corpus)
+        else:
+            cv_matcher = CVMatcherTool(**corpus)
+        return cls(
+            cv_matcher=cv_matcher,
+            whatsapp_tool=WhatsAppTool(http_session=session),
+            scheduler_tool=SchedulerTool(service=calendar, http_session=session),
+            http_session=session,
+            extraction_executor=executor,
+            corpus_settings=corpus,
+        )
+
+    async def warm(self) -> None:
+        """Prepare everything the first request would otherwise pay for."""
+        os.makedirs(self.cv_matcher.cv_directory, exist_ok=True)
+        # Extract the current corpus into the shared text cache
+        if list_cv_files(self.cv_matcher.cv_directory):
+            await self.cv_matcher.load_corpus()
+        # Loads the model into Ollama memory (without pinning it past its keep_alive)
+        await self.cv_matcher.load_model()
+        logger.info("Tools warmed up")
+
+    def close(self) -> None:
+        self.scheduler_tool.service.close()
+        if self.extraction_executor is not None:
+            self.extraction_executor.shutdown(wait=False, cancel_futures=True)
+        if self.http_session is not None:
+            self.http_session.close()
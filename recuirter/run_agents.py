@@ -3,19 +3,19 @@ import logging
 import json
 from datetime import datetime
 from typing import Dict, List
+from agents.config import load_config
 from agents.cv_matcher import CVMatcherTool
 from agents.whatsapp_agent import WhatsAppTool
 from agents.scheduler_agent import SchedulerTool
+from agents.tracing import correlation_scope
+from agents.structured_logging import configure_logging, log_event
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('agent_execution.log'),
-        logging.StreamHandler()
-    ]
-)
+# Load .env once, before anything reads settings
+load_config()
+
+# Configure logging: records go through a queue and are written by a background
+# thread; RECRUITER_LOG_MODE=json switches to compact JSON lines.
+configure_logging(log_file='agent_execution.log')
 
 logger = logging.getLogger('AgentExecutor')
 
@@ -62,7 +62,7 @@ class AgentExecutor:
             # Step 1: CV Matching
             logger.info("Step 1: Starting CV Matching")
             cv_matching_result = await self.cv_matcher.run(job_description.description)
-            logger.info(f"CV Matching Result: {json.dumps(cv_matching_result, indent=2)}")
+            log_event(logger, logging.INFO, "cv_matching.result", "CV Matching Result", cv_matching_result)
             
             if cv_matching_result.get("status") != "success":
                 logger.error("CV matching failed")
@@ -75,35 +75,38 @@ class AgentExecutor:
             logger.info("Step 2: Starting WhatsApp Communication")
             contacted_candidates = []
             for candidate in top_candidates[:5]:
-                logger.info(f"Contacting candidate: {candidate['name']}")
-                candidate["job_title"] = job_description.title
+                log_event(logger, logging.INFO, "candidate.contacting", f"Contacting candidate: {candidate.name}")
+                candidate.job_title = job_description.title
                 
                 whatsapp_result = await self.whatsapp_tool.run(candidate)
-                logger.info(f"WhatsApp Result for {candidate['name']}: {json.dumps(whatsapp_result, indent=2)}")
+                log_event(logger, logging.INFO, "candidate.whatsapp_result",
+                          f"WhatsApp Result for {candidate.name}", whatsapp_result)
                 
                 if whatsapp_result.get("status") == "success":
-                    candidate["available_slots"] = whatsapp_result.get("available_slots", [])
+                    candidate.available_slots = whatsapp_result.get("available_slots", [])
                     contacted_candidates.append(candidate)
-                    logger.info(f"Successfully contacted {candidate['name']}")
+                    log_event(logger, logging.INFO, "candidate.contacted", f"Successfully contacted {candidate.name}")
             
             # Step 3: Interview Scheduling
             logger.info("Step 3: Starting Interview Scheduling")
             scheduled_interviews = []
             for candidate in contacted_candidates:
-                if candidate.get("available_slots"):
-                    logger.info(f"Scheduling interview for {candidate['name']}")
+                if candidate.available_slots:
+                    log_event(logger, logging.INFO, "candidate.scheduling", f"Scheduling interview for {candidate.name}")
                     scheduler_result = await self.scheduler_tool.run(candidate)
-                    logger.info(f"Scheduler Result for {candidate['name']}: {json.dumps(scheduler_result, indent=2)}")
+                    log_event(logger, logging.INFO, "candidate.scheduler_result",
+                              f"Scheduler Result for {candidate.name}", scheduler_result)
                     
                     if scheduler_result.get("status") == "success":
                         interview = scheduler_result.get("interview")
                         scheduled_interviews.append(interview)
                         
                         # Send confirmation
-                        logger.info(f"Sending confirmation to {candidate['name']}")
-                        candidate["interview"] = interview
+                        log_event(logger, logging.INFO, "candidate.confirming", f"Sending confirmation to {candidate.name}")
+                        candidate.interview = interview
                         confirmation_result = await self.whatsapp_tool.run(candidate)
-                        logger.info(f"Confirmation Result: {json.dumps(confirmation_result, indent=2)}")
+                        log_event(logger, logging.INFO, "candidate.confirmation_result",
+                                  "Confirmation Result", confirmation_result)
             
             # Final Summary
             logger.info("Workflow completed successfully")
@@ -139,7 +142,9 @@ async def main():
     
     # Initialize and run the executor
     executor = AgentExecutor()
-    result = await executor.execute_workflow(job)
+    with correlation_scope() as correlation_id:
+        logger.info(f"Correlation id: {correlation_id}")
+        result = await executor.execute_workflow(job)
     
     # Print final result
     print("\nFinal Result:")
@@ -0,0 +1,130 @@
+import heapq
+import json
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agents.candidates import CandidateRecord, to_jsonable
+from agents.cv_matcher import CVMatcherTool
+from agents.scheduler_agent import SchedulerTool
+from agents.whatsapp_agent import WhatsAppTool
+from resources import ToolContainer
+
+logger = logging.getLogger('JobStream')
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """One server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=to_jsonable)}\n\n"
+
+
+def _ranking(top: List[Tuple[float, int, CandidateRecord]]) -> List[CandidateRecord]:
+    return [candidate for _, _, candidate in sorted(top, key=lambda entry: (-entry[0], -entry[1]))]
+
+
+async def score_stage(cv_matcher: CVMatcherTool, job_description: str, top_k: int,
+                      ranking: List[CandidateRecord]) -> AsyncIterator[Event]:
+    """Yield a "scored" event per CV and a "ranking" event whenever the top-K changes.
+
+    `ranking` is filled with the final top-K (best first) once scoring finishes.
+    """
+    # Min-heap of (score, order, candidate): the root is the weakest of the current top-K
+    top: List[Tuple[float, int, CandidateRecord]] = []
+    scored = 0
+    async with aclosing(cv_matcher.stream(job_description)) as candidates:
+        async for candidate in candidates:
+            scored += 1
+            yield "scored", {"scored": scored, "candidate": candidate}
+
+            entry = (candidate.match_score, -scored, candidate)
+            if len(top) < top_k:
+                heapq.heappush(top, entry)
+            elif entry[:2] > top[0][:2]:
+                heapq.heapreplace(top, entry)
+            else:
+                continue
+            yield "ranking", {"scored": scored, "top": _ranking(top)}
+
+    ranking.extend(_ranking(top))
+
+
+async def contact_stage(whatsapp_tool: WhatsAppTool, candidates: List[CandidateRecord],
+                        job_title: str) -> AsyncIterator[CandidateRecord]:
+    """Contact each candidate over WhatsApp and yield the ones who replied with slots."""
+    for candidate in candidates:
+        candidate.job_title = job_title
+        whatsapp_result = await whatsapp_tool.run(candidate)
+        if whatsapp_result.get("status") == "success":
+            candidate.available_slots = whatsapp_result.get("available_slots", [])
+            yield candidate
+
+
+async def booking_stage(scheduler_tool: SchedulerTool, whatsapp_tool: WhatsAppTool,
+                        candidates: AsyncIterator[CandidateRecord]) -> AsyncIterator[Event]:
+    """Book an interview for every contacted candidate as soon as they are contacted."""
+    async with aclosing(candidates):
+        async for candidate in candidates:
+            yield "contacted", {"candidate": candidate}
+            if not candidate.available_slots:
+                continue
+            scheduler_result = await scheduler_tool.run(candidate)
+            if scheduler_result.get("status") == "success":
+                interview = scheduler_result.get("interview")
+                # Send confirmation via WhatsApp
+                candidate.interview = interview
+                await whatsapp_tool.run(candidate)
+                yield "booked", {"candidate": candidate.name, "interview": interview}
+
+
+async def job_events(job: Any, tools: ToolContainer, top_k: int = 5) -> AsyncIterator[Event]:
+    """The /process-job pipeline as a stream of (event, data) pairs, ending with "done" or "error"."""
+    ranking: List[CandidateRecord] = []
+    counts = {"scored": 0, "contacted": 0, "booked": 0}
+    interviews = []
+    try:
+        async with aclosing(score_stage(tools.cv_matcher, job.description, top_k, ranking)) as events:
+            async for event, data in events:
+                if event == "scored":
+                    counts["scored"] = data["scored"]
+                yield event, data
+
+        if not ranking:
+            yield "error", {"detail": "No CVs found in the directory."}
+            return
+
+        contacted = contact_stage(tools.whatsapp_tool, ranking, job.title)
+        async with aclosing(booking_stage(tools.scheduler_tool, tools.whatsapp_tool, contacted)) as events:
+            async for event, data in events:
+                if event == "contacted":
+                    counts["contacted"] += 1
+                else:
+                    counts["booked"] += 1
+                    interviews.append(data["interview"])
+                yield event, data
+    except Exception as e:
+        logger.exception("Job stream failed")
+        yield "error", {"detail": str(e)}
+        return
+
+    yield "done", {
+        "status": "success",
+        "matched_candidates": len(ranking),
+        "contacted_candidates": counts["contacted"],
+        "scheduled_interviews": counts["booked"],
+        "total_candidates": counts["scored"],
+        "interviews": interviews
+    }
+
+
+async def sse_stream(events: AsyncIterator[Event], is_disconnected: Optional[Any] = None) -> AsyncIterator[str]:
+    """Encode events as SSE frames; stops (closing the pipeline) once the client goes away."""
+    try:
+        async for event, data in events:
+            if is_disconnected is not None and await is_disconnected():
+                logger.info("Client disconnected, cancelling job stream")
+                break
+            yield format_sse(event, data)
+    finally:
+        await events.aclose()
@@ -0,0 +1,47 @@
+import os
+import re
+import types
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+NOTEBOOK = Path(__file__).resolve().parents[1] / "agentpropartb.py"
+# Imports the notebook's first cell provides to the sections below
+NOTEBOOK_PRELUDE = """
+import json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+"""
+
+
+class ScriptedLLM:
+    """Stands in for the OpenAI client: answers chat completions from a list of replies."""
+
+    def __init__(self, *args, **kwargs):
+        self.replies = []
+        self.requests = []
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.requests.append(request)
+        content = self.replies.pop(0) if self.replies else "Final Answer: done"
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+def notebook_section(source: str, title: str) -> str:
+    """The code of one '## title' cell group of the exported notebook, up to the next one."""
+    match = re.search(rf'^"""## {re.escape(title)}"""$(.*?)(?=^"""## )', source, re.S | re.M)
+    assert match, f"Section {title!r} not found in {NOTEBOOK.name}"
+    return match.group(1)
+
+
+@pytest.fixture(scope="session")
+def agentpro():
+    """The notebook's Tool, AgentMemory and AgentPro definitions, without the Colab setup cell."""
+    source = NOTEBOOK.read_text()
+    namespace = {"__name__": "agentpro", "OpenAI": ScriptedLLM}
+    with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}):
+        for title in ("Tool Base Class", "Agent Memory", "Agent"):
+            exec(compile(NOTEBOOK_PRELUDE + notebook_section(source, title), str(NOTEBOOK), "exec"), namespace)
+    return types.SimpleNamespace(**{name: value for name, value in namespace.items() if not name.startswith("__")})
@@ -0,0 +1,54 @@
+def test_task_survives_compaction(agentpro):
+    memory = agentpro.AgentMemory(token_budget=200, keep_recent=2)
+    memory.add_system("You are a helpful agent.")
+    memory.add_task("Find three Python meetups in Lahore")
+    for step in range(20):
+        memory.add("assistant", f"Thought {step}: " + "searching " * 40)
+
+    assert memory.summary
+    assert len(memory.turns) == 2
+    assert memory.messages[:2] == [
+        {"role": "system", "content": "You are a helpful agent."},
+        {"role": "user", "content": "Find three Python meetups in Lahore"},
+    ]
+
+
+def test_new_task_demotes_the_previous_one(agentpro):
+    memory = agentpro.AgentMemory()
+    memory.add_task("first question")
+    memory.add("assistant", "first answer")
+    memory.add_task("second question")
+
+    assert memory.task == {"role": "user", "content": "second question"}
+    assert memory.turns[0] == {"role": "user", "content": "first question"}
+    assert memory.messages[0] == memory.task
+
+
+def test_summarizer_receives_the_folded_turns(agentpro):
+    calls = []
+
+    def summarizer(summary, transcript):
+        calls.append(transcript)
+        return "compressed"
+
+    memory = agentpro.AgentMemory(token_budget=100, keep_recent=1, summarizer=summarizer)
+    memory.add_task("question")
+    for step in range(4):
+        memory.add("assistant", f"step {step} " + "x" * 200)
+
+    assert calls and "step 0" in calls[0]
+    assert memory.summary == "compressed"
+    assert memory.messages[0]["content"] == "question"
+
+
+def test_long_observations_are_stored_and_paged(agentpro):
+    memory = agentpro.AgentMemory(max_observation_tokens=10)
+    observation = "".join(str(digit % 10) for digit in range(100))
+    observation_id = memory.add_observation(observation)
+
+    preview = memory.turns[-1]["content"]
+    assert observation_id in preview and "truncated" in preview
+    assert observation[40:] not in preview
+    pages = [memory.get_observation(observation_id, page) for page in range(3)]
+    assert "".join(page.split(":\n", 1)[1] for page in pages) == observation
+    assert "No observation" in memory.get_observation("obs-99")
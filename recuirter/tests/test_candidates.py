@@ -0,0 +1,74 @@
+import io
+import json
+
+import pytest
+
+from agents.candidates import CandidateBatch, CandidateRecord, to_jsonable
+
+
+def record(name, score, **kwargs):
+    return CandidateRecord(name, f"cvs/{name}.pdf", score, **kwargs)
+
+
+def test_record_behaves_like_the_old_dict():
+    candidate = record("ana", 0.8, phone="+923001234567", links=["https://github.com/ana"])
+    assert dict(candidate) == {"name": "ana", "cv_path": "cvs/ana.pdf", "match_score": 0.8,
+                               "phone": "+923001234567", "email": "", "links": ["https://github.com/ana"]}
+    assert "job_title" not in candidate and candidate.get("available_slots") is None
+
+    candidate["job_title"] = "Python Developer"
+    candidate["mtime"] = 12.5
+    assert candidate["job_title"] == "Python Developer" and candidate.job_title == "Python Developer"
+    assert list(candidate)[-2:] == ["job_title", "mtime"]
+    assert len(candidate) == 8
+
+    del candidate["job_title"], candidate["mtime"]
+    assert len(candidate) == 6
+    with pytest.raises(KeyError):
+        del candidate["name"]
+    with pytest.raises(KeyError):
+        candidate["interview"]
+
+
+def test_record_round_trips_through_a_dict():
+    candidate = record("ben", 0.5, older_versions=["cvs/ben_old.pdf"], signature="abc")
+    assert CandidateRecord.from_dict(candidate.to_dict()) == candidate
+    assert json.loads(json.dumps(candidate, default=to_jsonable))["older_versions"] == ["cvs/ben_old.pdf"]
+
+
+def test_top_is_best_first_and_keeps_scoring_order_on_ties():
+    batch = CandidateBatch()
+    batch.extend([record("a", 0.4), record("b", 0.9), record("c", 0.4)])
+    batch.append({"name": "d", "cv_path": "cvs/d.pdf", "match_score": 0.7})
+    assert [candidate.name for candidate in batch.top(3)] == ["b", "d", "a"]
+    assert batch[-1]["phone"] == "" and batch[-1].links == []
+    assert [candidate.name for candidate in batch.top(10)] == ["b", "d", "a", "c"]
+
+
+def test_duplicates_skipped_counts_older_versions():
+    batch = CandidateBatch()
+    batch.append(record("a", 0.1, older_versions=["cvs/a1.pdf", "cvs/a2.pdf"]))
+    batch.append(record("b", 0.2))
+    assert batch.duplicates_skipped == 2
+    assert batch[0].older_versions == ["cvs/a1.pdf", "cvs/a2.pdf"] and batch[1].older_versions is None
+
+
+@pytest.mark.parametrize("file_name", ["results.jsonl", "results.json"])
+def test_batch_round_trips_through_files(tmp_path, file_name):
+    batch = CandidateBatch()
+    batch.append(record("a", 0.25, email="a@example.com", older_versions=["cvs/a_old.pdf"]))
+    batch.append(record("b", 0.75, links=["https://linkedin.com/in/b"]))
+
+    loaded = CandidateBatch.load(batch.save(str(tmp_path / file_name)))
+    assert loaded.to_columns() == batch.to_columns()
+    assert [dict(candidate) for candidate in loaded] == [dict(candidate) for candidate in batch]
+
+
+def test_write_jsonl_is_one_compact_object_per_row():
+    batch = CandidateBatch()
+    batch.extend([record("a", 0.5), record("b", 0.25)])
+    out = io.StringIO()
+    assert batch.write_jsonl(out) == 2
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2 and ", " not in lines[0]
+    assert json.loads(lines[1])["match_score"] == 0.25
@@ -0,0 +1,63 @@
+import pytest
+
+from agents.contact_extractor import extract_contacts, normalize_phone
+
+
+@pytest.mark.parametrize("text", [
+    "Acme Corp 2010 - 2015 2016 - 2020 Senior Engineer\n+92 316 9985540",
+    "2018.03 - 2021.06 Globex\n+92 316 9985540",
+    "Employed 01.2019 - 12.2021 at Initech\nPhone: +92 316 9985540",
+])
+def test_date_ranges_are_not_phone_numbers(text):
+    assert extract_contacts(text)["phone"] == "+923169985540"
+
+
+@pytest.mark.parametrize("text", [
+    "Acme Corp 2010 - 2015 2016 - 2020",
+    "2018.03 - 2021.06 Globex",
+    "Employed 01.2019 - 12.2021",
+])
+def test_date_ranges_alone_give_no_phone(text):
+    assert extract_contacts(text)["phone"] == ""
+
+
+def test_trunk_prefix_without_country_code_is_rejected():
+    assert normalize_phone("0300 1234567") == ""
+    assert extract_contacts("Call 0300 1234567")["phone"] == ""
+
+
+def test_trunk_prefix_with_default_country_code():
+    assert normalize_phone("0300 1234567", "92") == "+923001234567"
+
+
+def test_isbn_is_not_a_phone_number():
+    assert normalize_phone("978-3-16-148410-0") == ""
+    assert extract_contacts("Published 978-3-16-148410-0")["phone"] == ""
+    assert extract_contacts("ISBN 978-3-16-148410-0\n+92 316 9985540")["phone"] == "+923169985540"
+
+
+def test_e164_limits():
+    assert normalize_phone("+0092 316 9985540") == ""
+    assert normalize_phone("+92 316 9985540 1234") == ""
+
+
+def test_labelled_or_international_number_wins_over_first_hit():
+    text = "Ref 44 1234 567890\nMobile: 971 50 123 4567"
+    assert extract_contacts(text)["phone"] == "+971501234567"
+    text = "Ref 44 1234 567890\n+92 316 9985540"
+    assert extract_contacts(text)["phone"] == "+923169985540"
+
+
+@pytest.mark.parametrize("text", [
+    "Ref 44 1234 567890",
+    "Order 971501234567 shipped",
+    "Student ID 92316998554",
+])
+def test_unlabelled_digits_without_prefix_are_not_phone_numbers(text):
+    assert extract_contacts(text)["phone"] == ""
+
+
+def test_unlabelled_national_format_needs_the_default_country_code():
+    assert extract_contacts("Lahore, 0300 1234567")["phone"] == ""
+    assert extract_contacts("Lahore, 0300 1234567", "92")["phone"] == "+923001234567"
+    assert extract_contacts("Lahore, 0300 1234567\nCell: 0321 7654321", "92")["phone"] == "+923217654321"
@@ -0,0 +1,49 @@
+from agents.cv_corpus import CVDocument, deduplicate_documents
+from agents.dedup import estimated_jaccard, minhash_signature, near_duplicate_clusters
+
+BASE = " ".join(f"word{i}" for i in range(200))
+# Same CV with a few words edited: roughly 0.9 shingle Jaccard
+EDITED = BASE.replace("word50 ", "changed ").replace("word150 ", "updated ")
+UNRELATED = " ".join(f"other{i}" for i in range(200))
+
+
+def document(path, text, mtime):
+    return CVDocument(path, text, mtime, signature=minhash_signature(text))
+
+
+def test_clusters_follow_the_threshold():
+    signatures = [minhash_signature(text) for text in (BASE, EDITED, UNRELATED)]
+    similarity = estimated_jaccard(signatures[0], signatures[1])
+    assert 0.8 < similarity < 1
+
+    assert near_duplicate_clusters(signatures, threshold=similarity - 0.05) == [[0, 1]]
+    assert near_duplicate_clusters(signatures, threshold=min(similarity + 0.05, 1.0)) == []
+
+
+def test_identical_copies_form_one_cluster():
+    signatures = [minhash_signature(text) for text in (BASE, UNRELATED, BASE, EDITED, BASE)]
+    assert near_duplicate_clusters(signatures, threshold=0.8) == [[0, 2, 3, 4]]
+    assert near_duplicate_clusters(signatures, threshold=1.0) == [[0, 2, 4]]
+
+
+def test_empty_documents_are_never_duplicates():
+    signatures = [minhash_signature(text) for text in ("", "   ", BASE, "")]
+    assert near_duplicate_clusters(signatures) == []
+
+
+def test_newest_version_is_kept():
+    documents = [
+        document("cvs/old.pdf", BASE, mtime=100),
+        document("cvs/other.pdf", UNRELATED, mtime=50),
+        document("cvs/new.pdf", EDITED, mtime=200),
+    ]
+    kept, replaced = deduplicate_documents(documents, threshold=0.8)
+    assert [doc.path for doc in kept] == ["cvs/other.pdf", "cvs/new.pdf"]
+    assert replaced == {"cvs/new.pdf": ["cvs/old.pdf"]}
+
+
+def test_empty_documents_are_all_kept():
+    documents = [document("cvs/a.pdf", "", mtime=1), document("cvs/b.pdf", "", mtime=2)]
+    kept, replaced = deduplicate_documents(documents)
+    assert [doc.path for doc in kept] == ["cvs/a.pdf", "cvs/b.pdf"]
+    assert replaced == {}
@@ -0,0 +1,74 @@
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from agents.sharding import ShardCVMatcherTool, ShardWorker, default_authkey, send_request
+
+AUTHKEY = b"test-shard-key"
+
+
+@pytest.fixture
+def worker(tmp_path):
+    address = str(tmp_path / "shard0.sock")
+    worker = ShardWorker(ShardCVMatcherTool(cv_directory=str(tmp_path)), address, AUTHKEY)
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            send_request(address, {"op": "ping"}, AUTHKEY, timeout=1)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+    yield address
+    worker.stop()
+    thread.join(5)
+
+
+def test_authkey_is_required(monkeypatch):
+    monkeypatch.delenv("RECRUITER_SHARD_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError):
+        default_authkey()
+    monkeypatch.setenv("RECRUITER_SHARD_AUTHKEY", "secret")
+    assert default_authkey() == b"secret"
+
+
+def test_worker_refuses_without_the_key(monkeypatch, tmp_path):
+    monkeypatch.delenv("RECRUITER_SHARD_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError):
+        ShardWorker(ShardCVMatcherTool(cv_directory=str(tmp_path)), str(tmp_path / "shard.sock"))
+
+
+def test_ping_with_the_shared_key(worker):
+    assert send_request(worker, {"op": "ping"}, AUTHKEY, timeout=2) == {"status": "success", "shard": 0}
+    assert send_request(worker, {"op": "ping"}, AUTHKEY) == {"status": "success", "shard": 0}
+
+
+def test_wrong_key_is_rejected(worker):
+    with pytest.raises(AuthenticationError):
+        send_request(worker, {"op": "ping"}, b"wrong-key", timeout=2)
+    # The worker keeps serving clients that hold the key
+    assert send_request(worker, {"op": "ping"}, AUTHKEY, timeout=2)["status"] == "success"
+
+
+def test_score_on_an_empty_directory(worker):
+    response = send_request(worker, {"op": "score", "job_description": "Python developer", "top_k": 3},
+                            AUTHKEY, timeout=10)
+    assert response["status"] == "success"
+    assert response["candidates"] == [] and response["scored"] == 0
+
+
+def test_request_times_out_when_the_worker_never_answers(tmp_path):
+    address = str(tmp_path / "silent.sock")
+    with socket.socket(socket.AF_UNIX) as silent:
+        silent.bind(address)
+        silent.listen()
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            send_request(address, {"op": "ping"}, AUTHKEY, timeout=0.5)
+        assert time.monotonic() - started < 3
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def toolbox(agentpro):
+    release = threading.Event()
+
+    class EchoTool(agentpro.Tool):
+        name: str = "Echo"
+        description: str = "Returns its input"
+        arg: str = "Any text"
+
+        def run(self, prompt):
+            return f"echo {prompt}"
+
+    class SleepTool(agentpro.Tool):
+        name: str = "Sleep"
+        description: str = "Sleeps for the given number of seconds"
+        arg: str = "Seconds"
+
+        def run(self, prompt):
+            time.sleep(float(prompt))
+            return f"slept {prompt}"
+
+    class BlockTool(agentpro.Tool):
+        name: str = "Block"
+        description: str = "Blocks until the test releases it"
+        arg: str = "Anything"
+
+        def run(self, prompt):
+            release.wait(10)
+            return "released"
+
+    yield [EchoTool(), SleepTool(), BlockTool()], release
+    release.set()
+
+
+def make_agent(agentpro, tools, **kwargs):
+    return agentpro.AgentPro(llm=agentpro.OpenAI(), tools=tools, **kwargs)
+
+
+def turn(*actions):
+    return "\n".join(f"Action: {action}\nAction Input: {action_input}" for action, action_input in actions)
+
+
+def test_timed_out_tool_does_not_hold_up_the_others(agentpro, toolbox):
+    tools, release = toolbox
+    agent = make_agent(agentpro, tools, tool_timeouts={"Block": 0.2})
+    started = time.monotonic()
+    observations = agent.tool_call(turn(("Block", "x"), ("Echo", "hi"), ("Sleep", "0.1")))
+
+    assert observations == [
+        ("Block", "The tool did not finish within 0.2 seconds"),
+        ("Echo", "echo hi"),
+        ("Sleep", "slept 0.1"),
+    ]
+    assert time.monotonic() - started < 2
+    assert len(agent.abandoned_tools) == 1
+    release.set()
+
+
+def test_timeout_starts_when_the_action_starts(agentpro, toolbox):
+    tools, _ = toolbox
+    agent = make_agent(agentpro, tools, max_tool_workers=1, default_tool_timeout=0.5)
+    # Queued behind the first action for 0.3s, the second still gets its full 0.5s
+    observations = agent.tool_call(turn(("Sleep", "0.3"), ("Sleep", "0.3")))
+    assert observations == [("Sleep", "slept 0.3"), ("Sleep", "slept 0.3")]
+
+
+def test_pool_is_replaced_once_every_thread_is_stuck(agentpro, toolbox):
+    tools, release = toolbox
+    agent = make_agent(agentpro, tools, max_tool_workers=1, tool_timeouts={"Block": 0.2})
+    first_pool = agent.executor
+
+    observations = agent.tool_call(turn(("Block", "x"), ("Echo", "queued")))
+
+    assert observations[0] == ("Block", "The tool did not finish within 0.2 seconds")
+    # The echo was queued behind the stuck thread and ran on the replacement pool
+    assert observations[1] == ("Echo", "echo queued")
+    assert agent.executor is not first_pool
+    assert agent.tool_call(turn(("Echo", "after"))) == [("Echo", "echo after")]
+    release.set()
+
+
+def test_actions_are_refused_while_too_many_tools_are_abandoned(agentpro, toolbox):
+    tools, release = toolbox
+    agent = make_agent(agentpro, tools, max_abandoned_tools=1, tool_timeouts={"Block": 0.1})
+    agent.tool_call(turn(("Block", "x")))
+
+    [(action, observation)] = agent.tool_call(turn(("Echo", "hi")))
+    assert action == "Echo" and observation.startswith("Not run")
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while agent.abandoned_tools and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert agent.tool_call(turn(("Echo", "hi"))) == [("Echo", "echo hi")]